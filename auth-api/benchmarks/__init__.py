@@ -0,0 +1 @@
+"""Scripts de benchmark (serveur HTTP local, aucune requête réelle)"""
\ No newline at end of file
@@ -0,0 +1,63 @@
+# ============================================================================
+# benchmarks/bench_app_details_memory.py - SteamAppDetails vs CompactSteamAppDetails
+# ============================================================================
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_server import fake_app_details
+from steam.models import SteamAppDetails, CompactSteamAppDetails
+
+APP_COUNT = 3000
+REPEAT = 20
+WORDS = ("jeu aventure exploration combat monde ouvert histoire personnage quête niveau "
+         "multijoueur coopération stratégie ressource carte secret boss arme magie").split()
+
+def realistic_record(appid: int, rng: random.Random):
+    """Réponse appdetails avec des descriptions HTML variées (moins compressibles)"""
+    data = fake_app_details(appid)
+    paragraphs = ["<p>" + " ".join(rng.choices(WORDS, k=60)) + "</p>" for _ in range(30)]
+    data["detailed_description"] = data["about_the_game"] = "".join(paragraphs)
+    return data
+
+def build(label: str, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<36}: construction {elapsed:5.2f} s, mémoire {current / 1024 / 1024:7.1f} Mo")
+    return result
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func()
+    print(f"{label:<36}: {(time.perf_counter() - start) / REPEAT * 1000:8.2f} ms")
+
+def main():
+    rng = random.Random(42)
+    # Les objets sont construits depuis le JSON décodé, comme dans get_app_details
+    payload = json.dumps([realistic_record(appid, rng) for appid in range(1, APP_COUNT + 1)])
+    print(f"=== {APP_COUNT} détails d'applications ===")
+
+    details = build("list[SteamAppDetails]",
+                    lambda: [SteamAppDetails.from_dict(r) for r in json.loads(payload)])
+    compact = build("list[CompactSteamAppDetails]",
+                    lambda: [CompactSteamAppDetails.from_dict(r) for r in json.loads(payload)])
+    assert all(c == d for c, d in zip(compact[:100], details[:100]))
+
+    list_view = lambda items: [(d.name, d.type, d.platforms, d.genres) for d in items]
+    timed("vue liste (SteamAppDetails)", lambda: list_view(details))
+    timed("vue liste (compact)", lambda: list_view(compact))
+    timed("description x100 (SteamAppDetails)", lambda: [d.detailed_description for d in details[:100]])
+    timed("description x100 (compact)", lambda: [d.detailed_description for d in compact[:100]])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# ============================================================================
+# benchmarks/bench_app_list_stream.py - get_app_list vs iter_app_list
+# ============================================================================
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_server import MockSteamServer
+from network.json_stream import JSONStreamError, iter_json_array
+from steam import SteamClient
+
+APP_COUNT = 150000
+
+def measure(label: str, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<32}: {elapsed:6.2f} s, pic mémoire {peak / 1024 / 1024:7.1f} Mo, résultat {result}")
+
+def split_everywhere(document: bytes):
+    """Toutes les découpes du document en deux blocs, puis octet par octet"""
+    for offset in range(len(document) + 1):
+        yield [document[:offset], document[offset:]]
+    yield [document[i:i + 1] for i in range(len(document))]
+
+def check_chunk_splits():
+    """
+    iter_json_array doit produire le même résultat (ou la même erreur) quelle
+    que soit la découpe du flux en blocs.
+    """
+    valid = {
+        b'[]': [],
+        b' [ 1 , 2 ] ': [1, 2],
+        b'[12345, -1.5e3, "\xc3\xa9t\xc3\xa9", {"a": [1, 2]}, [], null, true]':
+            [12345, -1.5e3, "\u00e9t\u00e9", {"a": [1, 2]}, [], None, True],
+    }
+    invalid = [b'[1 2]', b'[,1]', b'[1,]', b'[1,,2]', b'[,]', b'[1', b'[1,']
+    for document, expected in valid.items():
+        for chunks in split_everywhere(document):
+            assert list(iter_json_array(chunks)) == expected, (document, chunks)
+    for document in invalid:
+        for chunks in split_everywhere(document):
+            try:
+                list(iter_json_array(chunks))
+            except ValueError:
+                continue
+            raise AssertionError(f"{document!r} accepté avec la découpe {chunks!r}")
+    for document in (b'[1 2]', b'[,1]', b'[1,]', b'[1,,2]'):
+        try:
+            list(iter_json_array([document]))
+        except JSONStreamError:
+            continue
+        raise AssertionError(f"{document!r} devrait lever JSONStreamError")
+    print(f"Découpes en blocs vérifiées ({len(valid)} documents valides, {len(invalid)} invalides)")
+
+def main():
+    with MockSteamServer(latency=0, app_count=APP_COUNT) as server, tempfile.TemporaryDirectory() as tmp:
+        client = SteamClient(server.write_config(tmp))
+        server.app_list_body()
+
+        print(f"=== GetAppList : {APP_COUNT} applications ===")
+        measure("get_app_list + filtre", lambda: len(
+            [app for app in client.get_app_list() if app.get('name', '').strip()]
+        ))
+        measure("iter_app_list (streaming)", lambda: sum(
+            1 for _, name in client.iter_app_list() if name.strip()
+        ))
+
+    check_chunk_splits()
+
+if __name__ == "__main__":
+    main()
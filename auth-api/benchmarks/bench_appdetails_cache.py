@@ -0,0 +1,41 @@
+# ============================================================================
+# benchmarks/bench_appdetails_cache.py - Resynchronisation froide vs chaude
+# ============================================================================
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_server import MockSteamServer
+from steam import SteamClient
+
+APP_COUNT = 300
+MISSING = {appid for appid in range(1, APP_COUNT + 1) if appid % 17 == 0}
+
+def resync(client: SteamClient, appids):
+    return [client.get_app_details(appid) for appid in appids]
+
+def main():
+    appids = list(range(1, APP_COUNT + 1))
+    with MockSteamServer(latency=0.01, missing_appids=MISSING) as server, \
+            tempfile.TemporaryDirectory() as tmp:
+        client = SteamClient(server.write_config(tmp, {"steam.cache.enabled": "true"}))
+
+        print(f"=== Cache appdetails : {APP_COUNT} apps dont {len(MISSING)} en échec ===")
+        for label in ("froide", "chaude"):
+            before = server.request_count
+            start = time.perf_counter()
+            details = resync(client, appids)
+            elapsed = time.perf_counter() - start
+            print(f"Resynchronisation {label} : {elapsed:6.3f} s, "
+                  f"{server.request_count - before} requête(s), "
+                  f"{sum(1 for d in details if d)} détails")
+
+        stats = client.cache.stats()
+        print(f"Cache : {stats['entries']} entrées ({stats['negative']} négatives), "
+              f"{stats['bytes'] / 1024:.0f} Ko compressés")
+
+if __name__ == "__main__":
+    main()
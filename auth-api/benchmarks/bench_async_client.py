@@ -0,0 +1,47 @@
+# ============================================================================
+# benchmarks/bench_async_client.py - SteamClient vs AsyncSteamClient
+# ============================================================================
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_server import MockSteamServer
+from steam import SteamClient, AsyncSteamClient
+
+APP_COUNT = 200
+LATENCY = 0.02
+
+def run_sync(config_path: str, appids):
+    client = SteamClient(config_path)
+    return [client.get_app_details(appid) for appid in appids]
+
+async def run_async(config_path: str, appids, concurrency: int):
+    async with AsyncSteamClient(config_path, max_workers=concurrency) as client:
+        return await client.get_app_details_many(appids, concurrency=concurrency)
+
+def main():
+    appids = list(range(1, APP_COUNT + 1))
+    with MockSteamServer(latency=LATENCY) as server, tempfile.TemporaryDirectory() as tmp:
+        config_path = server.write_config(tmp)
+
+        print(f"=== Benchmark get_app_details : {APP_COUNT} apps, latence {LATENCY * 1000:.0f} ms ===")
+
+        start = time.perf_counter()
+        sync_results = run_sync(config_path, appids)
+        sync_elapsed = time.perf_counter() - start
+        print(f"SteamClient (séquentiel)       : {sync_elapsed:6.2f} s")
+
+        for concurrency in (4, 16, 32):
+            start = time.perf_counter()
+            async_results = asyncio.run(run_async(config_path, appids, concurrency))
+            elapsed = time.perf_counter() - start
+            assert [d.name for d in async_results.values()] == [d.name for d in sync_results]
+            print(f"AsyncSteamClient (x{concurrency:<2})          : {elapsed:6.2f} s "
+                  f"(speedup {sync_elapsed / elapsed:4.1f}x)")
+
+if __name__ == "__main__":
+    main()
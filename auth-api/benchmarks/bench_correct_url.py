@@ -0,0 +1,73 @@
+# ============================================================================
+# benchmarks/bench_correct_url.py - Correction des URLs jeu par jeu en Python
+# vs règles compilées en requêtes UPDATE ensemblistes
+# ============================================================================
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.prisma_fixture import build_prisma_db, dump_games
+from gog.correct_url import IMAGE_COLUMNS, URL_RULES, clean_image_url, fix_database_urls
+
+GAME_COUNT = 100000
+
+def legacy_fix(db_path: Path):
+    """fix_database_urls historique : lecture de tous les jeux, un UPDATE par jeu modifié (référence)"""
+    con = sqlite3.connect(db_path)
+    con.row_factory = sqlite3.Row
+    cur = con.cursor()
+    for game in cur.execute(f"SELECT id, {', '.join(IMAGE_COLUMNS)} FROM Game").fetchall():
+        updates = {col: clean_image_url(game[col]) for col in IMAGE_COLUMNS}
+        if any(updates[col] != game[col] for col in IMAGE_COLUMNS):
+            cur.execute(f"UPDATE Game SET {', '.join(f'{col} = ?' for col in IMAGE_COLUMNS)} WHERE id = ?",
+                        (*updates.values(), game['id']))
+    con.commit()
+    con.close()
+
+def build_db(path: Path) -> Path:
+    """Jeux dont une URL sur dix contient le placeholder {formatter}"""
+    build_prisma_db(path)
+    con = sqlite3.connect(path)
+    con.executemany(f"""
+        INSERT INTO Game (gameId, title, criticsScore, isFromProductsApi, isModifiedByUser,
+                          {', '.join(IMAGE_COLUMNS)}, createdAt, updatedAt)
+        VALUES (?, ?, 0, 0, 0, {', '.join('?' for _ in IMAGE_COLUMNS)}, '2024-01-01', '2024-01-01')
+    """, ((str(i), f"Jeu {i}", *(f"https://images.gog-statics.com/{i:x}{col}"
+                                 + ("_{formatter}" if (i + j) % 10 == 0 else "") + ".jpg"
+                                 for j, col in enumerate(IMAGE_COLUMNS)))
+          for i in range(GAME_COUNT)))
+    con.commit()
+    con.close()
+    return path
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    print(f"{label:<34}: {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        legacy_path = build_db(tmp / "legacy.sqlite")
+        rules_path = build_db(tmp / "rules.sqlite")
+        print(f"=== {GAME_COUNT} jeux, {len(IMAGE_COLUMNS)} colonnes, {len(URL_RULES)} règles ===")
+
+        timed("jeu par jeu", lambda: legacy_fix(legacy_path))
+        timed("règles UPDATE", lambda: fix_database_urls(rules_path))
+        assert dump_games(legacy_path) == dump_games(rules_path)
+
+        # Base déjà corrigée : aucune ligne modifiée
+        timed("jeu par jeu (2e)", lambda: legacy_fix(legacy_path))
+        timed("règles UPDATE (2e)", lambda: fix_database_urls(rules_path))
+        assert dump_games(legacy_path) == dump_games(rules_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# ============================================================================
+# benchmarks/bench_db_profiles.py - Profils de connexion bulk / online
+# ============================================================================
+import contextlib
+import io
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.galaxy_fixture import build_galaxy_db
+from benchmarks.prisma_fixture import build_prisma_db, dump_games
+from gog import database
+from gog.integrate import CHILD_COLUMNS, BulkLoader, integrate_games
+from gog.jeux import build_json_from_db
+
+GAME_COUNT = 20000
+
+# Index secondaires tels que l'application pourrait en déclarer (@@index). Le schéma
+# Prisma actuel n'en a aucun : sans eux, deferred_indexes ne supprime rien.
+SECONDARY_INDEXES = [f'CREATE INDEX "{table}_gameId_idx" ON "{table}"("gameId")' for table in CHILD_COLUMNS
+                     if table not in ('Score', 'GameStats')] + ['CREATE INDEX "Game_title_idx" ON "Game"("title")']
+
+def build_target(path: Path) -> Path:
+    build_prisma_db(path)
+    con = sqlite3.connect(path)
+    for sql in SECONDARY_INDEXES:
+        con.execute(sql)
+    con.commit()
+    con.close()
+    return path
+
+def reader(path: Path, stop: threading.Event, latencies: list):
+    """Lectures de l'application pendant la synchronisation"""
+    con = sqlite3.connect(path, timeout=30)
+    while not stop.is_set():
+        start = time.perf_counter()
+        con.execute("SELECT COUNT(*) FROM Game").fetchone()
+        latencies.append(time.perf_counter() - start)
+        time.sleep(0.005)
+    con.close()
+
+def timed(label: str, path: Path, func):
+    stop, latencies = threading.Event(), []
+    thread = threading.Thread(target=reader, args=(path, stop, latencies))
+    thread.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    thread.join()
+    wal = Path(f"{path}-wal")
+    print(f"{label:<28}: {elapsed:6.2f} s  lecture max {max(latencies) * 1000:7.1f} ms  "
+          f"WAL {wal.stat().st_size if wal.exists() else 0} octets")
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        galaxy_path = build_galaxy_db(tmp / "galaxy-2.0.db", GAME_COUNT)
+        json_path = tmp / "library.json"
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_json_from_db(galaxy_path, json_path)
+        print(f"=== {GAME_COUNT} jeux, {len(SECONDARY_INDEXES)} index secondaires ===")
+
+        default_path = build_target(tmp / "default.sqlite")
+        online_path = build_target(tmp / "online.sqlite")
+        bulk_path = build_target(tmp / "bulk.sqlite")
+
+        # Référence : connexion par défaut, un seul lot, index maintenus
+        def default_load():
+            con = sqlite3.connect(default_path)
+            con.execute("PRAGMA foreign_keys = ON;")
+            with open(json_path, encoding='utf-8') as f:
+                BulkLoader(con, GAME_COUNT).load(json.load(f))
+            con.close()
+
+        timed("connexion par défaut", default_path, default_load)
+        timed("profil online", online_path, lambda: integrate_games(json_path, online_path, profile="online"))
+        timed("profil bulk", bulk_path, lambda: integrate_games(json_path, bulk_path, profile="bulk"))
+
+        con = sqlite3.connect(bulk_path)
+        assert len(database.secondary_indexes(con, ('Game', *CHILD_COLUMNS))) == len(SECONDARY_INDEXES)
+        con.close()
+        assert dump_games(default_path) == dump_games(online_path) == dump_games(bulk_path)
+
+if __name__ == "__main__":
+    main()
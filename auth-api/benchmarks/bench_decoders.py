@@ -0,0 +1,116 @@
+# ============================================================================
+# benchmarks/bench_decoders.py - from_dict historique vs décodeurs précompilés
+# ============================================================================
+import os
+import sys
+import time
+from dataclasses import asdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_server import fake_app_details, fake_owned_game
+from gog.models import GOGGame, GOGUserProfile
+from network.decoders import decoder_for
+from steam.models import SteamGame, SteamPlayerSummary, SteamAppDetails
+
+RECORD_COUNT = 100000
+
+# --- Implémentations historiques de from_dict (référence) -------------------
+
+def legacy_steam_game(data):
+    valid_fields = {f.name for f in SteamGame.__dataclass_fields__.values()}
+    return SteamGame(**{k: v for k, v in data.items() if k in valid_fields})
+
+def legacy_player_summary(data):
+    valid_fields = {f.name for f in SteamPlayerSummary.__dataclass_fields__.values()}
+    filtered_data = {k: v for k, v in data.items() if k in valid_fields}
+    if 'steamid' not in filtered_data:
+        filtered_data['steamid'] = str(data.get('steamid', ''))
+    return SteamPlayerSummary(**filtered_data)
+
+def legacy_app_details(data):
+    return SteamAppDetails(
+        steam_appid=data.get('steam_appid', 0), name=data.get('name', ''), type=data.get('type', ''),
+        is_free=data.get('is_free', False), detailed_description=data.get('detailed_description', ''),
+        about_the_game=data.get('about_the_game', ''), short_description=data.get('short_description', ''),
+        supported_languages=data.get('supported_languages', ''), header_image=data.get('header_image', ''),
+        website=data.get('website'), developers=data.get('developers', []),
+        publishers=data.get('publishers', []), price_overview=data.get('price_overview'),
+        platforms=data.get('platforms', {}), categories=data.get('categories', []),
+        genres=data.get('genres', []), release_date=data.get('release_date', {}),
+        required_age=data.get('required_age', 0), achievements=data.get('achievements'),
+    )
+
+def legacy_gog_game(data):
+    return GOGGame(
+        id=data.get('id', 0), title=data.get('title', ''), category=data.get('category', ''),
+        url=data.get('url'), works_on=data.get('worksOn'), is_pre_order=data.get('isPreOrder', False),
+        release_date=data.get('releaseDate'), image=data.get('image'), tags=data.get('tags', []),
+        description=data.get('description'),
+    )
+
+def legacy_gog_profile(data):
+    return GOGUserProfile(
+        user_id=str(data.get('userId', '')), username=data.get('username', ''),
+        galaxy_user_id=str(data.get('galaxyUserId', '')), email=data.get('email'),
+        games_count=data.get('games'),
+    )
+
+# --- Jeux de données --------------------------------------------------------
+
+def fake_player(index: int):
+    return {"steamid": str(76561197960265728 + index), "communityvisibilitystate": 3, "profilestate": 1,
+            "personaname": f"Joueur {index}", "profileurl": f"https://steamcommunity.com/id/{index}/",
+            "avatar": "a.jpg", "avatarmedium": "a_medium.jpg", "avatarfull": "a_full.jpg",
+            "avatarhash": f"{index:040x}", "lastlogoff": 1700000000, "personastate": index % 7,
+            "primaryclanid": "103582791429521408", "timecreated": 1300000000 + index, "personastateflags": 0}
+
+def fake_gog_game(index: int):
+    return {"id": index, "title": f"Jeu GOG {index}", "category": "Action", "url": f"/game/{index}",
+            "worksOn": {"Windows": True, "Mac": index % 2 == 0, "Linux": False}, "isPreOrder": False,
+            "releaseDate": "2020-01-01", "image": f"//images.gog.com/{index:032x}", "tags": [],
+            "isGame": True, "rating": 42, "dlcCount": 0}
+
+def fake_gog_profile(index: int):
+    return {"userId": 48628349957132247 + index, "username": f"joueur{index}",
+            "galaxyUserId": 48628349957132247 + index, "email": f"joueur{index}@example.com",
+            "games": index % 500, "avatar": "a.jpg", "country": "FR"}
+
+def fake_owned_game_with_nulls(appid: int):
+    record = fake_owned_game(appid)
+    if appid % 4 == 0:
+        record['playtime_mac_forever'] = None
+        record['playtime_2weeks'] = appid % 100
+    return record
+
+CASES = [
+    (SteamGame, legacy_steam_game, fake_owned_game_with_nulls, RECORD_COUNT),
+    (SteamPlayerSummary, legacy_player_summary, fake_player, RECORD_COUNT),
+    (SteamAppDetails, legacy_app_details, fake_app_details, RECORD_COUNT // 10),
+    (GOGGame, legacy_gog_game, fake_gog_game, RECORD_COUNT),
+    (GOGUserProfile, legacy_gog_profile, fake_gog_profile, RECORD_COUNT),
+]
+
+def timed(func, records) -> float:
+    start = time.perf_counter()
+    for record in records:
+        func(record)
+    return time.perf_counter() - start
+
+def main():
+    print(f"{'modèle':<20} {'enreg.':>7} {'historique':>11} {'précompilé':>11} {'gain':>6}")
+    for cls, legacy, factory, count in CASES:
+        records = [factory(i) for i in range(1, count + 1)]
+        decode = decoder_for(cls)
+
+        # Les deux implémentations doivent produire des objets identiques
+        for record in records[:1000]:
+            assert asdict(decode(record)) == asdict(legacy(record)), cls.__name__
+
+        legacy_time = timed(legacy, records)
+        fast_time = timed(decode, records)
+        print(f"{cls.__name__:<20} {count:>7} {legacy_time:>9.3f} s {fast_time:>9.3f} s "
+              f"{legacy_time / fast_time:>5.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# ============================================================================
+# benchmarks/bench_galaxy_export.py - Pivot Python ligne à ligne vs pivot SQL
+# ============================================================================
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.galaxy_fixture import build_galaxy_db
+from gog.jeux import LIBRARY_SQL, assemble_game, iter_library, write_library
+
+GAME_COUNT = 5000
+
+# Requête et assemblage historiques de build_json_from_db (référence)
+LEGACY_SQL = """
+    SELECT rp.gameId, gp.releaseKey, gpt.type, gp.value, ld.images
+    FROM ProductPurchaseDates AS ppd
+    INNER JOIN ReleaseProperties AS rp ON ppd.gameReleaseKey = rp.releaseKey
+    INNER JOIN ProductsToReleaseKeys as ptr ON rp.releaseKey = ptr.releaseKey
+    INNER JOIN LimitedDetails as ld ON ptr.gogId = ld.productId
+    INNER JOIN GamePieces AS gp ON ppd.gameReleaseKey = gp.releaseKey
+    INNER JOIN GamePieceTypes AS gpt ON gp.gamePieceTypeId = gpt.id
+    WHERE (ppd.userId IS NOT NULL AND ppd.userId != '')
+        AND (rp.gameId IS NOT NULL AND rp.gameId != '')
+        AND (rp.isVisibleInLibrary = 1) AND (rp.isDlc = 0)
+    ORDER BY rp.gameId, gp.releaseKey, gp.gamePieceTypeId;
+"""
+
+def legacy_extract(con: sqlite3.Connection):
+    rows = con.execute(LEGACY_SQL).fetchall()
+    games_by_id = {}
+    for game_id, release_key, piece_type, piece_value, piece_images in rows:
+        if game_id not in games_by_id:
+            platform = release_key.split('_')[0] if '_' in release_key else 'Inconnue'
+            games_by_id[game_id] = {"gameId": game_id, "platform": platform, "ownedReleaseKeys": set()}
+        games_by_id[game_id]["ownedReleaseKeys"].add(release_key)
+        if piece_images:
+            try:
+                images_data = json.loads(piece_images)
+                if isinstance(images_data, dict) and "logo2x" in images_data:
+                    games_by_id[game_id]["image"] = images_data["logo2x"]
+            except (json.JSONDecodeError, TypeError):
+                pass
+        try:
+            data = json.loads(piece_value)
+        except (json.JSONDecodeError, TypeError):
+            data = piece_value
+        if isinstance(data, dict):
+            for key, value in data.items():
+                if key not in games_by_id[game_id]:
+                    games_by_id[game_id][key] = value
+        elif piece_type not in games_by_id[game_id]:
+            games_by_id[game_id][piece_type] = data
+    games = list(games_by_id.values())
+    for game in games:
+        game["ownedReleaseKeys"] = sorted(game["ownedReleaseKeys"])
+    return len(rows), games
+
+def sql_extract(con: sqlite3.Connection):
+    rows = con.execute(LIBRARY_SQL).fetchall()
+    return len(rows), [assemble_game(*row) for row in rows]
+
+def legacy_export(con: sqlite3.Connection, output_path: Path):
+    _, games = legacy_extract(con)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(games, f, indent=4, ensure_ascii=False)
+
+def streaming_export(con: sqlite3.Connection, output_path: Path, output_format: str):
+    with open(output_path, 'w', encoding='utf-8') as f:
+        write_library(iter_library(con), f, output_format)
+
+def measure_export(label: str, func, output_path: Path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(output_path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<26}: {elapsed:6.2f} s, pic mémoire {peak / 1024 / 1024:6.1f} Mo, "
+          f"fichier {output_path.stat().st_size / 1024 / 1024:6.1f} Mo")
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        for purchases in (1, 3):
+            db_path = build_galaxy_db(Path(tmp) / "galaxy-2.0.db", GAME_COUNT, releases_per_game=3,
+                                      purchases_per_release=purchases)
+            con = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+            print(f"=== {GAME_COUNT} jeux, 3 clés de version, {purchases} achat(s) par clé ===")
+            results = []
+            for label, extract in (("pivot Python (historique)", legacy_extract), ("pivot SQL", sql_extract)):
+                start = time.perf_counter()
+                row_count, games = extract(con)
+                print(f"{label:<26}: {time.perf_counter() - start:6.2f} s, {row_count:>7} lignes lues")
+                results.append(games)
+            assert results[0] == results[1]
+
+            if purchases == 1:
+                print("--- Export ---")
+                tmp_path = Path(tmp)
+                measure_export("json.dump indenté", lambda path: legacy_export(con, path), tmp_path / "legacy.json")
+                for output_format in ("json", "compact", "ndjson"):
+                    measure_export(f"streaming {output_format}",
+                                   lambda path: streaming_export(con, path, output_format),
+                                   tmp_path / f"library.{output_format}")
+            con.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# ============================================================================
+# benchmarks/bench_galaxy_pipeline.py - jeux.py -> integrate.py -> majImage.py
+# vs pipeline direct par ATTACH DATABASE
+# ============================================================================
+import contextlib
+import io
+import json
+import sqlite3
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.galaxy_fixture import build_galaxy_db
+from benchmarks.prisma_fixture import build_prisma_db, dump_games
+from gog.integrate import integrate_games
+from gog.jeux import build_json_from_db
+from gog.majImage import update_game_images
+from gog.pipeline import run_pipeline
+
+GAME_COUNT = 5000
+
+def legacy_chain(galaxy_path: Path, json_path: Path, target_path: Path):
+    build_json_from_db(galaxy_path, json_path)
+    integrate_games(json_path, target_path)
+    update_game_images(galaxy_path, target_path)
+
+def check_images(json_path: Path, legacy_path: Path, pipeline_path: Path):
+    """
+    majImage.py retient le logo2x de la dernière ligne lue (ordre non garanti) ;
+    le pipeline retient celui de jeux.py (clé de version la plus grande). Pour les
+    jeux sans logo2x, les images doivent être identiques.
+    """
+    with open(json_path, encoding='utf-8') as f:
+        images = {game['gameId']: game.get('image') for game in json.load(f)}
+    query = "SELECT gameId, logo, horizontalCover FROM Game"
+    legacy = {row[0]: row for row in sqlite3.connect(legacy_path).execute(query)}
+    for game_id, logo, cover in sqlite3.connect(pipeline_path).execute(query):
+        image = images[game_id]
+        assert (logo, cover) == ((image, image) if image else legacy[game_id][1:])
+
+def timed(label: str, func):
+    # Les scripts affichent une ligne par jeu : la sortie est ignorée
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func()
+    print(f"{label:<34}: {time.perf_counter() - start:6.2f} s")
+    return result
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        galaxy_path = build_galaxy_db(tmp / "galaxy-2.0.db", GAME_COUNT, releases_per_game=3)
+        legacy_path = build_prisma_db(tmp / "legacy.sqlite")
+        pipeline_path = build_prisma_db(tmp / "pipeline.sqlite")
+        ignore = ('logo', 'horizontalCover')
+        print(f"=== {GAME_COUNT} jeux, 3 clés de version ===")
+
+        timed("jeux + integrate + majImage", lambda: legacy_chain(galaxy_path, tmp / "library.json", legacy_path))
+        stats = timed("pipeline ATTACH", lambda: run_pipeline(galaxy_path, pipeline_path))
+        print(f"  {stats}")
+        assert dump_games(legacy_path, ignore) == dump_games(pipeline_path, ignore)
+        check_images(tmp / "library.json", legacy_path, pipeline_path)
+
+        # Seconde exécution : tous les jeux existent, seules les images sont vérifiées
+        timed("jeux + integrate + majImage (2e)", lambda: legacy_chain(galaxy_path, tmp / "library.json", legacy_path))
+        stats = timed("pipeline ATTACH (2e)", lambda: run_pipeline(galaxy_path, pipeline_path))
+        print(f"  {stats}")
+        assert dump_games(legacy_path, ignore) == dump_games(pipeline_path, ignore)
+        check_images(tmp / "library.json", legacy_path, pipeline_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# ============================================================================
+# benchmarks/bench_galaxy_sync.py - Extraction complète vs détection des changements
+# ============================================================================
+import contextlib
+import io
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.galaxy_fixture import build_galaxy_db
+from benchmarks.prisma_fixture import build_prisma_db
+from gog.galaxy_sync import GalaxyChangeDetector, write_delta
+from gog.integrate import integrate_games
+from gog.jeux import iter_library
+
+GAME_COUNT = 5000
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<34}: {(time.perf_counter() - start) * 1000:8.1f} ms", end="")
+    return result
+
+def report(delta):
+    print(f"  ({len(delta.upserts)} upsert(s), {len(delta.deletions)} suppression(s), "
+          f"{delta.unchanged} inchangé(s))")
+
+def integrate_delta(delta, tmp: Path, prisma_path: Path) -> bool:
+    """Écrit le delta puis l'intègre comme python -m gog.galaxy_sync"""
+    delta_path = tmp / "delta.json"
+    write_delta(delta, delta_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return integrate_games(delta_path, prisma_path, profile="online", delta=True)
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = build_galaxy_db(Path(tmp) / "galaxy-2.0.db", GAME_COUNT, releases_per_game=3)
+        detector = GalaxyChangeDetector(db_path, Path(tmp) / "galaxy_sync.sqlite")
+        print(f"=== {GAME_COUNT} jeux, 3 clés de version ===")
+
+        con = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        games = timed("extraction complète", lambda: list(iter_library(con)))
+        print(f"  ({len(games)} jeux)")
+        con.close()
+
+        delta = timed("première synchronisation", detector.detect)
+        report(delta)
+        assert delta.upserts == games
+        prisma_path = build_prisma_db(Path(tmp) / "prisma.sqlite")
+        assert timed("intégration du delta", lambda: integrate_delta(delta, Path(tmp), prisma_path))
+        print()
+        detector.commit(delta)
+
+        report(timed("aucun changement", detector.detect))
+
+        # Fichier modifié sans changement de contenu : seules les empreintes sont relues
+        os.utime(db_path)
+        delta = timed("fichier touché, contenu identique", detector.detect)
+        report(delta)
+        detector.commit(delta)
+
+        with sqlite3.connect(db_path) as writer:
+            changed = [game['gameId'] for game in games[:10]]
+            for game_id in changed:
+                writer.execute(
+                    "UPDATE GamePieces SET value = json_set(value, '$.title', 'Titre modifié') "
+                    "WHERE gamePieceTypeId = 1 AND releaseKey IN "
+                    "(SELECT releaseKey FROM ReleaseProperties WHERE gameId = ?)", (game_id,))
+            removed = [game['gameId'] for game in games[-2:]]
+            writer.executemany("UPDATE ReleaseProperties SET isVisibleInLibrary = 0 WHERE gameId = ?",
+                               [(game_id,) for game_id in removed])
+        writer.close()
+
+        delta = timed("10 modifiés, 2 retirés", detector.detect)
+        report(delta)
+        assert [game['gameId'] for game in delta.upserts] == changed
+        assert all(game['title'] == 'Titre modifié' for game in delta.upserts)
+        assert delta.deletions == sorted(removed)
+        assert integrate_delta(delta, Path(tmp), prisma_path)
+        with contextlib.closing(sqlite3.connect(prisma_path)) as prisma:
+            assert prisma.execute("SELECT COUNT(*) FROM Game").fetchone()[0] == len(games) - len(removed)
+            assert prisma.execute("SELECT COUNT(*) FROM Game WHERE title = 'Titre modifié'").fetchone()[0] == 10
+            assert prisma.execute("SELECT COUNT(*) FROM Game WHERE gameId IN (?, ?)", removed).fetchone()[0] == 0
+        detector.commit(delta)
+        report(timed("après validation du delta", detector.detect))
+        print(f"Taille du delta JSON : {len(json.dumps(delta.to_dict(), ensure_ascii=False)) / 1024:.0f} Ko")
+        detector.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# ============================================================================
+# benchmarks/bench_image_cache.py - Mise en cache locale des images des jeux :
+# téléchargements séquentiels vs parallèles, réexécution, déduplication
+# ============================================================================
+import contextlib
+import io
+import os
+import sqlite3
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_server import MockSteamServer
+from benchmarks.prisma_fixture import build_prisma_db
+from gog.image_cache import THUMBNAIL_WIDTHS, Image, ImageCache, localize_game_images, make_thumbnails
+
+GAME_COUNT = 300
+# Jeux dont le logo est identique à celui d'un autre jeu (même contenu, autre URL)
+SHARED_EVERY = 10
+
+def png(width: int, height: int, seed: int) -> bytes:
+    """PNG RVB minimal, sans dépendance (contenu différent pour chaque graine)"""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    row = b"\x00" + struct.pack(">I", seed) + bytes((seed * 7 + x) % 256 for x in range(width * 3 - 4))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(row * height)) + chunk(b"IEND", b""))
+
+def build_db(path: Path, base_url: str) -> Path:
+    build_prisma_db(path)
+    con = sqlite3.connect(path)
+    con.executemany("""
+        INSERT INTO Game (gameId, title, criticsScore, isFromProductsApi, isModifiedByUser,
+                          logo, horizontalCover, createdAt, updatedAt)
+        VALUES (?, ?, 0, 0, 0, ?, ?, '2024-01-01', '2024-01-01')
+    """, ((str(i), f"Jeu {i}", f"{base_url}/logo/{i}.png", f"{base_url}/logo/{i}.png") for i in range(GAME_COUNT)))
+    con.commit()
+    con.close()
+    return path
+
+def run(label: str, db_path: Path, tmp: Path, workers: int):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ImageCache(tmp / "public", manifest_path=str(tmp / f"manifest-{db_path.stem}.sqlite"),
+                        download_workers=workers) as cache:
+            stats = localize_game_images(db_path, cache)
+    print(f"{label:<30}: {time.perf_counter() - start:6.2f} s  {stats}")
+    return stats
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp, MockSteamServer(latency=0.02) as server:
+        tmp = Path(tmp)
+        for i in range(GAME_COUNT):
+            server.files[f"/logo/{i}.png"] = png(800, 450, i - i % SHARED_EVERY if i % SHARED_EVERY == 1 else i)
+        print(f"=== {GAME_COUNT} images, latence 20 ms, Pillow {'présent' if Image else 'absent'} ===")
+
+        serial = run("1 téléchargement à la fois", build_db(tmp / "serial.sqlite", server.base_url), tmp, 1)
+        parallel_path = build_db(tmp / "parallel.sqlite", server.base_url)
+        parallel = run("8 téléchargements parallèles", parallel_path, tmp, 8)
+        assert serial['games_updated'] == parallel['games_updated'] == GAME_COUNT
+        assert parallel['deduplicated'] == GAME_COUNT // SHARED_EVERY
+
+        # Réexécution : plus aucune URL distante dans la base
+        requests_before = server.request_count
+        again = run("réexécution", parallel_path, tmp, 8)
+        assert again['games_updated'] == 0 and server.request_count == requests_before
+
+        # Base réinitialisée : le manifeste évite tout téléchargement
+        manifest_path = build_db(tmp / "parallel.sqlite.new", server.base_url)
+        os.replace(manifest_path, parallel_path)
+        cached = run("base réinitialisée (manifeste)", parallel_path, tmp, 8)
+        assert cached['cached'] == GAME_COUNT and server.request_count == requests_before
+
+        con = sqlite3.connect(parallel_path)
+        for logo, cover in con.execute("SELECT logo, horizontalCover FROM Game"):
+            assert logo == cover and logo.startswith("/images/cache/")
+            assert (tmp / "public" / logo[len("/images/cache/"):]).exists()
+        con.close()
+
+        if Image is not None:
+            check_thumbnails(tmp, logo)
+
+def check_thumbnails(tmp: Path, logo: str):
+    """Miniatures exposées par ImageCache.variants ; image illisible signalée sans erreur"""
+    with ImageCache(tmp / "public", manifest_path=str(tmp / "manifest-parallel.sqlite")) as cache:
+        variants = cache.variants(logo)
+    assert list(variants) == list(THUMBNAIL_WIDTHS)
+    for width, path in variants.items():
+        assert path == logo.replace(".png", f"_{width}.png")
+        with Image.open(tmp / "public" / path[len("/images/cache/"):]) as image:
+            assert image.width == width
+
+    (tmp / "public" / "zz").mkdir()
+    (tmp / "public" / "zz" / "broken.png").write_bytes(b"pas une image")
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        assert make_thumbnails(str(tmp / "public"), "zz/broken.png", THUMBNAIL_WIDTHS) == []
+    assert "Avertissement" in output.getvalue()
+    print(f"Miniatures vérifiées : {', '.join(variants.values())}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# ============================================================================
+# benchmarks/bench_integrate.py - Transaction par jeu vs chargement par lots,
+# réintégration complète en mode upsert
+# ============================================================================
+import contextlib
+import io
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.galaxy_fixture import build_galaxy_db
+from benchmarks.prisma_fixture import build_prisma_db, dump_games
+from gog.integrate import CHILD_LISTS, integrate_games
+from gog.jeux import build_json_from_db
+
+GAME_COUNT = 5000
+
+def legacy_integrate(json_path: Path, db_path: Path):
+    """integrate_games historique : SELECT, BEGIN et COMMIT pour chaque jeu (référence)"""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        games_data = json.load(f)
+    con = sqlite3.connect(db_path)
+    cur = con.cursor()
+    cur.execute("PRAGMA foreign_keys = ON;")
+    for game in games_data:
+        con.execute('BEGIN')
+        try:
+            if cur.execute("SELECT id FROM Game WHERE gameId = ?", (game['gameId'],)).fetchone():
+                con.execute('ROLLBACK')
+                continue
+            now_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            cur.execute("""
+                INSERT INTO Game (gameId, title, summary, platform, releaseDate, criticsScore, myRating,
+                                  isFromProductsApi, isModifiedByUser, state, parentGrk, background,
+                                  horizontalCover, verticalCover, logo, squareIcon, productCard,
+                                  changelog, forum, support, createdAt, updatedAt)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                game.get('gameId'), game.get('title'), game.get('summary'), game.get('platform'), game.get('releaseDate'),
+                game.get('criticsScore') or 0.0, game.get('myRating'), game.get('isFromProductsApi') or 0,
+                game.get('isModifiedByUser') or 0, game.get('state'), game.get('parentGrk'), game.get('background'),
+                game.get('horizontalCover'), game.get('verticalCover'), game.get('image'), game.get('squareIcon'),
+                game.get('productCard'), game.get('changelog'), game.get('forum'), game.get('support'),
+                now_timestamp, now_timestamp
+            ))
+            game_db_id = cur.lastrowid
+
+            def insert_many(table_name: str, json_key: str, column_name: str):
+                json_list = game.get(json_key)
+                if not json_list:
+                    return
+                if isinstance(json_list[0], dict):
+                    items = [(item.get(column_name), game_db_id) for item in json_list if item.get(column_name)]
+                else:
+                    items = [(item, game_db_id) for item in json_list if item is not None]
+                if items:
+                    cur.executemany(f"INSERT INTO {table_name} ({column_name}, gameId) VALUES (?, ?)", items)
+
+            for table, json_key, column in CHILD_LISTS:
+                insert_many(table, json_key, column)
+            con.commit()
+        except sqlite3.Error:
+            con.rollback()
+    con.close()
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    print(f"{label:<34}: {time.perf_counter() - start:6.2f} s")
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        galaxy_path = build_galaxy_db(tmp / "galaxy-2.0.db", GAME_COUNT)
+        json_path = tmp / "library.json"
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_json_from_db(galaxy_path, json_path)
+        legacy_path = build_prisma_db(tmp / "legacy.sqlite")
+        bulk_path = build_prisma_db(tmp / "bulk.sqlite")
+        print(f"=== {GAME_COUNT} jeux ===")
+
+        timed("transaction par jeu", lambda: legacy_integrate(json_path, legacy_path))
+        timed("chargement par lots", lambda: integrate_games(json_path, bulk_path))
+        assert dump_games(legacy_path) == dump_games(bulk_path)
+
+        # Tous les jeux existent déjà : un SELECT par jeu contre un seul préchargement
+        timed("transaction par jeu (2e)", lambda: legacy_integrate(json_path, legacy_path))
+        timed("chargement par lots (2e)", lambda: integrate_games(json_path, bulk_path))
+        assert dump_games(legacy_path) == dump_games(bulk_path)
+
+        # Upsert : seuls les jeux modifiés (50 titres, 50 listes de captures) sont réécrits
+        timed("upsert, aucun changement", lambda: integrate_games(json_path, bulk_path, upsert=True))
+        with open(json_path, encoding='utf-8') as f:
+            games = json.load(f)
+        for game in games[:50]:
+            game['title'] += " (édition définitive)"
+        for game in games[100:150]:
+            game['screenshots'] = game['screenshots'][:2]
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(games, f)
+        timed("upsert, 100 jeux modifiés", lambda: integrate_games(json_path, bulk_path, upsert=True))
+        fresh_path = build_prisma_db(tmp / "fresh.sqlite")
+        with contextlib.redirect_stdout(io.StringIO()):
+            integrate_games(json_path, fresh_path)
+        assert dump_games(fresh_path) == dump_games(bulk_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# ============================================================================
+# benchmarks/bench_integrate_stream.py - json.load complet vs ingestion en streaming
+# ============================================================================
+import contextlib
+import io
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.galaxy_fixture import build_galaxy_db
+from benchmarks.prisma_fixture import build_prisma_db, dump_games
+from gog.integrate import BulkLoader, iter_games, prefetch
+from gog.jeux import build_json_from_db
+
+GAME_COUNT = 20000
+BATCH_SIZE = 500
+
+class TimedLoader(BulkLoader):
+    """Relève la date de la première validation d'un lot"""
+    first_commit = None
+
+    def flush(self):
+        super().flush()
+        if self.first_commit is None:
+            self.first_commit = time.perf_counter()
+
+def load(db_path: Path, games_factory) -> TimedLoader:
+    con = sqlite3.connect(db_path)
+    con.execute("PRAGMA foreign_keys = ON;")
+    with contextlib.redirect_stdout(io.StringIO()):
+        loader = TimedLoader(con, BATCH_SIZE)
+        loader.load(games_factory())
+    con.close()
+    return loader
+
+def run(label: str, db_path: Path, games_factory):
+    # Durées mesurées sans tracemalloc, qui ralentit fortement les allocations
+    start = time.perf_counter()
+    loader = load(db_path, games_factory)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    load(build_prisma_db(db_path.with_suffix(".mem.sqlite")), games_factory)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<26}: {elapsed:6.2f} s  premier lot {(loader.first_commit - start) * 1000:7.1f} ms  "
+          f"pic mémoire {peak / 1024 / 1024:6.1f} Mo")
+
+def load_all(json_path: Path):
+    with open(json_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        galaxy_path = build_galaxy_db(tmp / "galaxy-2.0.db", GAME_COUNT)
+        json_path, ndjson_path = tmp / "library.json", tmp / "library.ndjson"
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_json_from_db(galaxy_path, json_path)
+            build_json_from_db(galaxy_path, ndjson_path, "ndjson")
+        print(f"=== {GAME_COUNT} jeux, lots de {BATCH_SIZE} "
+              f"(JSON {json_path.stat().st_size / 1024 / 1024:.0f} Mo) ===")
+
+        paths = [build_prisma_db(tmp / f"{name}.sqlite") for name in ("load", "json", "ndjson")]
+        run("json.load complet", paths[0], lambda: load_all(json_path))
+        run("streaming JSON", paths[1], lambda: prefetch(iter_games(json_path), BATCH_SIZE))
+        run("streaming NDJSON", paths[2], lambda: prefetch(iter_games(ndjson_path), BATCH_SIZE))
+        assert dump_games(paths[0]) == dump_games(paths[1]) == dump_games(paths[2])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# ============================================================================
+# benchmarks/bench_integrate_workers.py - Transformation dans le processus
+# d'écriture vs processus de transformation dédiés
+# ============================================================================
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.galaxy_fixture import build_galaxy_db
+from benchmarks.prisma_fixture import build_prisma_db, dump_games
+from gog.integrate import integrate_games
+from gog.jeux import build_json_from_db
+
+GAME_COUNT = 20000
+WORKERS = (1, 2, 4)
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    print(f"{label:<26}: {time.perf_counter() - start:6.2f} s")
+
+def main():
+    print(f"=== {GAME_COUNT} jeux, {os.cpu_count()} processeur(s) ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        galaxy_path = build_galaxy_db(tmp / "galaxy-2.0.db", GAME_COUNT)
+        json_path = tmp / "library.json"
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_json_from_db(galaxy_path, json_path)
+        ndjson_path = tmp / "library.ndjson"
+        with open(json_path, encoding='utf-8') as src, open(ndjson_path, 'w', encoding='utf-8') as dst:
+            for game in json.load(src):
+                dst.write(json.dumps(game, ensure_ascii=False) + "\n")
+
+        for path in (json_path, ndjson_path):
+            reference = None
+            for workers in WORKERS:
+                db_path = build_prisma_db(tmp / f"{path.suffix[1:]}-{workers}.sqlite")
+                timed(f"{path.suffix[1:]}, {workers} processus", lambda: integrate_games(path, db_path, workers=workers))
+                # Sortie déterministe : même contenu quel que soit le nombre de processus
+                dump = dump_games(db_path)
+                assert reference is None or dump == reference
+                reference = dump
+
+if __name__ == "__main__":
+    main()
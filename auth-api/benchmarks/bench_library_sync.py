@@ -0,0 +1,40 @@
+# ============================================================================
+# benchmarks/bench_library_sync.py - Synchronisation complète vs incrémentale
+# ============================================================================
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_server import MockSteamServer
+from steam import SteamClient, IncrementalLibrarySync
+
+LIBRARY_SIZE = 3000
+
+def main():
+    with MockSteamServer(latency=0.005, app_count=LIBRARY_SIZE) as server, \
+            tempfile.TemporaryDirectory() as tmp:
+        client = SteamClient(server.write_config(tmp, {"steam.sync.path": os.path.join(tmp, "library.sqlite")}))
+        sync = IncrementalLibrarySync.from_client(client)
+
+        print(f"=== Bibliothèque de {LIBRARY_SIZE} jeux ===")
+        for label in ("initiale", "stable"):
+            before = server.request_count
+            start = time.perf_counter()
+            changes = sync.sync()
+            print(f"Synchronisation {label:<9} : {time.perf_counter() - start:6.2f} s, "
+                  f"{server.request_count - before} requête(s), {len(changes.added)} ajout(s)")
+
+        server.owned_appids = list(range(10, 10 + LIBRARY_SIZE * 10, 10))[5:] + [999990, 999991]
+        server.extra_playtime = {100: 30, 200: 45}
+        before = server.request_count
+        start = time.perf_counter()
+        changes = sync.sync()
+        print(f"Synchronisation modifiée : {time.perf_counter() - start:6.2f} s, "
+              f"{server.request_count - before} requête(s) : {len(changes.added)} ajout(s), "
+              f"{len(changes.removed)} retrait(s), {len(changes.playtime_changed)} temps de jeu modifié(s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# ============================================================================
+# benchmarks/bench_maj_image.py - SELECT + UPDATE par jeu vs table temporaire
+# et UPDATE ... FROM
+# ============================================================================
+import contextlib
+import io
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.galaxy_fixture import build_galaxy_db
+from benchmarks.mock_server import MockSteamServer
+from benchmarks.prisma_fixture import build_prisma_db, dump_games
+from gog import database
+from gog.integrate import integrate_games
+from gog.jeux import build_json_from_db
+from gog.image_cache import ImageCache, localize_game_images
+from gog.majImage import update_game_images
+from gog.pipeline import run_pipeline
+
+GAME_COUNT = 20000
+
+def legacy_update(galaxy_path: Path, target_db_path: Path, profile: str):
+    """Boucle historique de majImage.py : SELECT, UPDATE et print par jeu (référence)"""
+    games_with_images = galaxy_images(galaxy_path)
+    con = database.connect(target_db_path, profile)
+    cur = con.cursor()
+    updated_count = 0
+    for game_id, image_url in games_with_images.items():
+        if cur.execute("SELECT id FROM Game WHERE gameId = ?", (game_id,)).fetchone():
+            cur.execute("""
+                UPDATE Game
+                SET logo = ?, horizontalCover = ?, updatedAt = datetime('now')
+                WHERE gameId = ?
+            """, (image_url, image_url, game_id))
+            updated_count += 1
+            print(f"✅ Image mise à jour pour gameId: {game_id}")
+            if updated_count % database.batch_size(profile) == 0:
+                con.commit()
+        else:
+            print(f"⏭️  Jeu non trouvé dans la base cible (gameId: {game_id})")
+    con.commit()
+    con.close()
+
+def galaxy_images(galaxy_path: Path) -> dict:
+    """Images logo2x extraites en Python, comme dans la version historique de majImage.py"""
+    images = {}
+    con = sqlite3.connect(galaxy_path)
+    for game_id, images_json in con.execute("""
+        SELECT DISTINCT rp.gameId, ld.images
+        FROM ProductPurchaseDates AS ppd
+        INNER JOIN ReleaseProperties AS rp ON ppd.gameReleaseKey = rp.releaseKey
+        INNER JOIN ProductsToReleaseKeys as ptr ON rp.releaseKey = ptr.releaseKey
+        INNER JOIN LimitedDetails as ld ON ptr.gogId = ld.productId
+        WHERE (ppd.userId IS NOT NULL AND ppd.userId != '')
+            AND (rp.gameId IS NOT NULL AND rp.gameId != '')
+            AND (rp.isVisibleInLibrary = 1)
+            AND (rp.isDlc = 0)
+            AND (ld.images IS NOT NULL AND ld.images != '')
+        ORDER BY rp.gameId;
+    """):
+        try:
+            images_data = json.loads(images_json)
+            if isinstance(images_data, dict) and "logo2x" in images_data:
+                images[game_id] = images_data["logo2x"]
+        except (json.JSONDecodeError, TypeError):
+            continue
+    con.close()
+    return images
+
+def check_image_cache(tmp: Path):
+    """
+    majImage puis image_cache.py : une nouvelle exécution de majImage (ou du
+    pipeline) doit conserver les chemins locaux des images déjà en cache.
+    """
+    with MockSteamServer(latency=0) as server:
+        galaxy_path = build_galaxy_db(tmp / "cache-galaxy.db", 500)
+        con = sqlite3.connect(galaxy_path)
+        con.execute("UPDATE LimitedDetails SET images = replace(images, 'https://images.gog.com/', ?)",
+                    (server.base_url + "/",))
+        con.commit()
+        for url, in con.execute("SELECT DISTINCT json_extract(images, '$.logo2x') FROM LimitedDetails"):
+            if url:
+                server.files[urlparse(url).path] = url.encode('utf-8')
+        con.close()
+
+        json_path = tmp / "cache-library.json"
+        db_path = build_prisma_db(tmp / "cache.sqlite")
+        query = "SELECT COUNT(*) FROM Game WHERE logo LIKE '/images/cache/%' AND horizontalCover = logo"
+        with contextlib.redirect_stdout(io.StringIO()), \
+                ImageCache(tmp / "public", manifest_path=tmp / "manifest.sqlite", widths=()) as cache:
+            build_json_from_db(galaxy_path, json_path)
+            integrate_games(json_path, db_path)
+            update_game_images(galaxy_path, db_path)
+            localize_game_images(db_path, cache, columns=("logo", "horizontalCover"))
+            con = sqlite3.connect(db_path)
+            localized = con.execute(query).fetchone()[0]
+            before = dump_games(db_path)
+
+            update_game_images(galaxy_path, db_path, image_cache=cache)
+            assert con.execute(query).fetchone()[0] == localized
+            assert dump_games(db_path) == before
+            run_pipeline(galaxy_path, db_path, image_cache=cache)
+            assert con.execute(query).fetchone()[0] == localized
+            assert dump_games(db_path) == before
+            con.close()
+    assert localized > 0
+    print(f"images en cache conservées       : {localized} jeu(x)")
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    print(f"{label:<34}: {time.perf_counter() - start:6.2f} s")
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        galaxy_path = build_galaxy_db(tmp / "galaxy-2.0.db", GAME_COUNT)
+        json_path = tmp / "library.json"
+        legacy_path = build_prisma_db(tmp / "legacy.sqlite")
+        bulk_path = build_prisma_db(tmp / "bulk.sqlite")
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_json_from_db(galaxy_path, json_path)
+            integrate_games(json_path, legacy_path)
+            integrate_games(json_path, bulk_path)
+        print(f"=== {GAME_COUNT} jeux, {len(galaxy_images(galaxy_path))} images logo2x ===")
+
+        # Premier passage : toutes les images changent ; second : aucune
+        for profile in ("online", "bulk"):
+            timed(f"SELECT + UPDATE par jeu ({profile})", lambda: legacy_update(galaxy_path, legacy_path, profile))
+            timed(f"UPDATE ... FROM ({profile})",
+                  lambda: update_game_images(galaxy_path, bulk_path, profile=profile))
+            ignore = ('updatedAt',)
+            assert dump_games(legacy_path, ignore) == dump_games(bulk_path, ignore)
+
+        check_image_cache(tmp)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# ============================================================================
+# benchmarks/bench_price_refresh.py - get_app_details par appid vs get_prices
+# ============================================================================
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_server import MockSteamServer
+from steam import SteamClient
+
+APP_COUNT = 1000
+MISSING = {appid for appid in range(1, APP_COUNT + 1) if appid % 97 == 0}
+DISCOUNTED = range(1, APP_COUNT + 1, 7)
+
+def main():
+    appids = list(range(1, APP_COUNT + 1))
+    with MockSteamServer(latency=0.01, missing_appids=MISSING) as server, \
+            tempfile.TemporaryDirectory() as tmp:
+        client = SteamClient(server.write_config(tmp, {"steam.cache.enabled": "true"}))
+        print(f"=== Relevé des prix de {APP_COUNT} applications ===")
+
+        before = server.request_count
+        start = time.perf_counter()
+        for appid in appids:
+            client.get_app_details(appid, refresh=True)
+        print(f"get_app_details x{APP_COUNT} : {time.perf_counter() - start:6.2f} s, "
+              f"{server.request_count - before} requête(s)")
+
+        server.discounts = {appid: 500 for appid in DISCOUNTED}
+        before = server.request_count
+        start = time.perf_counter()
+        prices = client.get_prices(appids)
+        print(f"get_prices             : {time.perf_counter() - start:6.2f} s, "
+              f"{server.request_count - before} requête(s), {len(prices)} prix")
+
+        # Le cache reflète les nouveaux prix sans nouvelle requête
+        before = server.request_count
+        stale = [appid for appid in DISCOUNTED if appid not in MISSING
+                 and client.get_app_details(appid).price_overview != prices[appid]]
+        assert not stale and server.request_count == before, stale
+        print(f"Cache : {len(DISCOUNTED)} remises visibles via get_app_details, 0 requête")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# ============================================================================
+# benchmarks/bench_steam_library.py - list[SteamGame] vs SteamLibrary
+# ============================================================================
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_server import fake_owned_game
+from steam.library import SteamLibrary, PLATFORM_COLUMNS, np
+from steam.models import SteamGame
+
+GAME_COUNT = 100000
+REPEAT = 20
+
+def build(label: str, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28}: construction {elapsed:5.2f} s, mémoire {current / 1024 / 1024:6.1f} Mo")
+    return result
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func()
+    print(f"{label:<28}: {(time.perf_counter() - start) / REPEAT * 1000:8.2f} ms")
+
+def main():
+    # Les objets sont construits depuis la réponse JSON décodée, comme dans get_owned_games
+    payload = json.dumps([fake_owned_game(appid) for appid in range(1, GAME_COUNT + 1)])
+    print(f"=== {GAME_COUNT} jeux, backend {'NumPy' if np is not None else 'array'} ===")
+
+    games = build("list[SteamGame]", lambda: [SteamGame.from_dict(r) for r in json.loads(payload)])
+    library = build("SteamLibrary", lambda: SteamLibrary.from_dicts(json.loads(payload)))
+
+    timed("list : total + plateformes", lambda: (
+        sum(g.get_total_hours() for g in games),
+        {p: sum(getattr(g, c) for g in games) for p, c in PLATFORM_COLUMNS.items()},
+    ))
+    timed("SteamLibrary : idem", lambda: (library.total_hours(), library.platform_totals()))
+    timed("list : top 10", lambda: sorted(games, key=lambda g: g.playtime_forever, reverse=True)[:10])
+    timed("SteamLibrary : top 10", lambda: library.top_played(10))
+    timed("list : filtre Linux > 1h", lambda: [g for g in games
+                                               if g.playtime_forever >= 60 and g.playtime_linux_forever > 0])
+    timed("SteamLibrary : idem", lambda: library.filter(min_playtime=60, platform='linux'))
+
+if __name__ == "__main__":
+    main()
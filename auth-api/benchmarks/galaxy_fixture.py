@@ -0,0 +1,97 @@
+# ============================================================================
+# benchmarks/galaxy_fixture.py - Base GOG Galaxy synthétique pour les benchmarks
+# ============================================================================
+import json
+import random
+import sqlite3
+from pathlib import Path
+
+# Types de pièces dans l'ordre de leurs identifiants Galaxy
+PIECE_TYPES = ('title', 'originalTitle', 'meta', 'originalMeta', 'summary',
+               'originalImages', 'osCompatibility', 'media', 'myRating', 'myTags')
+PLATFORMS = ('gog', 'steam', 'epic', 'uplay')
+
+def _pieces(rng: random.Random, game_id: int, release_key: str):
+    """Valeurs des pièces d'une clé de version (objets JSON comme dans Galaxy)"""
+    title = f"Jeu {game_id}" if release_key.startswith('gog') else f"Jeu {game_id} ({release_key.split('_')[0]})"
+    meta = {
+        "criticsScore": rng.randint(40, 95),
+        "developers": [f"Studio {game_id % 97}"],
+        "publishers": [f"Éditeur {game_id % 31}"],
+        "genres": rng.sample(["Action", "Aventure", "RPG", "Stratégie", "Puzzle"], 2),
+        "themes": ["Fantasy"] if game_id % 2 else ["Science-fiction"],
+        "releaseDate": 1262304000 + game_id * 3600,
+    }
+    return {
+        'title': json.dumps({"title": title}),
+        'originalTitle': json.dumps({"title": title}),
+        'meta': json.dumps(meta),
+        'originalMeta': json.dumps(meta),
+        'summary': json.dumps({"summary": f"Résumé du jeu {game_id}. " * rng.randint(5, 20)}),
+        'originalImages': json.dumps({
+            "background": f"https://images.gog.com/{game_id:x}_bg.jpg",
+            "squareIcon": f"https://images.gog.com/{game_id:x}_icon.png",
+            "verticalCover": f"https://images.gog.com/{game_id:x}_cover.jpg",
+        }),
+        'osCompatibility': json.dumps({"supported": [{"name": "windows"}, {"name": "osx"}][:1 + game_id % 2]}),
+        'media': json.dumps({"screenshots": [f"https://images.gog.com/{game_id:x}_{i}.jpg" for i in range(4)],
+                             "videos": []}),
+        'myRating': json.dumps({"myRating": game_id % 6 or None}),
+        # Valeur non JSON : conservée telle quelle sous le nom du type de pièce
+        'myTags': "favori" if game_id % 3 == 0 else json.dumps({"tags": []}),
+    }
+
+def build_galaxy_db(path: Path, game_count: int = 1000, releases_per_game: int = 2,
+                    purchases_per_release: int = 1, seed: int = 42) -> Path:
+    """
+    Crée une base `galaxy-2.0.db` synthétique avec les tables utilisées par
+    gog/jeux.py et gog/majImage.py. Chaque jeu possède `releases_per_game` clés
+    de version (plateforme_id), chacune avec ses pièces et ses LimitedDetails, et
+    `purchases_per_release` lignes d'achat (plusieurs comptes sur la machine).
+    """
+    rng = random.Random(seed)
+    path = Path(path)
+    if path.exists():
+        path.unlink()
+
+    con = sqlite3.connect(path)
+    con.executescript("""
+        CREATE TABLE GamePieceTypes (id INTEGER PRIMARY KEY, type TEXT UNIQUE NOT NULL);
+        CREATE TABLE GamePieces (releaseKey TEXT NOT NULL, gamePieceTypeId INTEGER NOT NULL,
+                                 userId INTEGER, value TEXT,
+                                 PRIMARY KEY (releaseKey, gamePieceTypeId, userId));
+        CREATE TABLE ReleaseProperties (releaseKey TEXT PRIMARY KEY, gameId TEXT,
+                                        isVisibleInLibrary INTEGER, isDlc INTEGER);
+        CREATE TABLE ProductPurchaseDates (gameReleaseKey TEXT NOT NULL, userId INTEGER,
+                                           purchaseDate TEXT);
+        CREATE TABLE ProductsToReleaseKeys (gogId INTEGER NOT NULL, releaseKey TEXT NOT NULL);
+        CREATE TABLE LimitedDetails (productId INTEGER PRIMARY KEY, title TEXT, images TEXT);
+    """)
+    con.executemany("INSERT INTO GamePieceTypes (id, type) VALUES (?, ?)",
+                    list(enumerate(PIECE_TYPES, start=1)))
+
+    product_id = 1000
+    with con:
+        for game_id in range(1, game_count + 1):
+            game_key = f"{game_id:08x}"
+            for index in range(releases_per_game):
+                release_key = f"{PLATFORMS[index % len(PLATFORMS)]}_{game_id * 10 + index}"
+                product_id += 1
+                con.execute("INSERT INTO ReleaseProperties VALUES (?, ?, ?, ?)",
+                            (release_key, game_key, 1 if game_id % 50 else 0, 1 if game_id % 40 == 0 else 0))
+                con.executemany("INSERT INTO ProductPurchaseDates VALUES (?, ?, ?)",
+                                [(release_key, user_id, "2020-01-01")
+                                 for user_id in range(1, purchases_per_release + 1)])
+                con.execute("INSERT INTO ProductsToReleaseKeys VALUES (?, ?)", (product_id, release_key))
+                images = {"logo": f"https://images.gog.com/{game_id:x}.png",
+                          "icon": f"https://images.gog.com/{game_id:x}_i.png"}
+                if game_id % 10:
+                    images["logo2x"] = f"https://images.gog.com/{game_id:x}_{index}_2x.png"
+                con.execute("INSERT INTO LimitedDetails VALUES (?, ?, ?)",
+                            (product_id, f"Jeu {game_id}", json.dumps(images)))
+                pieces = _pieces(rng, game_id, release_key)
+                con.executemany("INSERT INTO GamePieces VALUES (?, ?, ?, ?)",
+                                [(release_key, type_id, 1, pieces[piece_type])
+                                 for type_id, piece_type in enumerate(PIECE_TYPES, start=1)])
+    con.close()
+    return path
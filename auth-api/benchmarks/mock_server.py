@@ -0,0 +1,213 @@
+# ============================================================================
+# benchmarks/mock_server.py - Serveur HTTP local imitant les APIs Steam
+# ============================================================================
+import json
+import mimetypes
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+def fake_app_details(appid: int) -> Dict[str, Any]:
+    """Construit une réponse appdetails réaliste (descriptions HTML comprises)"""
+    description = f"<p>Description détaillée du jeu {appid}.</p>" * 200
+    return {
+        "type": "game",
+        "name": f"Jeu {appid}",
+        "steam_appid": appid,
+        "required_age": 0,
+        "is_free": appid % 5 == 0,
+        "detailed_description": description,
+        "about_the_game": description,
+        "short_description": f"Jeu de test {appid}",
+        "supported_languages": "Français, English<strong>*</strong>" * 20,
+        "header_image": f"https://cdn.example.com/apps/{appid}/header.jpg",
+        "developers": ["Studio Test"],
+        "publishers": ["Éditeur Test"],
+        "price_overview": {"currency": "EUR", "initial": 1999, "final": 999 + appid % 1000,
+                           "discount_percent": 50, "final_formatted": "9,99€"},
+        "platforms": {"windows": True, "mac": appid % 2 == 0, "linux": appid % 3 == 0},
+        "categories": [{"id": 2, "description": "Solo"}],
+        "genres": [{"id": "1", "description": "Action"}],
+        "release_date": {"coming_soon": False, "date": "1 janv. 2020"},
+    }
+
+def fake_owned_game(appid: int) -> Dict[str, Any]:
+    return {
+        "appid": appid,
+        "name": f"Jeu {appid}",
+        "playtime_forever": appid % 5000,
+        "img_icon_url": f"{appid:040x}",
+        "has_community_visible_stats": True,
+        "playtime_windows_forever": appid % 3000,
+        "playtime_mac_forever": appid % 7,
+        "playtime_linux_forever": appid % 11,
+        "playtime_deck_forever": appid % 13,
+        "rtime_last_played": 1700000000 + appid,
+        "playtime_disconnected": 0,
+    }
+
+class _Handler(BaseHTTPRequestHandler):
+    server: 'MockSteamServer'
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload: Any, status: int = 200):
+        self._send_body(json.dumps(payload).encode('utf-8'), status)
+
+    def _send_body(self, body: bytes, status: int = 200):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        owner = self.server.owner
+        with owner.lock:
+            owner.request_count += 1
+            scripted = owner.scripted_errors.pop(0) if owner.scripted_errors else None
+        if scripted:
+            status, retry_after = scripted
+            self.send_response(status)
+            if retry_after is not None:
+                self.send_header("Retry-After", str(retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if owner.latency:
+            time.sleep(owner.latency)
+
+        parsed = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+
+        if parsed.path == "/api/appdetails":
+            payload = {}
+            for raw in params.get("appids", "").split(","):
+                appid = int(raw)
+                if appid in owner.missing_appids:
+                    payload[raw] = {"success": False}
+                else:
+                    data = fake_app_details(appid)
+                    data["price_overview"]["final"] -= owner.discounts.get(appid, 0)
+                    if params.get("filters") == "price_overview":
+                        # Comme le Store : liste vide pour une application gratuite
+                        data = [] if data["is_free"] else {"price_overview": data["price_overview"]}
+                    payload[raw] = {"success": True, "data": data}
+            return self._send_json(payload)
+
+        if parsed.path == "/IPlayerService/GetOwnedGames/v1/":
+            appids = owner.owned_appids or range(10, 10 + owner.app_count * 10, 10)
+            games = [fake_owned_game(appid) for appid in appids]
+            for game in games:
+                game["playtime_forever"] += owner.extra_playtime.get(game["appid"], 0)
+            return self._send_json({"response": {"game_count": len(games), "games": games}})
+
+        if parsed.path == "/ISteamUser/GetPlayerSummaries/v2/":
+            players = [{"steamid": sid, "personaname": f"Joueur {sid}", "personastate": 1}
+                       for sid in params.get("steamids", "").split(",") if sid]
+            return self._send_json({"response": {"players": players}})
+
+        if parsed.path == "/ISteamApps/GetAppList/v2/":
+            return self._send_body(owner.app_list_body())
+
+        if parsed.path == "/IStoreService/GetAppList/v1/":
+            last_appid = int(params.get("last_appid", 0))
+            max_results = int(params.get("max_results", 10000))
+            pending = sorted(appid for appid in owner.modified_apps if appid > last_appid)
+            page = pending[:max_results]
+            apps = [{"appid": appid, "name": owner.modified_apps[appid], "last_modified": int(time.time())}
+                    for appid in page]
+            response = {"apps": apps}
+            if len(pending) > len(page):
+                response.update(have_more_results=True, last_appid=page[-1])
+            return self._send_json({"response": response})
+
+        if parsed.path in owner.files:
+            body = owner.files[parsed.path]
+            self.send_response(200)
+            self.send_header("Content-Type", mimetypes.guess_type(parsed.path)[0] or "application/octet-stream")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self._send_json({"error": "not found"}, status=404)
+
+class MockSteamServer:
+    """
+    Serveur HTTP local (thread d'arrière-plan) qui imite les endpoints Steam
+    utilisés par les clients. Sert également des fichiers statiques arbitraires
+    via le dictionnaire `files` (chemin -> contenu).
+    """
+
+    def __init__(self, latency: float = 0.02, app_count: int = 500,
+                 missing_appids: Optional[set] = None):
+        self.latency = latency
+        self.app_count = app_count
+        self.missing_appids = missing_appids or set()
+        self.files: Dict[str, bytes] = {}
+        # Erreurs renvoyées aux prochaines requêtes : (statut, Retry-After ou None)
+        self.scripted_errors: List[Tuple[int, Optional[Any]]] = []
+        # Bibliothèque renvoyée par GetOwnedGames (None = générée) et temps de jeu ajouté
+        self.owned_appids: Optional[List[int]] = None
+        self.extra_playtime: Dict[int, int] = {}
+        # Remise (en centimes) appliquée au prix final de certaines applications
+        self.discounts: Dict[int, int] = {}
+        # Applications renvoyées par IStoreService/GetAppList (appid -> nom)
+        self.modified_apps: Dict[int, str] = {}
+        self.request_count = 0
+        self._app_list_body: Optional[bytes] = None
+        self.lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def app_list_body(self) -> bytes:
+        """Corps GetAppList, construit une seule fois (il peut être volumineux)"""
+        with self.lock:
+            if self._app_list_body is None:
+                apps = [{"appid": appid, "name": f"Jeu {appid}"} for appid in range(1, self.app_count + 1)]
+                self._app_list_body = json.dumps({"applist": {"apps": apps}}).encode('utf-8')
+            return self._app_list_body
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> 'MockSteamServer':
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.owner = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def write_config(self, directory: str, extra: Optional[Dict[str, Any]] = None) -> str:
+        """Écrit un steam.properties pointant vers ce serveur et retourne son chemin"""
+        values = {
+            "steam.api.key": "benchmark",
+            "steam.id": "76561190000000000",
+            "steam.api.base_url": self.base_url,
+            "steam.store.base_url": self.base_url,
+            "steam.api.timeout": 10,
+            # Pas de limitation par défaut : les benchmarks mesurent le client
+            "steam.rate_limit.requests_per_minute": 1000000,
+            "steam.cache.enabled": "false",
+            "steam.cache.path": os.path.join(directory, "steam_appdetails.sqlite"),
+        }
+        values.update(extra or {})
+        path = os.path.join(directory, "steam.properties")
+        with open(path, 'w', encoding='utf-8') as f:
+            for key, value in values.items():
+                f.write(f"{key}={value}\n")
+        return path
@@ -0,0 +1,111 @@
+# ============================================================================
+# benchmarks/prisma_fixture.py - Base cible équivalente à `npx prisma db push`
+# ============================================================================
+import sqlite3
+from pathlib import Path
+
+# Tables de prisma/schema.prisma alimentées par gog/integrate.py, dans la forme
+# générée par Prisma pour SQLite
+_CHILD_TABLES = {
+    'Genre': '"name" TEXT NOT NULL',
+    'Developer': '"name" TEXT NOT NULL',
+    'Publisher': '"name" TEXT NOT NULL',
+    'Tag': '"name" TEXT NOT NULL',
+    'Theme': '"name" TEXT NOT NULL',
+    'Feature': '"name" TEXT NOT NULL',
+    'SupportedPlatform': '"platform" TEXT NOT NULL',
+    'OwnedReleaseKey': '"releaseKey" TEXT NOT NULL',
+    'Screenshot': '"url" TEXT NOT NULL',
+    'Video': '"url" TEXT NOT NULL, "title" TEXT, "description" TEXT, "thumbnail" TEXT',
+}
+
+PRISMA_DDL = """
+CREATE TABLE "Game" (
+    "id" INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+    "gameId" TEXT NOT NULL,
+    "title" TEXT NOT NULL,
+    "summary" TEXT,
+    "platform" TEXT,
+    "releaseDate" INTEGER,
+    "criticsScore" REAL NOT NULL DEFAULT 0.0,
+    "myRating" REAL,
+    "all" INTEGER NOT NULL DEFAULT 0,
+    "unlocked" INTEGER NOT NULL DEFAULT 0,
+    "isFromProductsApi" INTEGER NOT NULL DEFAULT 0,
+    "isModifiedByUser" INTEGER NOT NULL DEFAULT 0,
+    "state" TEXT,
+    "parentGrk" TEXT,
+    "background" TEXT,
+    "horizontalCover" TEXT,
+    "verticalCover" TEXT,
+    "logo" TEXT,
+    "squareIcon" TEXT,
+    "productCard" TEXT,
+    "changelog" TEXT,
+    "forum" TEXT,
+    "support" TEXT,
+    "contentHash" TEXT,
+    "createdAt" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" DATETIME NOT NULL
+);
+CREATE UNIQUE INDEX "Game_gameId_key" ON "Game"("gameId");
+CREATE TABLE "Score" (
+    "id" INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+    "critics" REAL NOT NULL DEFAULT 0.0,
+    "users" REAL NOT NULL DEFAULT 0.0,
+    "metacritic" REAL NOT NULL DEFAULT 0.0,
+    "gameId" INTEGER NOT NULL,
+    CONSTRAINT "Score_gameId_fkey" FOREIGN KEY ("gameId") REFERENCES "Game" ("id") ON DELETE CASCADE ON UPDATE CASCADE
+);
+CREATE UNIQUE INDEX "Score_gameId_key" ON "Score"("gameId");
+CREATE TABLE "GameStats" (
+    "id" INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+    "playtime" INTEGER NOT NULL DEFAULT 0,
+    "achievements" INTEGER NOT NULL DEFAULT 0,
+    "lastPlayed" INTEGER,
+    "timesLaunched" INTEGER NOT NULL DEFAULT 0,
+    "gameId" INTEGER NOT NULL,
+    CONSTRAINT "GameStats_gameId_fkey" FOREIGN KEY ("gameId") REFERENCES "Game" ("id") ON DELETE CASCADE ON UPDATE CASCADE
+);
+CREATE UNIQUE INDEX "GameStats_gameId_key" ON "GameStats"("gameId");
+""" + "".join(f"""
+CREATE TABLE "{table}" (
+    "id" INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+    {columns},
+    "gameId" INTEGER NOT NULL,
+    CONSTRAINT "{table}_gameId_fkey" FOREIGN KEY ("gameId") REFERENCES "Game" ("id") ON DELETE CASCADE ON UPDATE CASCADE
+);""" for table, columns in _CHILD_TABLES.items())
+
+def build_prisma_db(path: Path) -> Path:
+    """Crée une base `db.sqlite` vide avec le schéma Prisma des jeux"""
+    path = Path(path)
+    if path.exists():
+        path.unlink()
+    con = sqlite3.connect(path)
+    con.executescript(PRISMA_DDL)
+    con.close()
+    return path
+
+def dump_games(path: Path, ignore=()):
+    """
+    Contenu comparable d'une base cible : jeux et lignes filles, sans id,
+    empreinte ni dates, ni les colonnes de Game listées dans `ignore`
+    """
+    con = sqlite3.connect(path)
+    def quoted(names, alias=""):
+        return ", ".join(f'{alias}"{name}"' for name in names)
+
+    columns = [row[1] for row in con.execute('PRAGMA table_info("Game")')
+               if row[1] not in ('id', 'contentHash', 'createdAt', 'updatedAt', *ignore)]
+    games = {row[0]: row for row in con.execute(f'SELECT {quoted(columns)} FROM "Game"')}
+    children = {}
+    for table in list(_CHILD_TABLES) + ['Score', 'GameStats']:
+        value_columns = [row[1] for row in con.execute(f'PRAGMA table_info("{table}")')
+                         if row[1] not in ('id', 'gameId')]
+        rows = con.execute(
+            f'SELECT g."gameId", {quoted(value_columns, "t.")} '
+            f'FROM "{table}" AS t INNER JOIN "Game" AS g ON g."id" = t."gameId"'
+        ).fetchall()
+        children[table] = sorted(rows, key=repr)
+    con.close()
+    return games, children
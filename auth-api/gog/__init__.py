@@ -1,6 +1,8 @@
 """Module GOG API client personnel"""
 from .models import GOGGame, GOGUserProfile
+from .galaxy_sync import GalaxyChangeDetector, GalaxyDelta
+from .image_cache import ImageCache
 
 __all__ = [
-    'GOGGame', 'GOGUserProfile'
+    'GOGGame', 'GOGUserProfile', 'GalaxyChangeDetector', 'GalaxyDelta', 'ImageCache'
 ]
\ No newline at end of file
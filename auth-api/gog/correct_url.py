@@ -1,6 +1,55 @@
 # corriger_urls.py
 import sqlite3
+import sys
 from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+if __package__ in (None, ''):
+    # Exécution directe (python gog/correct_url.py) : rend gog et network importables
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from gog import database
+
+# Colonnes d'images de la table Game
+IMAGE_COLUMNS = ("background", "horizontalCover", "verticalCover", "logo", "squareIcon", "productCard")
+
+# Images d'applications Steam, même modèle que SteamGame.get_full_icon_url :
+# {STEAM_APP_IMAGES}{appid}/{hash}.jpg
+STEAM_APP_IMAGES = "https://media.steampowered.com/steamcommunity/public/images/apps/"
+# Anciens CDN servant les mêmes images
+STEAM_LEGACY_HOSTS = (
+    "https://steamcdn-a.akamaihd.net/",
+    "https://cdn.akamai.steamstatic.com/",
+    "https://cdn.cloudflare.steamstatic.com/",
+    "https://steamcommunity-a.akamaihd.net/",
+)
+_STEAM_HASH = "[0-9a-f]" * 40
+
+class URLRule(NamedTuple):
+    """
+    Règle de réécriture d'URL, compilée en une requête UPDATE sur les colonnes d'images.
+    `condition` et `expression` sont des fragments SQL où {col} désigne la colonne ;
+    la condition ne doit plus être vraie après réécriture (règles idempotentes).
+    Les conditions sensibles à la casse utilisent GLOB, comme replace() et instr().
+    """
+    name: str
+    condition: str
+    expression: str
+
+# Règles appliquées dans l'ordre : http -> https avant la normalisation des hôtes Steam
+URL_RULES: Tuple[URLRule, ...] = (
+    URLRule("formatter",
+            "{col} GLOB '*_{{formatter}}*'",
+            "replace({col}, '_{{formatter}}', '')"),
+    URLRule("https",
+            "{col} LIKE 'http://%'",
+            "'https://' || substr({col}, 8)"),
+    URLRule("steam_cdn",
+            "(" + " OR ".join(f"{{col}} GLOB '{host}steamcommunity/public/images/apps/*'"
+                              for host in STEAM_LEGACY_HOSTS) + ")",
+            f"'{STEAM_APP_IMAGES}' || substr({{col}}, instr({{col}}, '/images/apps/') + 13)"),
+    URLRule("steam_extension",
+            f"{{col}} GLOB '{STEAM_APP_IMAGES}[0-9]*/{_STEAM_HASH}'",
+            "{col} || '.jpg'"),
+)
 
 def clean_image_url(url: str | None) -> str | None:
     """Supprime le placeholder '{formatter}' des URLs d'images GOG."""
@@ -8,42 +57,52 @@ def clean_image_url(url: str | None) -> str | None:
         return url.replace('_{formatter}', '')
     return url
 
-def fix_database_urls(db_path: Path):
-    """Se connecte à la DB et nettoie toutes les URLs d'images."""
+def compile_url_rules(rules: Iterable[URLRule] = URL_RULES, columns: Iterable[str] = IMAGE_COLUMNS,
+                      table: str = "Game") -> List[Tuple[str, str]]:
+    """
+    Requêtes UPDATE des règles : (règle, SQL). Chaque règle est appliquée à
+    toutes les colonnes en un seul parcours de la table ; seules les lignes dont
+    au moins une colonne vérifie la condition sont réécrites.
+    """
+    columns = [f'"{column}"' for column in columns]
+    statements = []
+    for rule in rules:
+        assignments = ", ".join(
+            f"{col} = CASE WHEN {rule.condition.format(col=col)} THEN {rule.expression.format(col=col)} ELSE {col} END"
+            for col in columns)
+        condition = " OR ".join(rule.condition.format(col=col) for col in columns)
+        statements.append((rule.name, f'UPDATE "{table}" SET {assignments} WHERE {condition}'))
+    return statements
+
+def apply_url_rules(con: sqlite3.Connection, rules: Iterable[URLRule] = URL_RULES,
+                    columns: Iterable[str] = IMAGE_COLUMNS) -> Dict[str, int]:
+    """
+    Applique les règles dans l'ordre, dans une seule transaction (annulée en cas
+    d'erreur). Retourne le nombre de jeux modifiés par règle.
+    """
+    with con:
+        return {name: con.execute(sql).rowcount for name, sql in compile_url_rules(rules, columns)}
+
+def fix_database_urls(db_path: Path, profile: str = "online"):
+    """
+    Se connecte à la DB et nettoie toutes les URLs d'images : chaque règle de
+    URL_RULES est appliquée par des requêtes UPDATE ensemblistes, sans lire les
+    jeux en Python. Une seconde exécution ne modifie rien.
+    """
     if not db_path.exists():
         print(f"❌ Erreur : Base de données introuvable à '{db_path}'")
         return
 
     print(f"🔗 Connexion à la base de données : {db_path}")
-    con = sqlite3.connect(db_path)
-    # Permet d'accéder aux résultats par nom de colonne (plus lisible)
-    con.row_factory = sqlite3.Row 
-    cur = con.cursor()
-
-    # Sélectionner tous les jeux qui ont potentiellement des URLs à corriger
-    image_columns = ["background", "horizontalCover", "verticalCover", "logo", "squareIcon", "productCard"]
-    
+    con = database.connect(db_path, profile)
+
     try:
-        cur.execute(f"SELECT id, {', '.join(image_columns)} FROM Game")
-        games_to_update = cur.fetchall()
-
-        updated_count = 0
-        print(f"🔍 Analyse de {len(games_to_update)} jeux pour corriger les URLs...")
-
-        for game in games_to_update:
-            updates = {col: clean_image_url(game[col]) for col in image_columns}
-            
-            # On ne met à jour que si au moins une URL a été modifiée
-            if any(updates[col] != game[col] for col in image_columns):
-                cur.execute(f"""
-                    UPDATE Game 
-                    SET {', '.join([f'{col} = ?' for col in image_columns])}
-                    WHERE id = ?
-                """, (*updates.values(), game['id']))
-                updated_count += 1
-        
-        con.commit()
-        print(f"✅ Correction terminée ! {updated_count} jeu(x) ont eu leurs URLs mises à jour.")
+        counts = apply_url_rules(con)
+        database.checkpoint(con)
+        for name, count in counts.items():
+            if count:
+                print(f"   - {name} : {count} jeu(x)")
+        print(f"✅ Correction terminée ! {sum(counts.values())} correction(s) appliquée(s).")
 
     except sqlite3.Error as e:
         print(f"❌ Erreur lors de la mise à jour de la base de données : {e}")
@@ -51,6 +110,8 @@ def fix_database_urls(db_path: Path):
         con.close()
 
 if __name__ == '__main__':
-    # Assurez-vous que ce chemin pointe vers votre base de données
-    db_file_path = Path.cwd() / ".." / ".." / "prisma" / "db.sqlite"
-    fix_database_urls(db_file_path)
\ No newline at end of file
+    # Depuis auth-api : python -m gog.correct_url (ou python gog/correct_url.py, depuis n'importe quel dossier)
+    # Base Prisma du dépôt (prisma/db.sqlite)
+    db_file_path = database.PRISMA_DB_PATH
+    # --bulk : profil de connexion pour une correction complète, application arrêtée
+    fix_database_urls(db_file_path, profile="bulk" if '--bulk' in sys.argv[1:] else "online")
\ No newline at end of file
@@ -0,0 +1,105 @@
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Base Prisma de l'application (prisma/db.sqlite à la racine du dépôt)
+PRISMA_DB_PATH = Path(__file__).resolve().parents[2] / "prisma" / "db.sqlite"
+
+# Profils de connexion à la base Prisma `db.sqlite`, partagée avec l'application
+# Next.js qui la lit pendant les synchronisations :
+# - bulk   : chargements volumineux (journal WAL, synchronisation allégée, cache
+#            agrandi, tables temporaires en mémoire) et lots de grande taille
+# - online : écritures ponctuelles pendant que l'application sert des lectures
+#            (attente sur verrou plutôt qu'erreur, transactions courtes)
+PROFILES: Dict[str, Dict] = {
+    'bulk': {
+        'pragmas': (
+            ("journal_mode", "WAL"),
+            ("synchronous", "NORMAL"),
+            ("cache_size", -64 * 1024),  # 64 Mio
+            ("temp_store", "MEMORY"),
+            ("busy_timeout", 30000),
+            ("foreign_keys", "ON"),
+        ),
+        'batch_size': 5000,
+    },
+    'online': {
+        'pragmas': (
+            ("busy_timeout", 5000),
+            ("foreign_keys", "ON"),
+        ),
+        'batch_size': 100,
+    },
+}
+
+def connect(db_path: Path, profile: str = "online", **kwargs) -> sqlite3.Connection:
+    """
+    Ouvre la base cible avec les PRAGMA du profil `profile` (bulk ou online).
+    Les autres arguments sont transmis à sqlite3.connect.
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Profil de connexion inconnu '{profile}' (profils acceptés : {', '.join(PROFILES)})")
+    con = sqlite3.connect(db_path, **kwargs)
+    for name, value in PROFILES[profile]['pragmas']:
+        con.execute(f"PRAGMA {name} = {value};")
+    return con
+
+def batch_size(profile: str) -> int:
+    """Nombre de jeux par transaction recommandé pour le profil"""
+    return PROFILES[profile]['batch_size']
+
+def secondary_indexes(con: sqlite3.Connection, tables: Iterable[str]) -> List[Tuple[str, str]]:
+    """
+    Index secondaires (non uniques, créés explicitement) des tables : (nom, SQL).
+    Les index uniques sont conservés, ils garantissent l'intégrité des données.
+    """
+    indexes = []
+    for table in tables:
+        for _, name, unique, origin, _ in con.execute(f'PRAGMA index_list("{table}")'):
+            if unique or origin != 'c':
+                continue
+            sql = con.execute("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)).fetchone()
+            if sql and sql[0]:
+                indexes.append((name, sql[0]))
+    return indexes
+
+@contextmanager
+def deferred_indexes(con: sqlite3.Connection, tables: Iterable[str]) -> Iterator[List[str]]:
+    """
+    Supprime les index secondaires des tables pendant un chargement volumineux
+    et les reconstruit ensuite (en une passe par index, même en cas d'erreur).
+
+    Sans effet sur le schéma Prisma actuel : il ne déclare que des clés primaires
+    et des contraintes @unique, conservées par secondary_indexes. Le profil bulk
+    l'utilise tout de même pour qu'un futur @@index (ex: sur gameId des tables
+    filles) soit reconstruit après le chargement sans modifier les chargeurs ;
+    le coût est d'une requête PRAGMA index_list par table.
+    """
+    indexes = secondary_indexes(con, tables)
+    for name, _ in indexes:
+        con.execute(f'DROP INDEX "{name}"')
+    con.commit()
+    try:
+        yield [name for name, _ in indexes]
+    finally:
+        if con.in_transaction:
+            con.rollback()
+        for _, sql in indexes:
+            con.execute(sql)
+        con.commit()
+
+def checkpoint(con: sqlite3.Connection, mode: str = "TRUNCATE") -> Optional[Tuple[int, int, int]]:
+    """
+    Reporte le journal WAL dans la base en fin de synchronisation. Si des lecteurs
+    empêchent le checkpoint `mode`, un checkpoint PASSIVE est effectué.
+    Retourne (bloqué, pages du journal, pages reportées), ou None hors mode WAL.
+    """
+    if con.execute("PRAGMA journal_mode;").fetchone()[0].lower() != 'wal':
+        return None
+    if con.in_transaction:
+        con.commit()
+    result = con.execute(f"PRAGMA wal_checkpoint({mode});").fetchone()
+    if result[0] and mode != "PASSIVE":
+        result = con.execute("PRAGMA wal_checkpoint(PASSIVE);").fetchone()
+    return tuple(result)
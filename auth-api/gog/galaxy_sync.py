@@ -0,0 +1,206 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+if __package__ in (None, ''):
+    # Exécution directe (python gog/galaxy_sync.py) : rend gog et network importables
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from gog import database
+from gog.integrate import integrate_games
+from gog.jeux import OWNED_CTE, get_db_path, iter_library
+
+# Empreinte de chaque jeu : nombre et somme des CRC32 de ses pièces et de ses
+# images. La somme ne dépend pas de l'ordre de lecture, ce qui évite tout tri.
+FINGERPRINT_SQL = """
+    WITH {owned},
+    parts AS (
+        SELECT o.gameId,
+               crc32(o.releaseKey || char(31) || gp.gamePieceTypeId || char(31) || ifnull(gp.value, '')) AS h
+        FROM owned AS o
+        INNER JOIN GamePieces AS gp ON gp.releaseKey = o.releaseKey
+        UNION ALL
+        SELECT rp.gameId, crc32(rp.releaseKey || char(31) || ifnull(ld.images, ''))
+        FROM ProductsToReleaseKeys AS ptr
+        INNER JOIN LimitedDetails AS ld ON ptr.gogId = ld.productId
+        INNER JOIN ReleaseProperties AS rp ON rp.releaseKey = ptr.releaseKey
+        WHERE ptr.releaseKey IN (SELECT releaseKey FROM owned)
+    )
+    SELECT gameId, count(*) || '-' || sum(h)
+    FROM parts
+    GROUP BY gameId;
+""".format(owned=OWNED_CTE.format(game_filter="").strip())
+
+def _crc32(text: str) -> int:
+    return zlib.crc32(text.encode('utf-8'))
+
+# État de la détection de changements (auth-api/cache)
+STATE_PATH = Path(__file__).resolve().parents[1] / "cache" / "galaxy_sync.sqlite"
+
+@dataclass
+class GalaxyDelta:
+    """Changements de la bibliothèque Galaxy depuis la dernière synchronisation validée"""
+    upserts: List[Dict[str, Any]] = field(default_factory=list)
+    deletions: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    # Filigrane et empreintes à enregistrer par GalaxyChangeDetector.commit
+    watermark: Optional[Dict[str, int]] = None
+    fingerprints: Dict[str, str] = field(default_factory=dict, repr=False)
+
+    def is_empty(self) -> bool:
+        return not (self.upserts or self.deletions)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Représentation destinée à l'étape d'intégration (integrate_games(..., delta=True))"""
+        return {'upserts': self.upserts, 'deletions': self.deletions}
+
+class GalaxyChangeDetector:
+    """
+    Détection des changements de la base GOG Galaxy entre deux exécutions.
+
+    1. Filigrane fichier : si la taille et la date de modification de
+       `galaxy-2.0.db` (et de son journal WAL) n'ont pas changé, rien n'est relu.
+    2. Empreintes par jeu : sinon, une requête calcule l'empreinte de chaque jeu
+       (pièces et images) sans décoder de JSON, et la compare à la précédente.
+    3. Seuls les jeux nouveaux ou modifiés sont ré-extraits ; les jeux disparus
+       sont signalés comme suppressions.
+
+    Le nouvel état n'est enregistré que par `commit`, une fois le delta intégré.
+    """
+
+    def __init__(self, galaxy_db_path: Path, state_path: Path = STATE_PATH):
+        self.galaxy_db_path = Path(galaxy_db_path)
+        self.state_path = Path(state_path)
+        self._lock = threading.Lock()
+
+        if self.state_path.parent:
+            os.makedirs(self.state_path.parent, exist_ok=True)
+
+        self._con = sqlite3.connect(self.state_path, timeout=30, check_same_thread=False)
+        self._con.execute("PRAGMA journal_mode = WAL;")
+        self._con.execute("""
+            CREATE TABLE IF NOT EXISTS watermark (
+                name  TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self._con.execute("""
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                gameId      TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL
+            ) WITHOUT ROWID
+        """)
+
+    def close(self):
+        with self._lock:
+            self._con.close()
+
+    def file_watermark(self) -> Dict[str, int]:
+        """Taille et date de modification de la base Galaxy et de son journal WAL"""
+        watermark = {}
+        for suffix in ("", "-wal"):
+            path = Path(f"{self.galaxy_db_path}{suffix}")
+            if path.exists():
+                stat = path.stat()
+                watermark[f"size{suffix}"] = stat.st_size
+                watermark[f"mtime{suffix}"] = stat.st_mtime_ns
+        return watermark
+
+    def fingerprints(self, con: sqlite3.Connection) -> Dict[str, str]:
+        """Empreinte de chaque jeu possédé de la base Galaxy ouverte"""
+        con.create_function("crc32", 1, _crc32, deterministic=True)
+        return dict(con.execute(FINGERPRINT_SQL))
+
+    def _stored_state(self) -> Tuple[Dict[str, int], int]:
+        with self._lock:
+            watermark = dict(self._con.execute("SELECT name, value FROM watermark"))
+            count = self._con.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+        return watermark, count
+
+    def detect(self, force: bool = False) -> GalaxyDelta:
+        """
+        Calcule le delta depuis la dernière synchronisation validée.
+        `force` ignore le filigrane fichier et recalcule toutes les empreintes.
+        """
+        if not self.galaxy_db_path.exists():
+            raise FileNotFoundError(f"Base de données GOG Galaxy introuvable : {self.galaxy_db_path}")
+
+        # Le filigrane est relevé avant la lecture : une écriture concurrente
+        # sera donc détectée à l'exécution suivante
+        watermark = self.file_watermark()
+        stored_watermark, known_games = self._stored_state()
+        if not force and stored_watermark == watermark:
+            return GalaxyDelta(unchanged=known_games)
+
+        with self._lock:
+            previous = dict(self._con.execute("SELECT gameId, fingerprint FROM fingerprints"))
+
+        con = sqlite3.connect(f"file:{self.galaxy_db_path}?mode=ro", uri=True)
+        try:
+            current = self.fingerprints(con)
+            changed = sorted(game_id for game_id, fingerprint in current.items()
+                             if previous.get(game_id) != fingerprint)
+            upserts = list(iter_library(con, game_ids=changed)) if changed else []
+        finally:
+            con.close()
+
+        return GalaxyDelta(
+            upserts=upserts,
+            deletions=sorted(game_id for game_id in previous if game_id not in current),
+            unchanged=len(current) - len(changed),
+            watermark=watermark,
+            fingerprints=current,
+        )
+
+    def commit(self, delta: GalaxyDelta):
+        """Enregistre le filigrane et les empreintes d'un delta intégré avec succès"""
+        if delta.watermark is None:
+            return
+        changed = {game['gameId'] for game in delta.upserts}
+        with self._lock, self._con:
+            self._con.execute("DELETE FROM watermark")
+            self._con.executemany("INSERT INTO watermark (name, value) VALUES (?, ?)",
+                                  delta.watermark.items())
+            self._con.executemany("DELETE FROM fingerprints WHERE gameId = ?",
+                                  [(game_id,) for game_id in delta.deletions])
+            self._con.executemany(
+                "INSERT OR REPLACE INTO fingerprints (gameId, fingerprint) VALUES (?, ?)",
+                [(game_id, delta.fingerprints[game_id]) for game_id in changed if game_id in delta.fingerprints]
+            )
+
+    def reset(self):
+        """Oublie l'état enregistré : la prochaine détection ré-extrait tout"""
+        with self._lock, self._con:
+            self._con.execute("DELETE FROM watermark")
+            self._con.execute("DELETE FROM fingerprints")
+
+def write_delta(delta: GalaxyDelta, output_path: Path):
+    """Écrit le delta (upserts et suppressions) au format JSON compact"""
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(delta.to_dict(), f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, output_path)
+
+if __name__ == '__main__':
+    # Depuis auth-api : python -m gog.galaxy_sync (ou python gog/galaxy_sync.py, depuis n'importe quel dossier)
+    detector = GalaxyChangeDetector(get_db_path())
+    delta = detector.detect()
+    if delta.is_empty():
+        print(f"✅ Aucun changement dans GOG Galaxy ({delta.unchanged} jeu(x) inchangé(s)).")
+        detector.commit(delta)
+    else:
+        delta_path = Path.cwd() / "my_library_delta.json"
+        write_delta(delta, delta_path)
+        print(f"✅ Delta écrit dans '{delta_path}' : {len(delta.upserts)} jeu(x) ajouté(s) ou modifié(s), "
+              f"{len(delta.deletions)} suppression(s), {delta.unchanged} inchangé(s).")
+        # L'état n'est enregistré qu'une fois le delta intégré : après un échec,
+        # la prochaine exécution recalcule le même delta
+        if integrate_games(delta_path, database.PRISMA_DB_PATH, profile="online", delta=True):
+            detector.commit(delta)
+        else:
+            print("❌ Delta non intégré : l'état de synchronisation n'a pas été enregistré.")
+    detector.close()
@@ -0,0 +1,351 @@
+import hashlib
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+import requests
+if __package__ in (None, ''):
+    # Exécution directe (python gog/image_cache.py) : rend gog et network importables
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from gog import database
+from gog.correct_url import IMAGE_COLUMNS
+from network.retry import RetryPolicy
+from network.transport import HTTPTransport
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow est optionnel : sans lui, pas de miniatures
+    Image = None
+
+# Images servies par Next.js depuis public/ (URL /images/cache/...) et manifeste
+# du cache, hors de public/ (auth-api/cache)
+PUBLIC_CACHE_DIR = Path(__file__).resolve().parents[2] / "public" / "images" / "cache"
+MANIFEST_PATH = Path(__file__).resolve().parents[1] / "cache" / "image_cache.sqlite"
+
+# Largeurs des miniatures générées (jamais d'agrandissement). Une miniature est
+# rangée à côté de l'original, sous ab/<sha256>_<largeur>.<ext> (variant_path) :
+# l'application peut ainsi proposer /images/cache/ab/<sha256>_320.jpg dans un
+# srcset, pour les largeurs inférieures à celle de l'original (voir ImageCache.variants)
+THUMBNAIL_WIDTHS = (160, 320, 640)
+# Taille maximale d'une image téléchargée
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+
+_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+    'image/gif': '.gif',
+    'image/avif': '.avif',
+    'image/svg+xml': '.svg',
+}
+_THUMBNAIL_FORMATS = {'.jpg', '.png', '.webp'}
+
+class CachedImage(NamedTuple):
+    """Image téléchargée : empreinte SHA-256 et chemin relatif au cache"""
+    url: str
+    sha256: str
+    path: str
+
+def image_extension(url: str, content_type: Optional[str]) -> str:
+    """Extension du fichier : type MIME de la réponse, sinon extension de l'URL"""
+    extension = _EXTENSIONS.get((content_type or '').split(';')[0].strip().lower())
+    if extension:
+        return extension
+    suffix = os.path.splitext(urlparse(url).path)[1].lower()
+    if suffix == '.jpeg':
+        return '.jpg'
+    return suffix if suffix in _EXTENSIONS.values() else '.img'
+
+def variant_path(path: str, width: int) -> str:
+    """Chemin de la miniature de largeur `width` : ab/<empreinte>_320.jpg"""
+    stem, extension = os.path.splitext(path)
+    return f"{stem}_{width}{extension}"
+
+def _write_atomic(target: Path, write):
+    """Écrit `target` via un fichier temporaire du même dossier (jamais de fichier partiel)"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def make_thumbnails(root_dir: str, path: str, widths: Sequence[int]) -> List[int]:
+    """
+    Génère les miniatures manquantes d'une image du cache (exécutée dans un
+    processus de travail). Retourne les largeurs disponibles ; une image que
+    Pillow ne sait pas lire ou écrire (format inconnu, fichier corrompu, image
+    trop grande) n'a pas de miniature et un avertissement est affiché.
+    """
+    source = Path(root_dir) / path
+    available = []
+    if source.suffix not in _THUMBNAIL_FORMATS:
+        return available
+    try:
+        with Image.open(source) as image:
+            image.load()
+            for width in widths:
+                if width >= image.width:
+                    continue
+                target = Path(root_dir) / variant_path(path, width)
+                if not target.exists():
+                    height = max(1, round(image.height * width / image.width))
+                    thumbnail = image.resize((width, height), Image.LANCZOS)
+                    if source.suffix == '.jpg' and thumbnail.mode not in ('RGB', 'L'):
+                        thumbnail = thumbnail.convert('RGB')
+                    image_format = image.format
+                    _write_atomic(target, lambda f: thumbnail.save(f, format=image_format, quality=85))
+                available.append(width)
+    except (OSError, Image.DecompressionBombError) as e:
+        # UnidentifiedImageError (format inconnu) est une sous-classe d'OSError
+        print(f"🟡 Avertissement : miniatures incomplètes pour '{path}' : {e}")
+    return available
+
+class ImageCache:
+    """
+    Cache local des images des jeux, adressé par contenu.
+
+    - les images sont téléchargées en parallèle (`download_workers` threads,
+      transport HTTP partagé avec reprises) ;
+    - chaque image est stockée une seule fois sous `root_dir/ab/<sha256>.<ext>`,
+      quel que soit le nombre d'URLs qui la servent ;
+    - les miniatures (THUMBNAIL_WIDTHS) sont générées par un pool de processus
+      si Pillow est installé, sous ab/<sha256>_<largeur>.<ext> ; `variants`
+      retourne celles d'une image ;
+    - un manifeste SQLite (URL -> empreinte, miniatures produites) permet aux
+      exécutions suivantes d'ignorer les images déjà en cache.
+    """
+
+    def __init__(self, root_dir: Path = PUBLIC_CACHE_DIR, manifest_path: Path = MANIFEST_PATH,
+                 url_prefix: str = "/images/cache", transport: Optional[HTTPTransport] = None,
+                 download_workers: int = 8, thumbnail_workers: Optional[int] = None,
+                 widths: Sequence[int] = THUMBNAIL_WIDTHS):
+        self.root_dir = Path(root_dir)
+        self.url_prefix = url_prefix.rstrip('/')
+        self.transport = transport or HTTPTransport(headers={'Accept': 'image/*'}, retry_policy=RetryPolicy())
+        self.download_workers = download_workers
+        self.thumbnail_workers = thumbnail_workers
+        self.widths = tuple(sorted(widths))
+        self.downloaded_count = 0
+        self.deduplicated_count = 0
+        self.cached_count = 0
+        self.failed_count = 0
+        self.thumbnail_count = 0
+
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        directory = os.path.dirname(manifest_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._con = sqlite3.connect(manifest_path)
+        self._con.execute("PRAGMA journal_mode = WAL;")
+        self._con.executescript("""
+            CREATE TABLE IF NOT EXISTS images (
+                url        TEXT PRIMARY KEY,
+                sha256     TEXT NOT NULL,
+                path       TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS images_sha256 ON images (sha256);
+            CREATE TABLE IF NOT EXISTS thumbnails (
+                sha256 TEXT    NOT NULL,
+                width  INTEGER NOT NULL,
+                PRIMARY KEY (sha256, width)
+            ) WITHOUT ROWID;
+        """)
+
+    def close(self):
+        self._con.close()
+
+    def __enter__(self) -> 'ImageCache':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def public_path(self, path: str) -> str:
+        """Chemin servi par l'application pour un fichier du cache"""
+        return f"{self.url_prefix}/{path}"
+
+    def _cached(self, urls: Iterable[str]) -> Dict[str, str]:
+        """URLs du manifeste dont le fichier est toujours présent : URL -> chemin relatif"""
+        self._con.execute("CREATE TEMP TABLE IF NOT EXISTS wanted (url TEXT PRIMARY KEY) WITHOUT ROWID")
+        self._con.execute("DELETE FROM temp.wanted")
+        self._con.executemany("INSERT OR IGNORE INTO temp.wanted (url) VALUES (?)", ((url,) for url in urls))
+        rows = self._con.execute("SELECT i.url, i.path FROM images AS i INNER JOIN temp.wanted AS w ON w.url = i.url")
+        cached = {url: path for url, path in rows if (self.root_dir / path).exists()}
+        self._con.execute("DELETE FROM temp.wanted")
+        self._con.commit()
+        return cached
+
+    def lookup(self, urls: Iterable[str]) -> Dict[str, str]:
+        """Chemins publics des URLs déjà en cache, sans téléchargement"""
+        return {url: self.public_path(path) for url, path in self._cached(urls).items()}
+
+    def variants(self, public_path: str) -> Dict[int, str]:
+        """
+        Miniatures générées d'une image du cache : largeur -> chemin public.
+        Vide si Pillow est absent ou si l'original est plus étroit que THUMBNAIL_WIDTHS.
+        """
+        prefix = self.url_prefix + '/'
+        if not public_path.startswith(prefix):
+            return {}
+        path = public_path[len(prefix):]
+        rows = self._con.execute("SELECT width FROM thumbnails WHERE sha256 = ? AND width > 0 ORDER BY width",
+                                 (Path(path).stem,))
+        return {width: self.public_path(variant_path(path, width)) for width, in rows}
+
+    def _download(self, url: str) -> CachedImage:
+        """Télécharge une image (thread de travail) et la range sous son empreinte"""
+        with self.transport.get(url, stream=True) as response:
+            response.raise_for_status()
+            chunks, size, digest = [], 0, hashlib.sha256()
+            for chunk in response.iter_content(64 * 1024):
+                size += len(chunk)
+                if size > MAX_IMAGE_BYTES:
+                    raise ValueError(f"image de plus de {MAX_IMAGE_BYTES // (1024 * 1024)} Mio")
+                digest.update(chunk)
+                chunks.append(chunk)
+            content_type = response.headers.get('Content-Type')
+        sha256 = digest.hexdigest()
+        path = f"{sha256[:2]}/{sha256}{image_extension(url, content_type)}"
+        target = self.root_dir / path
+        if not target.exists():
+            _write_atomic(target, lambda f: f.writelines(chunks))
+        return CachedImage(url, sha256, path)
+
+    def fetch(self, urls: Iterable[str]) -> Dict[str, str]:
+        """
+        Met en cache les images des URLs et génère leurs miniatures.
+        Retourne URL -> chemin public, pour les images disponibles.
+        """
+        urls = list(dict.fromkeys(url for url in urls if url))
+        paths = self._cached(urls)
+        self.cached_count += len(paths)
+        missing = [url for url in urls if url not in paths]
+
+        if missing:
+            print(f"⬇️  {len(missing)} image(s) à télécharger ({len(paths)} déjà en cache)...")
+            known = {sha256 for sha256, in self._con.execute("SELECT DISTINCT sha256 FROM images")}
+            fetched: List[CachedImage] = []
+            with ThreadPoolExecutor(max_workers=self.download_workers) as pool:
+                futures = {pool.submit(self._download, url): url for url in missing}
+                for future in as_completed(futures):
+                    try:
+                        image = future.result()
+                    except (requests.exceptions.RequestException, ValueError, OSError) as e:
+                        self.failed_count += 1
+                        print(f"🟡 Avertissement : image non téléchargée '{futures[future]}' : {e}")
+                        continue
+                    if image.sha256 in known:
+                        self.deduplicated_count += 1
+                    else:
+                        self.downloaded_count += 1
+                        known.add(image.sha256)
+                    fetched.append(image)
+                    paths[image.url] = image.path
+            now = time.time()
+            with self._con:
+                self._con.executemany("INSERT OR REPLACE INTO images (url, sha256, path, fetched_at) VALUES (?, ?, ?, ?)",
+                                      ((image.url, image.sha256, image.path, now) for image in fetched))
+
+        self._thumbnails(set(paths.values()))
+        return {url: self.public_path(path) for url, path in paths.items()}
+
+    def _thumbnails(self, paths: Iterable[str]):
+        """Miniatures des images qui n'en ont pas encore, dans un pool de processus"""
+        if not self.widths:
+            return
+        if Image is None:
+            print("ℹ️ Pillow n'est pas installé : les miniatures ne sont pas générées.")
+            return
+        done = {sha256 for sha256, in self._con.execute("SELECT DISTINCT sha256 FROM thumbnails")}
+        pending = sorted(path for path in paths if Path(path).stem not in done)
+        if not pending:
+            return
+        print(f"🖼️  Génération des miniatures de {len(pending)} image(s)...")
+        rows: List[Tuple[str, int]] = []
+        with ProcessPoolExecutor(max_workers=self.thumbnail_workers) as pool:
+            futures = {pool.submit(make_thumbnails, str(self.root_dir), path, self.widths): path for path in pending}
+            for future in as_completed(futures):
+                sha256 = Path(futures[future]).stem
+                try:
+                    widths = future.result()
+                except Exception as e:
+                    # Processus de travail interrompu : l'image reste sans miniature
+                    print(f"🟡 Avertissement : miniatures non générées pour '{futures[future]}' : {e}")
+                    widths = []
+                # Largeur 0 : image traitée sans miniature (trop petite ou illisible)
+                rows.extend((sha256, width) for width in widths or [0])
+                self.thumbnail_count += len(widths)
+        with self._con:
+            self._con.executemany("INSERT OR IGNORE INTO thumbnails (sha256, width) VALUES (?, ?)", rows)
+
+def localize_game_images(db_path: Path, cache: ImageCache, columns: Sequence[str] = IMAGE_COLUMNS,
+                         profile: str = "online") -> Optional[Dict[str, int]]:
+    """
+    Remplace les URLs distantes des colonnes d'images de Game par les chemins
+    locaux du cache. Les URLs non téléchargées restent inchangées ; une nouvelle
+    exécution ne traite que les URLs encore distantes.
+    """
+    if not db_path.exists():
+        print(f"❌ Erreur : Base de données introuvable à '{db_path}'")
+        return None
+
+    con = database.connect(db_path, profile)
+    try:
+        remote = " UNION ".join(f'SELECT "{col}" FROM Game WHERE "{col}" LIKE \'http%://%\'' for col in columns)
+        urls = [url for url, in con.execute(remote)]
+        print(f"🔍 {len(urls)} URL(s) d'images distantes dans la base.")
+        local = cache.fetch(urls)
+
+        con.execute("CREATE TEMP TABLE local_images (url TEXT PRIMARY KEY, path TEXT NOT NULL) WITHOUT ROWID")
+        con.executemany("INSERT INTO temp.local_images (url, path) VALUES (?, ?)", local.items())
+        assignments = ", ".join(
+            f'"{col}" = COALESCE((SELECT path FROM temp.local_images WHERE url = Game."{col}"), "{col}")'
+            for col in columns)
+        condition = " OR ".join(f'"{col}" IN (SELECT url FROM temp.local_images)' for col in columns)
+        con.execute(f"UPDATE Game SET {assignments}, updatedAt = datetime('now') WHERE {condition}")
+        updated_count = con.execute("SELECT changes()").fetchone()[0]
+        con.commit()
+        con.execute("DROP TABLE temp.local_images")
+        database.checkpoint(con)
+    except sqlite3.Error as e:
+        print(f"❌ Erreur lors de la mise à jour : {e}")
+        con.rollback()
+        return None
+    finally:
+        con.close()
+
+    stats = {
+        'games_updated': updated_count,
+        'downloaded': cache.downloaded_count,
+        'deduplicated': cache.deduplicated_count,
+        'cached': cache.cached_count,
+        'failed': cache.failed_count,
+        'thumbnails': cache.thumbnail_count,
+    }
+    print(f"\n--- Mise en cache terminée ---")
+    print(f"⬇️  {stats['downloaded']} image(s) téléchargée(s), {stats['deduplicated']} doublon(s), "
+          f"{stats['cached']} déjà en cache.")
+    if stats['failed']:
+        print(f"⏭️  {stats['failed']} image(s) en échec (URL conservée).")
+    print(f"🖼️  {stats['thumbnails']} miniature(s) générée(s).")
+    print(f"✅ {stats['games_updated']} jeu(x) pointent vers le cache local.")
+    return stats
+
+if __name__ == '__main__':
+    # Depuis auth-api : python -m gog.image_cache (ou python gog/image_cache.py, depuis n'importe quel dossier)
+    # Base Prisma du dépôt (prisma/db.sqlite)
+    target_db_file_path = database.PRISMA_DB_PATH
+    with ImageCache() as image_cache:
+        # --bulk : profil de connexion pour une mise à jour complète, application arrêtée
+        localize_game_images(target_db_file_path, image_cache,
+                             profile="bulk" if '--bulk' in sys.argv[1:] else "online")
@@ -1,141 +1,550 @@
+import hashlib
+import itertools
 import json
+import queue
 import sqlite3
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from typing import Any, Container, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+if __package__ in (None, ''):
+    # Exécution directe (python gog/integrate.py) : rend gog et network importables
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from gog import database
+from network.json_stream import JSONStreamError, iter_json_array
 
-def integrate_games(json_path: Path, db_path: Path):
+# Listes du jeu chargées dans les tables filles : (table, clé JSON, colonne)
+CHILD_LISTS = (
+    ('Genre', 'genres', 'name'),
+    ('Developer', 'developers', 'name'),
+    ('Publisher', 'publishers', 'name'),
+    ('Tag', 'tags', 'name'),
+    ('Theme', 'themes', 'name'),
+    ('Feature', 'features', 'name'),
+    ('SupportedPlatform', 'supported', 'platform'),
+    ('OwnedReleaseKey', 'ownedReleaseKeys', 'releaseKey'),
+    ('Screenshot', 'screenshots', 'url'),  # Standardisé
+    ('Video', 'videos', 'url'),  # Standardisé
+)
+
+# Colonnes de Game alimentées depuis le JSON (hors empreinte et dates)
+GAME_COLUMNS = (
+    'gameId', 'title', 'summary', 'platform', 'releaseDate', 'criticsScore', 'myRating',
+    'isFromProductsApi', 'isModifiedByUser', 'state', 'parentGrk', 'background',
+    'horizontalCover', 'verticalCover', 'logo', 'squareIcon', 'productCard',
+    'changelog', 'forum', 'support',
+)
+
+# Colonnes des tables filles remplies par integrate_games (hors gameId)
+CHILD_COLUMNS = {
+    **{table: (column,) for table, _, column in CHILD_LISTS},
+    'Score': ('critics', 'users', 'metacritic'),
+    'GameStats': ('playtime', 'lastPlayed', 'timesLaunched'),
+}
+CHILD_INSERT_SQL = {
+    table: f"INSERT INTO {table} ({', '.join(columns)}, gameId) VALUES ({', '.join('?' * (len(columns) + 1))})"
+    for table, columns in CHILD_COLUMNS.items()
+}
+
+def game_insert_sql(hashed: bool = False, upsert: bool = False) -> str:
     """
-    Intègre les jeux d'un fichier JSON dans une base de données SQLite
-    en respectant le schéma Prisma.
+    Requête d'insertion d'un jeu, avec l'empreinte de son contenu si `hashed`.
+    Avec `upsert`, un jeu existant est mis à jour (ON CONFLICT) en conservant sa
+    date de création et la note personnelle modifiée dans l'application.
     """
-    if not json_path.exists():
-        print(f"❌ Erreur : Fichier JSON introuvable à '{json_path}'")
-        return
-    if not db_path.exists():
-        print(f"❌ Erreur : Base de données introuvable à '{db_path}'")
-        print("Veuillez d'abord exécuter 'npx prisma db push' pour la créer.")
+    columns = GAME_COLUMNS + (('contentHash',) if hashed else ()) + ('createdAt', 'updatedAt')
+    sql = f"INSERT INTO Game ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    if upsert:
+        updates = {column: f"excluded.{column}" for column in columns if column not in ('gameId', 'createdAt')}
+        updates['myRating'] = "CASE WHEN Game.isModifiedByUser = 1 THEN Game.myRating ELSE excluded.myRating END"
+        updates['isModifiedByUser'] = "max(Game.isModifiedByUser, excluded.isModifiedByUser)"
+        sql += " ON CONFLICT(gameId) DO UPDATE SET " + ", ".join(
+            f"{column} = {value}" for column, value in updates.items())
+    return sql
+
+INSERT_GAME_SQL = game_insert_sql()
+
+def _sql_value(value: Any) -> Any:
+    """Vérifie qu'une valeur peut être écrite telle quelle dans SQLite"""
+    if value is not None and not isinstance(value, (str, int, float)):
+        raise TypeError(f"valeur non scalaire : {value!r}")
+    return value
+
+def game_values(game: Dict[str, Any]) -> Tuple:
+    """Valeurs de la ligne Game d'un jeu, dans l'ordre de GAME_COLUMNS"""
+    return tuple(_sql_value(value) for value in (
+        game.get('gameId'), game.get('title'), game.get('summary'), game.get('platform'), game.get('releaseDate'),
+        game.get('criticsScore') or 0.0, game.get('myRating'),
+        game.get('isFromProductsApi') or 0, game.get('isModifiedByUser') or 0,
+        game.get('state'), game.get('parentGrk'), game.get('background'), game.get('horizontalCover'),
+        game.get('verticalCover'), game.get('image'), game.get('squareIcon'), game.get('productCard'),
+        game.get('changelog'), game.get('forum'), game.get('support'),
+    ))
+
+def child_rows(game: Dict[str, Any]) -> Dict[str, List[Tuple]]:
+    """
+    Lignes des tables filles d'un jeu, sans l'id du jeu (ajouté à l'insertion).
+    Un élément objet fournit le champ de la colonne s'il est renseigné, une valeur
+    simple est conservée si elle n'est pas nulle. Lève TypeError si une valeur
+    n'est pas scalaire.
+    """
+    rows: Dict[str, List[Tuple]] = {}
+    for table, json_key, column_name in CHILD_LISTS:
+        json_list = game.get(json_key)
+        if not json_list or not isinstance(json_list, list):
+            continue
+        values = []
+        for item in json_list:
+            if isinstance(item, dict):
+                # Liste d'objets : on extrait la valeur de la clé 'column_name'
+                value = item.get(column_name)
+                if value:
+                    values.append((_sql_value(value),))
+            elif item is not None:
+                values.append((_sql_value(item),))
+        if values:
+            rows[table] = values
+
+    # Relations one-to-one
+    score = game.get('score')
+    if score:
+        rows['Score'] = [tuple(_sql_value(value) for value in (
+            score.get('critics') or 0.0, score.get('users') or 0.0, score.get('metacritic') or 0.0))]
+
+    stats = game.get('game_stats')
+    if stats:
+        rows['GameStats'] = [tuple(_sql_value(value) for value in (
+            stats.get('playtime') or 0, stats.get('lastPlayed'), stats.get('timesLaunched') or 0))]
+    return rows
+
+def iter_games(json_path: Path, chunk_size: int = 64 * 1024, raw: bool = False,
+               key: Optional[str] = None) -> Iterator[Any]:
+    """
+    Jeux d'un export de jeux.py, décodés au fil de la lecture du fichier : tableau
+    JSON (formats json et compact) ou un jeu par ligne (format ndjson). Seul le
+    jeu en cours de décodage est conservé en mémoire. Avec `raw`, les lignes NDJSON
+    sont produites sans être décodées (décodage par prepare_game). Avec `key`, le
+    tableau associé à cette clé est parcouru (ex: "upserts" d'un delta galaxy_sync).
+    """
+    with open(json_path, 'rb') as f:
+        head = f.read(chunk_size)
+        if key is not None or head.lstrip()[:1] == b'[':
+            yield from iter_json_array(itertools.chain([head], iter(lambda: f.read(chunk_size), b'')), key=key)
+            return
+        f.seek(0)
+        for line in f:
+            if line.strip():
+                yield line if raw else json.loads(line)
+
+def prefetch(items: Iterable[Any], maxsize: int, chunk_size: int = 100) -> Iterator[Any]:
+    """
+    Parcourt `items` dans un thread dédié, avec au plus `maxsize` éléments
+    d'avance : le décodage du fichier se poursuit pendant les écritures SQLite.
+    Les éléments sont transmis par paquets de `chunk_size` pour limiter les
+    échanges entre threads. Une erreur du thread de lecture est relancée dans
+    l'appelant, après les éléments lus avant elle.
+    """
+    pending: queue.Queue = queue.Queue(max(1, maxsize // chunk_size))
+    stop = threading.Event()
+
+    def put(chunk, error=None, last=False) -> bool:
+        while not stop.is_set():
+            try:
+                pending.put((chunk, error, last), timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        iterator = iter(items)
+        chunk = []
+        try:
+            for item in iterator:
+                chunk.append(item)
+                if len(chunk) >= chunk_size:
+                    if not put(chunk):
+                        return
+                    chunk = []
+            put(chunk, last=True)
+        except BaseException as e:
+            put(chunk, e, last=True)
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close:
+                close()
+
+    thread = threading.Thread(target=produce, name="integrate-reader", daemon=True)
+    thread.start()
+    try:
+        while True:
+            chunk, error, last = pending.get()
+            yield from chunk
+            if error is not None:
+                raise error
+            if last:
+                return
+    finally:
+        stop.set()
+        thread.join()
+
+def content_hash(values: Tuple, children: Dict[str, List[Tuple]]) -> str:
+    """Empreinte stable du contenu normalisé d'un jeu (ligne Game et tables filles)"""
+    payload = json.dumps([values, children], sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+class PreparedGame(NamedTuple):
+    """Jeu transformé en lignes prêtes à insérer (résultat de prepare_game)"""
+    game_id: Any
+    title: Any
+    values: Tuple = ()
+    children: Dict[str, List[Tuple]] = {}
+    digest: Optional[str] = None
+    # Message d'avertissement si le jeu ne peut pas être intégré
+    warning: Optional[str] = None
+
+def prepare_game(game: Any, hashed: bool = True, known: Optional[Container[str]] = None) -> PreparedGame:
+    """
+    Transforme un jeu (objet décodé, ou ligne NDJSON brute) en lignes Game et
+    tables filles et calcule son empreinte. Sans effet de bord : peut être
+    exécutée dans un processus de transformation. Les jeux dont le gameId est
+    dans `known` (déjà présents, à ignorer) ne sont pas transformés.
+    """
+    if isinstance(game, (bytes, str)):
+        game = json.loads(game)
+    if not isinstance(game, dict):
+        return PreparedGame(None, None, warning=f"🟡 Avertissement : élément ignoré, ce n'est pas un objet JSON : {game!r:.80}")
+    game_id, title = game.get('gameId'), game.get('title')
+    if not game_id:
+        return PreparedGame(game_id, game.get('title', 'N/A'))
+    if known is not None and game_id in known:
+        return PreparedGame(game_id, title)
+    try:
+        children = child_rows(game)
+        values = game_values(game)
+    except (TypeError, AttributeError) as e:
+        return PreparedGame(game_id, title, warning=f"🟡 Avertissement sur le jeu '{title}': une liste était vide ou mal formée. Erreur : {e}")
+    return PreparedGame(game_id, title, values, children, content_hash(values, children) if hashed else None)
+
+def prepare_chunk(games: List[Any], hashed: bool) -> Tuple[List[PreparedGame], Optional[Exception]]:
+    """
+    Transforme un paquet de jeux. Une erreur de décodage est renvoyée avec les
+    jeux qui la précèdent, pour qu'ils soient chargés comme en mode séquentiel.
+    """
+    prepared = []
+    for game in games:
+        try:
+            prepared.append(prepare_game(game, hashed))
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            return prepared, e
+    return prepared, None
+
+def _chunk_results(future) -> Iterator[PreparedGame]:
+    prepared, error = future.result()
+    yield from prepared
+    if error is not None:
+        raise error
+
+def iter_prepared(games: Iterable[Any], workers: int = 1, hashed: bool = True,
+                  chunk_size: int = 200, known: Optional[Container[str]] = None) -> Iterator[PreparedGame]:
+    """
+    Transforme les jeux dans `workers` processus, par paquets de `chunk_size`.
+    Les résultats sont produits dans l'ordre des jeux (sortie déterministe) et
+    au plus deux paquets par processus sont en cours : la lecture attend que
+    l'écriture suive. `known` n'est utilisé que sans processus (workers = 1).
+    """
+    if workers <= 1:
+        for game in games:
+            yield prepare_game(game, hashed, known)
         return
 
-    with open(json_path, 'r', encoding='utf-8') as f:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running: Deque = deque()
         try:
-            games_data = json.load(f)
-        except json.JSONDecodeError:
-            print(f"❌ Erreur : Le fichier JSON '{json_path}' est mal formaté.")
-            return
-    
-    con = sqlite3.connect(db_path)
-    cur = con.cursor()
-    cur.execute("PRAGMA foreign_keys = ON;")
+            iterator = iter(games)
+            while True:
+                chunk = list(itertools.islice(iterator, chunk_size))
+                if not chunk:
+                    break
+                running.append(pool.submit(prepare_chunk, chunk, hashed))
+                if len(running) >= 2 * workers:
+                    yield from _chunk_results(running.popleft())
+            while running:
+                yield from _chunk_results(running.popleft())
+        finally:
+            for future in running:
+                future.cancel()
+
+class BulkLoader:
+    """
+    Chargement par lots des jeux dans la base Prisma.
+
+    - les gameId existants (et leur empreinte) sont lus en une seule requête ;
+    - les jeux sont insérés par lots de `batch_size`, un lot par transaction ;
+    - chaque jeu est isolé par un SAVEPOINT : un enregistrement invalide est
+      annulé sans interrompre le lot ;
+    - les lignes des tables filles sont accumulées par table et écrites en un
+      seul executemany à la fin du lot.
+
+    Avec `upsert`, un jeu existant dont l'empreinte (colonne contentHash) est
+    inchangée est ignoré ; sinon sa ligne Game est mise à jour et seules ses
+    tables filles qui diffèrent sont réécrites.
+    """
 
-    integrated_count = 0
-    skipped_count = 0
+    def __init__(self, con: sqlite3.Connection, batch_size: int = 500, upsert: bool = False):
+        if batch_size < 1:
+            raise ValueError("batch_size doit être supérieur ou égal à 1")
+        self.con = con
+        self.batch_size = batch_size
+        self.upsert = upsert
+        self.integrated_count = 0
+        # Jeux ajoutés dont le lot a été validé (integrated_count inclut le lot en cours)
+        self.committed_count = 0
+        self.updated_count = 0
+        self.unchanged_count = 0
+        self.skipped_count = 0
+        self.failed_count = 0
 
-    for game in games_data:
-        con.execute('BEGIN')
+        # L'empreinte n'est enregistrée que si le schéma Prisma la prévoit
+        self.hashed = 'contentHash' in {row[1] for row in con.execute("PRAGMA table_info(Game)")}
+        if upsert and not self.hashed:
+            raise ValueError("La colonne Game.contentHash est absente : exécutez 'npx prisma db push'")
+        self._insert_sql = game_insert_sql(self.hashed, upsert)
+
+        self._cur = con.cursor()
+        hash_column = 'contentHash' if self.hashed else 'NULL'
+        self._existing: Dict[str, Tuple[int, Optional[str]]] = {
+            row[0]: (row[1], row[2]) for row in con.execute(f"SELECT gameId, id, {hash_column} FROM Game")
+        }
+        self._buffers: Dict[str, List[Tuple]] = {table: [] for table in CHILD_INSERT_SQL}
+        # Jeux mis à jour dans le lot courant : id -> nouvelles lignes filles
+        self._replaced: Dict[int, Dict[str, List[Tuple]]] = {}
+        self._inserted: Set[int] = set()
+        self._pending = 0
+
+    def known_games(self) -> Optional[Container[str]]:
+        """gameId à ignorer sans transformation (hors mode upsert)"""
+        return None if self.upsert else self._existing
+
+    def load(self, games: Iterable[Dict[str, Any]]):
+        """Intègre tous les jeux puis valide le dernier lot"""
+        self.load_prepared(prepare_game(game, self.hashed, self.known_games()) for game in games)
+
+    def load_prepared(self, prepared_games: Iterable[PreparedGame]):
+        """Intègre des jeux déjà transformés (iter_prepared) puis valide le dernier lot"""
         try:
-            game_id_value = game.get('gameId')
-            if not game_id_value:
-                print(f"⏭️  Jeu sans 'gameId' trouvé. Ignoré. Titre : '{game.get('title', 'N/A')}'")
-                con.execute('ROLLBACK')
-                continue
+            for prepared in prepared_games:
+                self.add_prepared(prepared)
+            self.flush()
+        except BaseException:
+            if self.con.in_transaction:
+                self.con.rollback()
+            raise
 
-            res = cur.execute("SELECT id FROM Game WHERE gameId = ?", (game_id_value,)).fetchone()
-            if res:
-                skipped_count += 1
-                con.execute('ROLLBACK')
-                continue
+    def add(self, game: Dict[str, Any]) -> bool:
+        """Ajoute un jeu au lot courant ; retourne False s'il est ignoré"""
+        return self.add_prepared(prepare_game(game, self.hashed, self.known_games()))
+
+    def add_prepared(self, prepared: PreparedGame) -> bool:
+        """Ajoute un jeu déjà transformé (prepare_game) au lot courant"""
+        game_id_value, title, values, children, digest, warning = prepared
+        if warning:
+            print(warning)
+            self.failed_count += 1
+            return False
+        if not game_id_value:
+            print(f"⏭️  Jeu sans 'gameId' trouvé. Ignoré. Titre : '{title}'")
+            return False
+        existing = self._existing.get(game_id_value)
+        if existing and not self.upsert:
+            self.skipped_count += 1
+            return False
 
-            print(f"⏳ Intégration du jeu : '{game.get('title')}'")
-            
-            now_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-            critics_score = game.get('criticsScore') or 0.0
-            is_from_api = game.get('isFromProductsApi') or 0
-            is_modified = game.get('isModifiedByUser') or 0
-
-            cur.execute("""
-                INSERT INTO Game (gameId, title, summary, platform, releaseDate, criticsScore, myRating, 
-                                  isFromProductsApi, isModifiedByUser, state, parentGrk, background, 
-                                  horizontalCover, verticalCover, logo, squareIcon, productCard, 
-                                  changelog, forum, support, createdAt, updatedAt)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                game.get('gameId'), game.get('title'), game.get('summary'), game.get('platform'), game.get('releaseDate'),
-                critics_score, game.get('myRating'), is_from_api, is_modified,
-                game.get('state'), game.get('parentGrk'), game.get('background'), game.get('horizontalCover'),
-                game.get('verticalCover'), game.get('image'), game.get('squareIcon'), game.get('productCard'),
-                game.get('changelog'), game.get('forum'), game.get('support'),
-                now_timestamp, now_timestamp
-            ))
-            
-            game_db_id = cur.lastrowid
-
-            # --- NOUVELLE FONCTION insert_many AMÉLIORÉE ---
-            def insert_many(table_name: str, json_key: str, column_name: str):
-                json_list = game.get(json_key)
-                if not json_list: # Si la clé n'existe pas ou si la liste est vide
-                    return
-
-                items_to_insert = []
-                # Détecter si la liste contient des objets (dict) ou des valeurs simples (str)
-                if isinstance(json_list[0], dict):
-                    # Cas d'une liste d'objets: on extrait la valeur de la clé 'column_name'
-                    for item in json_list:
-                        value = item.get(column_name)
-                        if value:
-                            items_to_insert.append((value, game_db_id))
-                else:
-                    # Cas d'une liste de valeurs simples (ex: strings)
-                    items_to_insert = [(item, game_db_id) for item in json_list if item is not None]
-
-                if items_to_insert:
-                    cur.executemany(f"INSERT INTO {table_name} ({column_name}, gameId) VALUES (?, ?)", items_to_insert)
-
-            # Utilisation de la nouvelle fonction pour toutes les listes
-            insert_many('Genre', 'genres', 'name')
-            insert_many('Developer', 'developers', 'name')
-            insert_many('Publisher', 'publishers', 'name')
-            insert_many('Tag', 'tags', 'name')
-            insert_many('Theme', 'themes', 'name')
-            insert_many('Feature', 'features', 'name')
-            insert_many('SupportedPlatform', 'supported', 'platform')
-            insert_many('OwnedReleaseKey', 'ownedReleaseKeys', 'releaseKey')
-            insert_many('Screenshot', 'screenshots', 'url') # Standardisé
-            insert_many('Video', 'videos', 'url') # Standardisé
-
-            # Gestion des relations one-to-one
-            if 'score' in game and game.get('score'):
-                score = game['score']
-                cur.execute("INSERT INTO Score (critics, users, metacritic, gameId) VALUES (?, ?, ?, ?)",
-                            (score.get('critics') or 0.0, score.get('users') or 0.0, score.get('metacritic') or 0.0, game_db_id))
-            
-            if 'game_stats' in game and game.get('game_stats'):
-                stats = game['game_stats']
-                cur.execute("INSERT INTO GameStats (playtime, lastPlayed, timesLaunched, gameId) VALUES (?, ?, ?, ?)",
-                            (stats.get('playtime') or 0, stats.get('lastPlayed'), stats.get('timesLaunched') or 0, game_db_id))
-
-            con.commit()
-            integrated_count += 1
+        if existing:
+            if existing[1] == digest:
+                self.unchanged_count += 1
+                return False
+            # Jeu présent deux fois dans le lot : le premier est d'abord écrit
+            if existing[0] in self._inserted or existing[0] in self._replaced:
+                self.flush()
 
+        now_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        params = values + ((digest,) if self.hashed else ()) + (now_timestamp, now_timestamp)
+        if not self.con.in_transaction:
+            self.con.execute('BEGIN')
+        self.con.execute('SAVEPOINT game')
+        try:
+            self._cur.execute(self._insert_sql, params)
         except sqlite3.Error as e:
-            print(f"❌ Erreur lors de l'intégration de '{game.get('title')}': {e}")
-            con.rollback()
-        except (TypeError, IndexError) as e:
-            # Cette erreur peut arriver si une liste est vide et qu'on essaie d'accéder à json_list[0]
-            print(f"🟡 Avertissement sur le jeu '{game.get('title')}': une liste était vide ou mal formée. Erreur : {e}")
-            con.rollback()
+            print(f"❌ Erreur lors de l'intégration de '{title}': {e}")
+            self.con.execute('ROLLBACK TO game')
+            self.con.execute('RELEASE game')
+            self.failed_count += 1
+            return False
+        self.con.execute('RELEASE game')
+
+        if existing:
+            game_db_id = existing[0]
+            self._replaced[game_db_id] = children
+            self.updated_count += 1
+        else:
+            game_db_id = self._cur.lastrowid
+            for table, rows in children.items():
+                self._buffers[table].extend(row + (game_db_id,) for row in rows)
+            self._inserted.add(game_db_id)
+            self.integrated_count += 1
+        self._existing[game_id_value] = (game_db_id, digest)
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+        return True
+
+    def _replace_children(self):
+        """
+        Compare les tables filles des jeux mis à jour avec leur nouveau contenu
+        (une lecture par table pour tout le lot) et ne réécrit que celles qui diffèrent.
+        """
+        game_ids = json.dumps(list(self._replaced))
+        for table, columns in CHILD_COLUMNS.items():
+            current: Dict[int, List[Tuple]] = {}
+            for row in self._cur.execute(
+                f"SELECT gameId, {', '.join(columns)} FROM {table} "
+                f"WHERE gameId IN (SELECT value FROM json_each(?)) ORDER BY id", (game_ids,)
+            ):
+                current.setdefault(row[0], []).append(row[1:])
+
+            stale = []
+            for game_db_id, children in self._replaced.items():
+                rows = children.get(table, [])
+                if current.get(game_db_id, []) != rows:
+                    stale.append(game_db_id)
+                    self._buffers[table].extend(row + (game_db_id,) for row in rows)
+            if stale:
+                self._cur.execute(f"DELETE FROM {table} WHERE gameId IN (SELECT value FROM json_each(?))",
+                                  (json.dumps(stale),))
+        self._replaced.clear()
+
+    def flush(self):
+        """Écrit les tables filles du lot courant et valide la transaction"""
+        if not self.con.in_transaction:
+            return
+        if self._replaced:
+            self._replace_children()
+        for table, rows in self._buffers.items():
+            if rows:
+                self._cur.executemany(CHILD_INSERT_SQL[table], rows)
+                rows.clear()
+        self.con.commit()
+        self.committed_count = self.integrated_count
+        print(f"⏳ {self.committed_count} jeu(x) intégré(s), {self.updated_count} mis à jour...")
+        self._inserted.clear()
+        self._pending = 0
+
+def delete_games(con: sqlite3.Connection, game_ids: Iterable[str]) -> int:
+    """
+    Supprime des jeux par gameId en une transaction ; leurs tables filles sont
+    supprimées par ON DELETE CASCADE. Retourne le nombre de jeux supprimés.
+    """
+    with con:
+        return con.execute("DELETE FROM Game WHERE gameId IN (SELECT value FROM json_each(?))",
+                           (json.dumps(list(game_ids)),)).rowcount
+
+def integrate_games(json_path: Path, db_path: Path, batch_size: Optional[int] = None,
+                    upsert: bool = False, profile: str = "bulk", workers: int = 1,
+                    delta: bool = False) -> bool:
+    """
+    Intègre les jeux d'un fichier JSON (tableau ou NDJSON) dans une base de
+    données SQLite en respectant le schéma Prisma, par lots de `batch_size` jeux
+    par transaction (par défaut, la taille de lot du profil de connexion).
+    Le fichier est décodé en streaming pendant les écritures : la mémoire utilisée
+    dépend de la taille des lots, pas de celle de la bibliothèque. Avec `workers`
+    supérieur à 1, la transformation des jeux est répartie sur autant de
+    processus ; les écritures restent faites par une seule connexion.
+    Avec `upsert`, les jeux existants modifiés depuis la dernière intégration
+    sont mis à jour au lieu d'être ignorés.
+    Le profil `bulk` reconstruit les index secondaires après le chargement ; le
+    profil `online` laisse l'application lire la base pendant l'intégration.
+    Avec `delta`, le fichier est un delta de galaxy_sync ({"upserts": [...],
+    "deletions": [...]}) : les jeux de "upserts" sont intégrés en mode upsert,
+    puis les gameId de "deletions" sont supprimés.
+    Retourne True si l'intégration est allée à son terme.
+    """
+    if not json_path.exists():
+        print(f"❌ Erreur : Fichier JSON introuvable à '{json_path}'")
+        return False
+    if not db_path.exists():
+        print(f"❌ Erreur : Base de données introuvable à '{db_path}'")
+        print("Veuillez d'abord exécuter 'npx prisma db push' pour la créer.")
+        return False
+
+    try:
+        con = database.connect(db_path, profile)
+    except ValueError as e:
+        print(f"❌ Erreur : {e}")
+        return False
+
+    upsert = upsert or delta
+    deleted_count = 0
+    try:
+        loader = BulkLoader(con, batch_size or database.batch_size(profile), upsert)
+        games = iter_games(json_path, raw=workers > 1, key='upserts' if delta else None)
+        prepared = prefetch(iter_prepared(games, workers, loader.hashed, known=loader.known_games()),
+                            loader.batch_size)
+        if profile == "bulk":
+            with database.deferred_indexes(con, ('Game', *CHILD_COLUMNS)):
+                loader.load_prepared(prepared)
+        else:
+            loader.load_prepared(prepared)
+        if delta:
+            deleted_count = delete_games(con, iter_games(json_path, key='deletions'))
+        database.checkpoint(con)
+    except (json.JSONDecodeError, JSONStreamError, UnicodeDecodeError) as e:
+        # Les lots validés avant l'erreur sont conservés
+        print(f"❌ Erreur : Le fichier JSON '{json_path}' est mal formaté ({e}).")
+        print(f"ℹ️ {loader.committed_count} jeu(x) intégré(s) avant l'erreur.")
+        con.close()
+        return False
+    except ValueError as e:
+        print(f"❌ Erreur : {e}")
+        con.close()
+        return False
+    except sqlite3.Error as e:
+        print(f"❌ Erreur lors de l'intégration : {e}")
+        con.close()
+        return False
 
     print("\n--- Intégration terminée ---")
-    print(f"✅ {integrated_count} jeu(x) intégré(s) avec succès.")
-    print(f"ℹ️ {skipped_count} jeu(x) déjà existant(s) et ignoré(s).")
+    print(f"✅ {loader.committed_count} jeu(x) intégré(s) avec succès.")
+    if upsert:
+        print(f"🔄 {loader.updated_count} jeu(x) mis à jour.")
+        print(f"ℹ️ {loader.unchanged_count} jeu(x) inchangé(s) et ignoré(s).")
+    else:
+        print(f"ℹ️ {loader.skipped_count} jeu(x) déjà existant(s) et ignoré(s).")
+    if delta:
+        print(f"🗑️ {deleted_count} jeu(x) supprimé(s).")
+    if loader.failed_count:
+        print(f"❌ {loader.failed_count} jeu(x) en erreur et ignoré(s).")
     con.close()
+    return True
 
 
 if __name__ == '__main__':
-    # Adaptez ce chemin si nécessaire
-    json_file_path = Path.cwd() / "my_library_definitive.json" 
-    
-    # Adaptez ce chemin pour qu'il corresponde à votre projet
-    db_file_path = Path.cwd() / ".." / ".." / "prisma" / "db.sqlite"
+    # Depuis auth-api : python -m gog.integrate (ou python gog/integrate.py, depuis n'importe quel dossier)
+    # Adaptez ce chemin si nécessaire (ou passez le fichier en argument, ex: un export .ndjson)
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    json_file_path = Path(args[0]) if args else Path.cwd() / "my_library_definitive.json"
+
+    # Base Prisma du dépôt (prisma/db.sqlite)
+    db_file_path = database.PRISMA_DB_PATH
 
-    integrate_games(json_file_path, db_file_path)
\ No newline at end of file
+    # --upsert : met à jour les jeux existants dont le contenu a changé
+    # --online : profil de connexion compatible avec l'application en cours d'exécution
+    # --workers=N : transformation des jeux répartie sur N processus
+    # --delta : le fichier est un delta de galaxy_sync (upserts et suppressions)
+    workers = next((int(arg.split('=', 1)[1]) for arg in sys.argv[1:] if arg.startswith('--workers=')), 1)
+    integrate_games(json_file_path, db_file_path, upsert='--upsert' in sys.argv[1:],
+                    profile="online" if '--online' in sys.argv[1:] else "bulk", workers=workers,
+                    delta='--delta' in sys.argv[1:])
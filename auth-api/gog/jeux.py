@@ -1,7 +1,13 @@
 import sqlite3
 import json
 import os
+import sys
+import textwrap
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, TextIO
+
+# Formats acceptés par build_json_from_db
+OUTPUT_FORMATS = ("json", "compact", "ndjson")
 
 def get_db_path() -> Path:
     """Localise le fichier de base de données de GOG Galaxy."""
@@ -10,120 +16,218 @@ def get_db_path() -> Path:
     # Mac
     return Path.home() / "Library" / "Application Support" / "GOG.com" / "Galaxy" / "storage" / "galaxy-2.0.db"
 
-def build_json_from_db(db_path: Path, output_path: Path):
+# Regroupement des pièces de jeu réalisé par SQLite : une ligne par jeu.
+# - owned  : clés de version possédées, une seule fois chacune (quelle que soit la
+#            multiplicité des achats et des LimitedDetails)
+# - pieces : toutes les pièces du jeu dans un seul tableau JSON
+#            [releaseKey, typeId, type, valeur] ; les valeurs JSON sont imbriquées
+#            telles quelles, les autres sont conservées en texte
+# - images : logo2x extrait une seule fois par jeu (dernière clé de version)
+# - games  : clés de version regroupées par jeu
+# `{game_filter}` permet de restreindre la requête à une liste de gameId (JSON).
+OWNED_CTE = """
+    owned AS (
+        SELECT DISTINCT rp.gameId, rp.releaseKey
+        FROM ReleaseProperties AS rp
+        WHERE
+            (rp.gameId IS NOT NULL AND rp.gameId != '')
+            AND (rp.isVisibleInLibrary = 1)
+            AND (rp.isDlc = 0)
+            AND rp.releaseKey IN (SELECT ppd.gameReleaseKey FROM ProductPurchaseDates AS ppd
+                                  WHERE ppd.userId IS NOT NULL AND ppd.userId != '')
+            AND rp.releaseKey IN (SELECT ptr.releaseKey FROM ProductsToReleaseKeys AS ptr
+                                  INNER JOIN LimitedDetails AS ld ON ptr.gogId = ld.productId)
+            AND rp.releaseKey IN (SELECT gp.releaseKey FROM GamePieces AS gp
+                                  INNER JOIN GamePieceTypes AS gpt ON gp.gamePieceTypeId = gpt.id)
+            {game_filter}
+    )
+"""
+
+IMAGES_CTE = """
+    logos AS (
+        SELECT rp.gameId, rp.releaseKey,
+               CASE WHEN json_valid(ld.images) THEN json_extract(ld.images, '$.logo2x') END AS url
+        FROM ProductsToReleaseKeys AS ptr
+        INNER JOIN LimitedDetails AS ld ON ptr.gogId = ld.productId
+        INNER JOIN ReleaseProperties AS rp ON rp.releaseKey = ptr.releaseKey
+        WHERE ptr.releaseKey IN (SELECT releaseKey FROM owned)
+    ),
+    images AS (
+        SELECT gameId, url, ROW_NUMBER() OVER (PARTITION BY gameId ORDER BY releaseKey DESC) AS rank
+        FROM logos
+        WHERE url IS NOT NULL
+    )
+"""
+
+_LIBRARY_TEMPLATE = """
+    WITH {owned},
+    pieces AS (
+        SELECT o.gameId,
+               json_group_array(json_array(
+                   o.releaseKey, gp.gamePieceTypeId, gpt.type,
+                   CASE WHEN json_valid(gp.value) THEN json(gp.value) ELSE gp.value END
+               )) AS pieces
+        FROM owned AS o
+        INNER JOIN GamePieces AS gp ON gp.releaseKey = o.releaseKey
+        INNER JOIN GamePieceTypes AS gpt ON gp.gamePieceTypeId = gpt.id
+        GROUP BY o.gameId
+    ),
+    {images},
+    games AS (
+        SELECT gameId, json_group_array(releaseKey) AS releaseKeys
+        FROM owned
+        GROUP BY gameId
+    )
+    SELECT g.gameId, g.releaseKeys, i.url, p.pieces
+    FROM games AS g
+    LEFT JOIN images AS i ON i.gameId = g.gameId AND i.rank = 1
+    LEFT JOIN pieces AS p ON p.gameId = g.gameId
+    ORDER BY g.gameId;
+"""
+LIBRARY_SQL = _LIBRARY_TEMPLATE.format(owned=OWNED_CTE.format(game_filter="").strip(),
+                                       images=IMAGES_CTE.strip())
+LIBRARY_SQL_FOR_GAMES = _LIBRARY_TEMPLATE.format(
+    owned=OWNED_CTE.format(game_filter="AND rp.gameId IN (SELECT value FROM json_each(?))").strip(),
+    images=IMAGES_CTE.strip()
+)
+
+def assemble_game(game_id: str, release_keys: str, image, pieces: str) -> dict:
+    """Construit le dictionnaire d'un jeu à partir d'une ligne de LIBRARY_SQL"""
+    release_keys = sorted(json.loads(release_keys))
+    # --- LOGIQUE DE PLATEFORME DÉFINITIVE ET SIMPLE ---
+    # On se base sur le format 'plateforme_id' que vous avez confirmé.
+    first_key = release_keys[0]
+    platform = first_key.split('_')[0] if '_' in first_key else 'Inconnue'
+
+    game = {
+        "gameId": game_id,
+        "platform": platform,
+        "ownedReleaseKeys": release_keys
+    }
+    if image is not None:
+        game["image"] = image
+
+    # Première valeur rencontrée pour chaque champ, par clé de version puis type de pièce
+    for _, _, piece_type, data in sorted(json.loads(pieces), key=lambda piece: (piece[0], piece[1])):
+        if isinstance(data, dict):
+            for key, value in data.items():
+                if key not in game:
+                    game[key] = value
+        elif piece_type not in game:
+            game[piece_type] = data
+    return game
+
+def iter_library(con: sqlite3.Connection, arraysize: int = 500,
+                 game_ids: Optional[Iterable[str]] = None) -> Iterator[dict]:
+    """
+    Parcourt les jeux dans l'ordre des gameId, par paquets de `arraysize` lignes :
+    chaque jeu est produit dès sa lecture, sans charger toute la bibliothèque.
+    `game_ids` limite l'extraction à certains jeux.
+    """
+    cur = con.cursor()
+    cur.arraysize = arraysize
+    if game_ids is None:
+        cur.execute(LIBRARY_SQL)
+    else:
+        cur.execute(LIBRARY_SQL_FOR_GAMES, (json.dumps(list(game_ids)),))
+    while True:
+        rows = cur.fetchmany()
+        if not rows:
+            break
+        for row in rows:
+            yield assemble_game(*row)
+
+def write_library(games: Iterable[dict], f: TextIO, output_format: str = "json") -> Dict[str, int]:
+    """
+    Écrit les jeux au fil de l'eau et retourne le décompte par plateforme.
+    - json    : tableau indenté (format historique, identique à json.dump(indent=4))
+    - compact : tableau JSON sans espaces
+    - ndjson  : un jeu par ligne
+    """
+    platform_counts: Dict[str, int] = {}
+    first = True
+    if output_format != "ndjson":
+        f.write("[")
+
+    for game in games:
+        platform = game.get('platform', 'Inconnue')
+        platform_counts[platform] = platform_counts.get(platform, 0) + 1
+
+        if output_format == "ndjson":
+            f.write(json.dumps(game, ensure_ascii=False, separators=(',', ':')))
+            f.write("\n")
+        elif output_format == "compact":
+            f.write(("" if first else ",") + json.dumps(game, ensure_ascii=False, separators=(',', ':')))
+        else:
+            f.write(("\n" if first else ",\n") + textwrap.indent(json.dumps(game, indent=4, ensure_ascii=False), "    "))
+        first = False
+
+    if output_format == "json":
+        f.write("]" if first else "\n]")
+    elif output_format == "compact":
+        f.write("]")
+    return platform_counts
+
+def build_json_from_db(db_path: Path, output_path: Path, output_format: str = "json", arraysize: int = 500):
     """
     Construit un JSON des jeux possédés en se basant sur le format releaseKey 'plateforme_id'.
+    Le regroupement des pièces par jeu est fait en SQL : une seule ligne, un seul
+    json.loads des pièces et une seule lecture des images par jeu.
+    L'export est fait en streaming (`output_format` : json, compact ou ndjson) :
+    la mémoire utilisée ne dépend pas de la taille de la bibliothèque.
     """
+    if output_format not in OUTPUT_FORMATS:
+        print(f"Erreur : Format de sortie inconnu '{output_format}' (formats acceptés : {', '.join(OUTPUT_FORMATS)})")
+        return
     if not db_path.exists():
         print(f"Erreur : Le fichier de base de données est introuvable à l'emplacement : {db_path}")
         return
 
     print(f"Connexion à la base de données : {db_path}")
+    # Écriture dans un fichier temporaire, renommé une fois l'export complet
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
     try:
         con = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-        cur = con.cursor()
-
-        # Requête SQL simplifiée. La détection de la plateforme se fera en Python.
-        cur.execute("""
-            SELECT rp.gameId,
-                gp.releaseKey,
-                gpt.type,
-                gp.value,
-				ld.images
-            FROM
-                ProductPurchaseDates AS ppd
-            INNER JOIN ReleaseProperties AS rp ON ppd.gameReleaseKey = rp.releaseKey
-			INNER JOIN ProductsToReleaseKeys as ptr ON rp.releaseKey = ptr.releaseKey
-			INNER JOIN LimitedDetails as ld ON ptr.gogId = ld.productId
-            INNER JOIN GamePieces AS gp ON ppd.gameReleaseKey = gp.releaseKey
-            INNER JOIN GamePieceTypes AS gpt ON gp.gamePieceTypeId = gpt.id
-            WHERE
-                (ppd.userId IS NOT NULL AND ppd.userId != '')
-                AND (rp.gameId IS NOT NULL AND rp.gameId != '')
-                AND (rp.isVisibleInLibrary = 1)
-                AND (rp.isDlc = 0)
-            ORDER BY
-                rp.gameId, gp.releaseKey;
-        """)
-        
-        all_game_pieces = cur.fetchall()
-        con.close()
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                platform_counts = write_library(iter_library(con, arraysize), f, output_format)
+        finally:
+            con.close()
 
     except sqlite3.Error as e:
         print(f"Erreur SQLite : {e}")
+        tmp_path.unlink(missing_ok=True)
+        return
+    except IOError as e:
+        print(f"Erreur lors de l'écriture du fichier JSON : {e}")
+        tmp_path.unlink(missing_ok=True)
         return
 
-    if not all_game_pieces:
+    if not platform_counts:
         print("Aucun jeu de base visible trouvé dans la base de données.")
+        tmp_path.unlink(missing_ok=True)
         return
 
-    print(f"{len(all_game_pieces)} pièces d'information trouvées. Assemblage des jeux uniques en cours...")
-    
-    games_by_id = {}
-    for game_id, release_key, piece_type, piece_value, piece_images in all_game_pieces:
-        if game_id not in games_by_id:
-            # --- LOGIQUE DE PLATEFORME DÉFINITIVE ET SIMPLE ---
-            # On se base sur le format 'plateforme_id' que vous avez confirmé.
-            platform = release_key.split('_')[0] if '_' in release_key else 'Inconnue'
-            
-            games_by_id[game_id] = {
-                "gameId": game_id,
-                "platform": platform,
-                "ownedReleaseKeys": set()
-            }
-        
-        games_by_id[game_id]["ownedReleaseKeys"].add(release_key)
-
-        # --- GESTION DE L'IMAGE DEPUIS ld.images ---
-        if piece_images:
-            try:
-                images_data = json.loads(piece_images)
-                if isinstance(images_data, dict) and "logo2x" in images_data:
-                    games_by_id[game_id]["image"] = images_data["logo2x"]
-            except (json.JSONDecodeError, TypeError):
-                pass
-
-        try:
-            data = json.loads(piece_value)
-        except (json.JSONDecodeError, TypeError):
-            data = piece_value
-        if isinstance(data, dict):
-            for key, value in data.items():
-                if key not in games_by_id[game_id]:
-                    games_by_id[game_id][key] = value
-        else:
-            if piece_type not in games_by_id[game_id]:
-                games_by_id[game_id][piece_type] = data
-
-    final_library = list(games_by_id.values())
-    for game in final_library:
-        game["ownedReleaseKeys"] = sorted(list(game["ownedReleaseKeys"]))
-    
     # Le décompte final
     print("\n--- Décompte des jeux par plateforme ---")
-    platform_counts = {}
-    for game in final_library:
-        platform = game.get('platform', 'Inconnue')
-        platform_counts[platform] = platform_counts.get(platform, 0) + 1
-    
     total_games = 0
-    if platform_counts:
-        for platform, count in sorted(platform_counts.items()):
-            print(f"- {str(platform).capitalize():<10}: {count} jeu(x)")
-            total_games += count
+    for platform, count in sorted(platform_counts.items()):
+        print(f"- {str(platform).capitalize():<10}: {count} jeu(x)")
+        total_games += count
     
     print(f"--------------------------------------")
     print(f"- TOTAL     : {total_games} jeu(x)")
     print("--------------------------------------\n")
 
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(final_library, f, indent=4, ensure_ascii=False)
-        print(f"✅ Exportation réussie ! {len(final_library)} jeux uniques ont été sauvegardés dans '{output_path}'.")
-    except IOError as e:
+        os.replace(tmp_path, output_path)
+        print(f"✅ Exportation réussie ! {total_games} jeux uniques ont été sauvegardés dans '{output_path}'.")
+    except OSError as e:
         print(f"Erreur lors de l'écriture du fichier JSON : {e}")
 
 if __name__ == '__main__':
+    # Format de sortie optionnel en argument : json (défaut), compact ou ndjson
+    output_format = sys.argv[1] if len(sys.argv) > 1 else "json"
     db_file_path = get_db_path()
-    json_output_path = Path.cwd() / "my_library_definitive.json"
-    build_json_from_db(db_file_path, json_output_path)
\ No newline at end of file
+    json_output_path = Path.cwd() / ("my_library_definitive.ndjson" if output_format == "ndjson" else "my_library_definitive.json")
+    build_json_from_db(db_file_path, json_output_path, output_format)
\ No newline at end of file
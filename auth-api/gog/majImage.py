@@ -1,7 +1,13 @@
 import sqlite3
-import json
 import os
+import sys
 from pathlib import Path
+from typing import Optional
+if __package__ in (None, ''):
+    # Exécution directe (python gog/majImage.py) : rend gog et network importables
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from gog import database
+from gog.image_cache import MANIFEST_PATH, ImageCache, localize_game_images
 
 def get_db_path() -> Path:
     """Localise le fichier de base de données de GOG Galaxy."""
@@ -10,10 +16,17 @@ def get_db_path() -> Path:
     # Mac
     return Path.home() / "Library" / "Application Support" / "GOG.com" / "Galaxy" / "storage" / "galaxy-2.0.db"
 
-def update_game_images(gog_db_path: Path, target_db_path: Path):
+def update_game_images(gog_db_path: Path, target_db_path: Path, profile: str = "online",
+                       image_cache: Optional[ImageCache] = None):
     """
     Met à jour uniquement le champ logo des jeux existants dans la base de données cible
     en se basant sur le gameId depuis la base GOG Galaxy.
+    Les images sont appliquées par des requêtes UPDATE ... FROM sur une table
+    temporaire ; seuls les jeux dont l'image a changé sont modifiés. Avec le
+    profil `online`, chaque lot est validé séparément pour ne pas bloquer
+    l'application.
+    Avec `image_cache`, une image déjà en cache est comparée et écrite sous son
+    chemin local : les jeux localisés par image_cache.py ne sont pas modifiés.
     """
     if not gog_db_path.exists():
         print(f"❌ Erreur : Base de données GOG introuvable à '{gog_db_path}'")
@@ -30,19 +43,27 @@ def update_game_images(gog_db_path: Path, target_db_path: Path):
         gog_con = sqlite3.connect(f"file:{gog_db_path}?mode=ro", uri=True)
         gog_cur = gog_con.cursor()
 
-        # Requête pour récupérer gameId et images
+        # Requête pour récupérer gameId et images ; le logo2x est extrait par
+        # SQLite (has_logo2x : clé présente, même à null, dans un objet JSON valide)
         gog_cur.execute("""
-            SELECT DISTINCT rp.gameId, ld.images
-            FROM ProductPurchaseDates AS ppd
-            INNER JOIN ReleaseProperties AS rp ON ppd.gameReleaseKey = rp.releaseKey
-            INNER JOIN ProductsToReleaseKeys as ptr ON rp.releaseKey = ptr.releaseKey
-            INNER JOIN LimitedDetails as ld ON ptr.gogId = ld.productId
-            WHERE (ppd.userId IS NOT NULL AND ppd.userId != '')
-                AND (rp.gameId IS NOT NULL AND rp.gameId != '')
-                AND (rp.isVisibleInLibrary = 1)
-                AND (rp.isDlc = 0)
-                AND (ld.images IS NOT NULL AND ld.images != '')
-            ORDER BY rp.gameId;
+            WITH owned_images AS (
+                SELECT DISTINCT rp.gameId, ld.images
+                FROM ProductPurchaseDates AS ppd
+                INNER JOIN ReleaseProperties AS rp ON ppd.gameReleaseKey = rp.releaseKey
+                INNER JOIN ProductsToReleaseKeys as ptr ON rp.releaseKey = ptr.releaseKey
+                INNER JOIN LimitedDetails as ld ON ptr.gogId = ld.productId
+                WHERE (ppd.userId IS NOT NULL AND ppd.userId != '')
+                    AND (rp.gameId IS NOT NULL AND rp.gameId != '')
+                    AND (rp.isVisibleInLibrary = 1)
+                    AND (rp.isDlc = 0)
+                    AND (ld.images IS NOT NULL AND ld.images != '')
+            )
+            SELECT gameId,
+                   CASE WHEN json_valid(images) THEN json_extract(images, '$.logo2x') END AS logo2x,
+                   CASE WHEN json_valid(images) AND json_type(images) = 'object'
+                        THEN json_type(images, '$.logo2x') IS NOT NULL ELSE 0 END AS has_logo2x
+            FROM owned_images
+            ORDER BY gameId;
         """)
         
         gog_games = gog_cur.fetchall()
@@ -60,13 +81,9 @@ def update_game_images(gog_db_path: Path, target_db_path: Path):
     
     # Extraction des images logo2x
     games_with_images = {}
-    for game_id, images_json in gog_games:
-        try:
-            images_data = json.loads(images_json)
-            if isinstance(images_data, dict) and "logo2x" in images_data:
-                games_with_images[game_id] = images_data["logo2x"]
-        except (json.JSONDecodeError, TypeError):
-            continue
+    for game_id, logo2x, has_logo2x in gog_games:
+        if has_logo2x:
+            games_with_images[game_id] = logo2x
     
     print(f"🖼️  {len(games_with_images)} images logo2x extraites avec succès.")
     
@@ -74,37 +91,50 @@ def update_game_images(gog_db_path: Path, target_db_path: Path):
         print("⚠️  Aucune image logo2x valide trouvée.")
         return
 
+    if image_cache is not None:
+        local_paths = image_cache.lookup(games_with_images.values())
+        games_with_images = {game_id: local_paths.get(url, url) for game_id, url in games_with_images.items()}
+        print(f"💾 {len(local_paths)} image(s) déjà présente(s) dans le cache local.")
+
     # Connexion à la base de données cible pour mise à jour
     try:
-        target_con = sqlite3.connect(target_db_path)
-        target_cur = target_con.cursor()
-        target_cur.execute("PRAGMA foreign_keys = ON;")
-        
-        updated_count = 0
-        not_found_count = 0
-        
-        for game_id, image_url in games_with_images.items():
-            # Vérifier si le jeu existe dans la base cible
-            result = target_cur.execute("SELECT id FROM Game WHERE gameId = ?", (game_id,)).fetchone()
-            
-            if result:
-                # Mettre à jour le logo
-                target_cur.execute("""
-                    UPDATE Game 
-                    SET logo = ?, horizontalCover = ?, updatedAt = datetime('now') 
-                    WHERE gameId = ?
-                """, (image_url, image_url, game_id))
-                updated_count += 1
-                print(f"✅ Image mise à jour pour gameId: {game_id}")
-            else:
-                not_found_count += 1
-                print(f"⏭️  Jeu non trouvé dans la base cible (gameId: {game_id})")
-        
+        target_con = database.connect(target_db_path, profile)
+        batch_size = database.batch_size(profile)
+
+        # Couples (gameId, logo2x) chargés en une fois dans une table temporaire
+        target_con.execute("CREATE TEMP TABLE image_updates (gameId TEXT PRIMARY KEY, logo TEXT)")
+        target_con.executemany("INSERT INTO temp.image_updates (gameId, logo) VALUES (?, ?)",
+                               games_with_images.items())
         target_con.commit()
+
+        found_count = target_con.execute("""
+            SELECT COUNT(*) FROM temp.image_updates
+            WHERE gameId IN (SELECT gameId FROM main.Game)
+        """).fetchone()[0]
+        not_found_count = len(games_with_images) - found_count
+
+        # Une requête UPDATE ... FROM par lot de `batch_size` images, limitée aux
+        # jeux dont l'image a changé
+        updated_count = 0
+        for offset in range(0, len(games_with_images), batch_size):
+            target_con.execute("""
+                UPDATE Game
+                SET logo = u.logo, horizontalCover = u.logo, updatedAt = datetime('now')
+                FROM temp.image_updates AS u
+                WHERE Game.gameId = u.gameId
+                    AND u.rowid > ? AND u.rowid <= ?
+                    AND (Game.logo IS NOT u.logo OR Game.horizontalCover IS NOT u.logo)
+            """, (offset, offset + batch_size))
+            updated_count += target_con.execute("SELECT changes()").fetchone()[0]
+            target_con.commit()
+
+        target_con.execute("DROP TABLE temp.image_updates")
+        database.checkpoint(target_con)
         target_con.close()
-        
+
         print(f"\n--- Mise à jour terminée ---")
         print(f"✅ {updated_count} image(s) mise(s) à jour avec succès.")
+        print(f"ℹ️ {found_count - updated_count} image(s) déjà à jour.")
         print(f"⏭️  {not_found_count} jeu(x) non trouvé(s) dans la base cible.")
         
     except sqlite3.Error as e:
@@ -114,10 +144,22 @@ def update_game_images(gog_db_path: Path, target_db_path: Path):
             target_con.close()
 
 if __name__ == '__main__':
+    # Depuis auth-api : python -m gog.majImage (ou python gog/majImage.py, depuis n'importe quel dossier)
     # Chemin vers la base GOG Galaxy
     gog_db_file_path = get_db_path()
     
-    # Chemin vers votre base de données cible (adaptez selon votre projet)
-    target_db_file_path = Path.cwd() / ".." / ".." / "prisma" / "db.sqlite"
+    # Base Prisma du dépôt (prisma/db.sqlite)
+    target_db_file_path = database.PRISMA_DB_PATH
     
-    update_game_images(gog_db_file_path, target_db_file_path)
\ No newline at end of file
+    # --bulk : profil de connexion pour une mise à jour complète, application arrêtée
+    profile = "bulk" if '--bulk' in sys.argv[1:] else "online"
+
+    # --cache : télécharge ensuite les images dans public/images/cache (voir image_cache.py).
+    # Dès que le cache existe, les images déjà téléchargées gardent leur chemin local.
+    if '--cache' in sys.argv[1:] or MANIFEST_PATH.exists():
+        with ImageCache() as image_cache:
+            update_game_images(gog_db_file_path, target_db_file_path, profile=profile, image_cache=image_cache)
+            if '--cache' in sys.argv[1:]:
+                localize_game_images(target_db_file_path, image_cache, profile=profile)
+    else:
+        update_game_images(gog_db_file_path, target_db_file_path, profile=profile)
\ No newline at end of file
@@ -1,17 +1,18 @@
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from network.decoders import decoder_for
 
-@dataclass
+@dataclass(slots=True)
 class GOGGame:
     """Modèle représentant un jeu GOG - Version simplifiée pour usage personnel"""
-    id: int
-    title: str
+    id: int = field(metadata={'missing': 0})
+    title: str = field(metadata={'missing': ''})
     category: str = ""
     url: Optional[str] = None
-    works_on: Optional[Dict[str, bool]] = None
-    is_pre_order: bool = False
-    release_date: Optional[str] = None
+    works_on: Optional[Dict[str, bool]] = field(default=None, metadata={'key': 'worksOn'})
+    is_pre_order: bool = field(default=False, metadata={'key': 'isPreOrder'})
+    release_date: Optional[str] = field(default=None, metadata={'key': 'releaseDate'})
     image: Optional[str] = None
     tags: List[str] = field(default_factory=list)
     description: Optional[str] = None
@@ -19,18 +20,7 @@ class GOGGame:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'GOGGame':
         """Crée une instance depuis un dictionnaire GOG API"""
-        return cls(
-            id=data.get('id', 0),
-            title=data.get('title', ''),
-            category=data.get('category', ''),
-            url=data.get('url'),
-            works_on=data.get('worksOn'),
-            is_pre_order=data.get('isPreOrder', False),
-            release_date=data.get('releaseDate'),
-            image=data.get('image'),
-            tags=data.get('tags', []),
-            description=data.get('description')
-        )
+        return decoder_for(cls)(data)
     
     def supports_platform(self, platform: str) -> bool:
         """Vérifie si le jeu supporte une plateforme donnée"""
@@ -47,22 +37,16 @@ class GOGGame:
             if self.works_on.get('linux'): platforms.append('Linux')
         return platforms
 
-@dataclass
+@dataclass(slots=True)
 class GOGUserProfile:
     """Profil utilisateur GOG simplifié"""
-    user_id: str
-    username: str
-    galaxy_user_id: str
+    user_id: str = field(metadata={'key': 'userId', 'missing': '', 'convert': str})
+    username: str = field(metadata={'missing': ''})
+    galaxy_user_id: str = field(metadata={'key': 'galaxyUserId', 'missing': '', 'convert': str})
     email: Optional[str] = None
-    games_count: Optional[int] = None
+    games_count: Optional[int] = field(default=None, metadata={'key': 'games'})
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'GOGUserProfile':
         """Crée une instance depuis userData.json"""
-        return cls(
-            user_id=str(data.get('userId', '')),
-            username=data.get('username', ''),
-            galaxy_user_id=str(data.get('galaxyUserId', '')),
-            email=data.get('email'),
-            games_count=data.get('games')
-        )
+        return decoder_for(cls)(data)
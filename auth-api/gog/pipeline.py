@@ -0,0 +1,267 @@
+import sqlite3
+import sys
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Optional
+if __package__ in (None, ''):
+    # Exécution directe (python gog/pipeline.py) : rend gog et network importables
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from gog import database
+from gog.integrate import CHILD_COLUMNS, CHILD_LISTS
+from gog.image_cache import MANIFEST_PATH, ImageCache
+from gog.jeux import IMAGES_CTE, OWNED_CTE, get_db_path
+
+# Bibliothèque Galaxy fusionnée dans une table temporaire de la base cible,
+# une ligne par jeu (mêmes règles que gog/jeux.py) :
+# - fields : chaque champ des pièces du jeu, sous forme de texte JSON ; une pièce
+#            qui n'est pas un objet JSON est rangée sous le nom de son type
+# - first  : première valeur de chaque champ, par clé de version puis type de
+#            pièce (colonne « nue » associée à min() dans SQLite)
+# - data   : objet JSON fusionné du jeu
+LIBRARY_STAGING_SQL = """
+    CREATE TEMP TABLE galaxy_library AS
+    WITH {owned},
+    fields AS (
+        SELECT o.gameId,
+               o.releaseKey || char(31) || printf('%08d', gp.gamePieceTypeId) || char(31) || printf('%08d', f.id) AS rank,
+               f.key AS name,
+               CASE f.type
+                   WHEN 'object' THEN f.value
+                   WHEN 'array' THEN f.value
+                   WHEN 'text' THEN json_quote(f.value)
+                   WHEN 'true' THEN 'true'
+                   WHEN 'false' THEN 'false'
+                   WHEN 'null' THEN 'null'
+                   ELSE CAST(f.value AS TEXT)
+               END AS value
+        FROM owned AS o
+        INNER JOIN GamePieces AS gp ON gp.releaseKey = o.releaseKey
+        INNER JOIN GamePieceTypes AS gpt ON gp.gamePieceTypeId = gpt.id
+        INNER JOIN json_each(
+            CASE WHEN json_valid(gp.value) AND json_type(gp.value) = 'object' THEN gp.value
+                 ELSE json_object(gpt.type, CASE WHEN json_valid(gp.value) THEN json(gp.value) ELSE gp.value END)
+            END
+        ) AS f
+    ),
+    first AS (
+        SELECT gameId, name, value, min(rank)
+        FROM fields
+        GROUP BY gameId, name
+    ),
+    data AS (
+        SELECT gameId, json_group_object(name, json(value)) AS data
+        FROM first
+        GROUP BY gameId
+    ),
+    {images},
+    games AS (
+        SELECT gameId, json_group_array(releaseKey) AS releaseKeys, min(releaseKey) AS firstKey
+        FROM owned
+        GROUP BY gameId
+    )
+    SELECT g.gameId,
+           CASE WHEN instr(g.firstKey, '_') > 0 THEN substr(g.firstKey, 1, instr(g.firstKey, '_') - 1)
+                ELSE 'Inconnue' END AS platform,
+           g.releaseKeys,
+           i.url AS image,
+           COALESCE(d.data, '{{}}') AS data
+    FROM games AS g
+    LEFT JOIN images AS i ON i.gameId = g.gameId AND i.rank = 1
+    LEFT JOIN data AS d ON d.gameId = g.gameId;
+""".format(owned=OWNED_CTE.format(game_filter="").strip(), images=IMAGES_CTE.strip())
+
+def _field(path: str) -> str:
+    return f"json_extract(l.data, '$.{path}')"
+
+def _or_default(expr: str, default: str) -> str:
+    """Équivalent SQL de `valeur or défaut` en Python pour une valeur JSON"""
+    return f"COALESCE(NULLIF(NULLIF({expr}, ''), 0), {default})"
+
+# Jeux nouveaux uniquement (les jeux existants sont ignorés, comme dans integrate.py)
+INSERT_GAMES_SQL = f"""
+    INSERT INTO Game (gameId, title, summary, platform, releaseDate, criticsScore, myRating,
+                      isFromProductsApi, isModifiedByUser, state, parentGrk, background,
+                      horizontalCover, verticalCover, logo, squareIcon, productCard,
+                      changelog, forum, support, createdAt, updatedAt)
+    SELECT l.gameId, {_field('title')}, {_field('summary')}, l.platform, {_field('releaseDate')},
+           {_or_default(_field('criticsScore'), '0.0')}, {_field('myRating')},
+           {_or_default(_field('isFromProductsApi'), '0')}, {_or_default(_field('isModifiedByUser'), '0')},
+           {_field('state')}, {_field('parentGrk')}, {_field('background')},
+           COALESCE(l.image, {_field('horizontalCover')}), {_field('verticalCover')},
+           COALESCE(l.image, {_field('image')}), {_field('squareIcon')}, {_field('productCard')},
+           {_field('changelog')}, {_field('forum')}, {_field('support')}, :now, :now
+    FROM temp.galaxy_library AS l
+    WHERE l.gameId NOT IN (SELECT gameId FROM main.Game)
+        AND {_field('title')} IS NOT NULL
+    ORDER BY l.gameId;
+"""
+
+# Jointure entre les jeux insérés (id > :last_id) et leur ligne de galaxy_library
+_NEW_GAMES = """
+    FROM main.Game AS g
+    INNER JOIN temp.galaxy_library AS l ON l.gameId = g.gameId
+"""
+
+def _child_list_sql(table: str, json_key: str, column: str) -> str:
+    """
+    Éléments d'une liste : champ `column` des objets s'il est renseigné,
+    valeurs simples si elles ne sont pas nulles.
+    """
+    value = f"json_extract(j.value, '$.{column}')"
+    return f"""
+        INSERT INTO {table} ({column}, gameId)
+        SELECT CASE WHEN j.type = 'object' THEN {value} ELSE j.value END, g.id
+        {_NEW_GAMES}
+        INNER JOIN json_each(l.data, '$.{json_key}') AS j
+        WHERE g.id > :last_id
+            AND json_type(l.data, '$.{json_key}') = 'array'
+            AND CASE WHEN j.type = 'object' THEN NULLIF(NULLIF({value}, ''), 0) IS NOT NULL
+                     ELSE j.type != 'null' END
+        ORDER BY g.id, j.id;
+    """
+
+INSERT_RELEASE_KEYS_SQL = f"""
+    INSERT INTO OwnedReleaseKey (releaseKey, gameId)
+    SELECT j.value, g.id
+    {_NEW_GAMES}
+    INNER JOIN json_each(l.releaseKeys) AS j
+    WHERE g.id > :last_id
+    ORDER BY g.id, j.value;
+"""
+
+INSERT_SCORES_SQL = f"""
+    INSERT INTO Score (critics, users, metacritic, gameId)
+    SELECT {_or_default(_field('score.critics'), '0.0')}, {_or_default(_field('score.users'), '0.0')},
+           {_or_default(_field('score.metacritic'), '0.0')}, g.id
+    {_NEW_GAMES}
+    WHERE g.id > :last_id
+        AND json_type(l.data, '$.score') = 'object' AND {_field('score')} != '{{}}'
+    ORDER BY g.id;
+"""
+
+INSERT_STATS_SQL = f"""
+    INSERT INTO GameStats (playtime, lastPlayed, timesLaunched, gameId)
+    SELECT {_or_default(_field('game_stats.playtime'), '0')}, {_field('game_stats.lastPlayed')},
+           {_or_default(_field('game_stats.timesLaunched'), '0')}, g.id
+    {_NEW_GAMES}
+    WHERE g.id > :last_id
+        AND json_type(l.data, '$.game_stats') = 'object' AND {_field('game_stats')} != '{{}}'
+    ORDER BY g.id;
+"""
+
+# Images des jeux déjà présents (équivalent de majImage.py), seulement si elles ont changé
+UPDATE_IMAGES_SQL = """
+    UPDATE Game
+    SET logo = l.image, horizontalCover = l.image, updatedAt = datetime('now')
+    FROM temp.galaxy_library AS l
+    WHERE Game.gameId = l.gameId
+        AND Game.id <= :last_id
+        AND l.image IS NOT NULL
+        AND (Game.logo IS NOT l.image OR Game.horizontalCover IS NOT l.image);
+"""
+
+def _use_cached_images(con: sqlite3.Connection, image_cache: ImageCache):
+    """Remplace dans galaxy_library les images déjà en cache par leur chemin local"""
+    urls = [url for url, in con.execute("SELECT DISTINCT image FROM temp.galaxy_library WHERE image IS NOT NULL")]
+    local_paths = image_cache.lookup(urls)
+    con.execute("CREATE TEMP TABLE cached_images (url TEXT PRIMARY KEY, path TEXT NOT NULL) WITHOUT ROWID")
+    con.executemany("INSERT INTO temp.cached_images (url, path) VALUES (?, ?)", local_paths.items())
+    con.execute("""
+        UPDATE temp.galaxy_library SET image = c.path
+        FROM temp.cached_images AS c
+        WHERE galaxy_library.image = c.url
+    """)
+    con.execute("DROP TABLE temp.cached_images")
+
+def run_pipeline(galaxy_db_path: Path, target_db_path: Path,
+                 image_cache: Optional[ImageCache] = None) -> Optional[Dict[str, int]]:
+    """
+    Charge la bibliothèque GOG Galaxy directement dans la base Prisma, sans
+    fichier JSON intermédiaire : la base Galaxy est attachée en lecture seule à
+    la connexion cible, puis les jeux, leurs tables filles et leurs images sont
+    insérés par des requêtes INSERT ... SELECT dans une seule transaction.
+    Remplace l'enchaînement jeux.py -> integrate.py -> majImage.py.
+    Avec `image_cache`, les images déjà en cache sont écrites sous leur chemin local.
+    """
+    if not galaxy_db_path.exists():
+        print(f"❌ Erreur : Base de données GOG introuvable à '{galaxy_db_path}'")
+        return None
+    if not target_db_path.exists():
+        print(f"❌ Erreur : Base de données introuvable à '{target_db_path}'")
+        print("Veuillez d'abord exécuter 'npx prisma db push' pour la créer.")
+        return None
+
+    # isolation_level=None : les transactions sont gérées explicitement
+    con = database.connect(target_db_path, "bulk", isolation_level=None, uri=True)
+    stats = None
+    try:
+        con.execute("ATTACH DATABASE ? AS galaxy", (Path(galaxy_db_path).resolve().as_uri() + "?mode=ro",))
+
+        print("🔍 Lecture de la bibliothèque GOG Galaxy...")
+        # Index secondaires reconstruits une seule fois après le chargement
+        with database.deferred_indexes(con, ('Game', *CHILD_COLUMNS)):
+            con.execute("BEGIN IMMEDIATE")
+            try:
+                con.execute(LIBRARY_STAGING_SQL)
+                con.execute("CREATE INDEX temp.galaxy_library_gameId ON galaxy_library (gameId)")
+                if image_cache is not None:
+                    _use_cached_images(con, image_cache)
+                library_count = con.execute("SELECT COUNT(*) FROM temp.galaxy_library").fetchone()[0]
+                last_id = con.execute("SELECT COALESCE(MAX(id), 0) FROM main.Game").fetchone()[0]
+                params = {'last_id': last_id, 'now': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+
+                integrated_count = con.execute(INSERT_GAMES_SQL, params).rowcount
+                for table, json_key, column in CHILD_LISTS:
+                    # Les clés de version possédées viennent de galaxy_library
+                    sql = INSERT_RELEASE_KEYS_SQL if json_key == 'ownedReleaseKeys' else _child_list_sql(table, json_key, column)
+                    con.execute(sql, params)
+                con.execute(INSERT_SCORES_SQL, params)
+                con.execute(INSERT_STATS_SQL, params)
+                images_count = con.execute(UPDATE_IMAGES_SQL, params).rowcount
+
+                existing_count = con.execute("""
+                    SELECT COUNT(*) FROM temp.galaxy_library AS l
+                    INNER JOIN main.Game AS g ON g.gameId = l.gameId
+                    WHERE g.id <= ?
+                """, (last_id,)).fetchone()[0]
+                con.execute("DROP TABLE temp.galaxy_library")
+                con.execute("COMMIT")
+            except BaseException:
+                con.execute("ROLLBACK")
+                raise
+        con.execute("DETACH DATABASE galaxy")
+        database.checkpoint(con)
+
+        stats = {
+            'integrated': integrated_count,
+            'skipped': existing_count,
+            'untitled': library_count - integrated_count - existing_count,
+            'images_updated': images_count,
+        }
+        print("\n--- Intégration terminée ---")
+        print(f"✅ {stats['integrated']} jeu(x) intégré(s) avec succès.")
+        print(f"ℹ️ {stats['skipped']} jeu(x) déjà existant(s) et ignoré(s).")
+        if stats['untitled']:
+            print(f"⏭️  {stats['untitled']} jeu(x) sans titre ignoré(s).")
+        print(f"🖼️  {stats['images_updated']} image(s) mise(s) à jour.")
+
+    except sqlite3.Error as e:
+        print(f"❌ Erreur lors de l'intégration : {e}")
+    finally:
+        con.close()
+    return stats
+
+if __name__ == '__main__':
+    # Depuis auth-api : python -m gog.pipeline (ou python gog/pipeline.py, depuis n'importe quel dossier)
+    # Chemin vers la base GOG Galaxy
+    gog_db_file_path = get_db_path()
+
+    # Base Prisma du dépôt (prisma/db.sqlite)
+    target_db_file_path = database.PRISMA_DB_PATH
+
+    # Images déjà téléchargées par image_cache.py : le chemin local est conservé
+    if MANIFEST_PATH.exists():
+        with ImageCache() as image_cache:
+            run_pipeline(gog_db_file_path, target_db_file_path, image_cache=image_cache)
+    else:
+        run_pipeline(gog_db_file_path, target_db_file_path)
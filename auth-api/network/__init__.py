@@ -0,0 +1,8 @@
+"""Couche réseau partagée entre les clients Steam et GOG"""
+from .rate_limiter import RateLimiter
+from .retry import RetryPolicy, CircuitBreaker, RetryError, CircuitOpenError
+from .transport import HTTPTransport
+from .json_stream import iter_json_array, JSONStreamError
+from .decoders import decoder_for, decode_many
+
+__all__ = ['RateLimiter', 'RetryPolicy', 'CircuitBreaker', 'RetryError', 'CircuitOpenError', 'HTTPTransport', 'iter_json_array', 'JSONStreamError', 'decoder_for', 'decode_many']
\ No newline at end of file
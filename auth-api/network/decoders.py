@@ -0,0 +1,74 @@
+import threading
+from dataclasses import fields, MISSING
+from typing import Any, Callable, Dict, Iterable, List, Type, TypeVar
+
+T = TypeVar('T')
+
+# Métadonnées de champ reconnues (dataclasses.field(metadata=...)) :
+#   'key'     : clé source dans le dictionnaire de l'API (défaut : nom du champ)
+#   'missing' : valeur utilisée si la clé est absente, même pour un champ requis
+#   'none_as' : valeur qui remplace un None explicite
+#   'convert' : fonction appliquée à la valeur lue
+_MISS = object()
+
+_decoders: Dict[type, Callable[[Dict[str, Any]], Any]] = {}
+_decoders_lock = threading.Lock()
+
+def _compile(cls: type) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Génère le code source d'un constructeur spécialisé pour `cls` : une seule
+    lecture du dictionnaire par champ, affectation directe des attributs, sans
+    passer par __init__ ni reconstruire la liste des champs à chaque appel.
+    """
+    namespace: Dict[str, Any] = {'_cls': cls, '_new': object.__new__, '_MISS': _MISS}
+    lines = [
+        "def decode(data):",
+        "    get = data.get",
+        "    obj = _new(_cls)",
+    ]
+
+    for index, f in enumerate(fields(cls)):
+        meta = f.metadata
+        key = meta.get('key', f.name)
+        source = repr(key)
+
+        if 'missing' in meta:
+            namespace[f'_d{index}'] = meta['missing']
+            lines.append(f"    v = get({source}, _d{index})")
+        elif f.default is not MISSING:
+            namespace[f'_d{index}'] = f.default
+            lines.append(f"    v = get({source}, _d{index})")
+        elif f.default_factory is not MISSING:
+            namespace[f'_f{index}'] = f.default_factory
+            lines.append(f"    v = get({source}, _MISS)")
+            lines.append(f"    if v is _MISS: v = _f{index}()")
+        else:
+            lines.append(f"    v = get({source}, _MISS)")
+            lines.append(f"    if v is _MISS: raise TypeError('{cls.__name__}: champ requis manquant {key}')")
+
+        if 'none_as' in meta:
+            namespace[f'_n{index}'] = meta['none_as']
+            lines.append(f"    if v is None: v = _n{index}")
+        if 'convert' in meta:
+            namespace[f'_c{index}'] = meta['convert']
+            lines.append(f"    v = _c{index}(v)")
+        lines.append(f"    obj.{f.name} = v")
+
+    lines.append("    return obj")
+    exec(compile('\n'.join(lines), f"<decoder {cls.__qualname__}>", 'exec'), namespace)
+    return namespace['decode']
+
+def decoder_for(cls: Type[T]) -> Callable[[Dict[str, Any]], T]:
+    """Retourne (en le générant une seule fois) le décodeur de la classe `cls`"""
+    decode = _decoders.get(cls)
+    if decode is None:
+        with _decoders_lock:
+            decode = _decoders.get(cls)
+            if decode is None:
+                decode = _decoders[cls] = _compile(cls)
+    return decode
+
+def decode_many(cls: Type[T], records: Iterable[Dict[str, Any]]) -> List[T]:
+    """Décode une suite de dictionnaires en instances de `cls`"""
+    decode = decoder_for(cls)
+    return [decode(record) for record in records]
@@ -0,0 +1,111 @@
+import codecs
+import json
+import re
+from typing import Iterable, Iterator, Any, Optional
+
+_WHITESPACE = ' \t\n\r'
+_WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+_DELIMITERS = ',]' + _WHITESPACE
+
+class JSONStreamError(ValueError):
+    """Erreur de structure rencontrée pendant le décodage incrémental"""
+    pass
+
+def iter_json_array(chunks: Iterable[bytes], key: Optional[str] = None,
+                    encoding: str = 'utf-8') -> Iterator[Any]:
+    """
+    Décode incrémentalement un tableau JSON et produit ses éléments un par un.
+
+    `chunks` est une suite de blocs d'octets (ex: `response.iter_content()` ou
+    lecture d'un fichier par blocs). Sans `key`, le document doit être un tableau
+    ; avec `key`, le premier tableau associé à cette clé est parcouru (ex:
+    `"apps"` dans `{"applist": {"apps": [...]}}`). Seul l'élément en cours de
+    décodage est conservé en mémoire.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    chunk_iter = iter(chunks)
+    buf = ''
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        """Ajoute le bloc suivant au tampon ; retourne False en fin de flux"""
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        for chunk in chunk_iter:
+            if not chunk:
+                continue
+            text = text_decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                buf = buf[pos:] + text
+                pos = 0
+                return True
+        buf = buf[pos:] + text_decoder.decode(b'', final=True)
+        pos = 0
+        eof = True
+        return False
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE_RE.match(buf, pos).end()
+            if pos < len(buf) or not fill():
+                return
+
+    # Positionnement sur le '[' du tableau ciblé
+    if key is None:
+        skip_whitespace()
+        if pos >= len(buf) or buf[pos] != '[':
+            raise JSONStreamError("Le document JSON n'est pas un tableau")
+    else:
+        marker = json.dumps(key)
+        while True:
+            index = buf.find(marker, pos)
+            if index != -1:
+                pos = index + len(marker)
+                skip_whitespace()
+                if pos < len(buf) and buf[pos] == ':':
+                    pos += 1
+                    skip_whitespace()
+                    if pos < len(buf) and buf[pos] == '[':
+                        break
+                continue
+            # Conserver la fin du tampon au cas où la clé serait coupée entre deux blocs
+            pos = max(pos, len(buf) - len(marker))
+            if not fill():
+                raise JSONStreamError(f"Clé '{key}' introuvable ou non associée à un tableau")
+    pos += 1
+
+    # Après un élément, seul ',' ou ']' est valide ; une virgule doit être
+    # suivie d'un élément
+    expect_comma = False
+    while True:
+        skip_whitespace()
+        if pos >= len(buf):
+            raise JSONStreamError("Fin de flux inattendue dans le tableau JSON")
+        if buf[pos] == ']':
+            return
+        if expect_comma:
+            if buf[pos] != ',':
+                raise JSONStreamError("Virgule attendue entre deux éléments du tableau JSON")
+            pos += 1
+            skip_whitespace()
+        if buf.startswith((',', ']'), pos):
+            raise JSONStreamError("Virgule superflue dans le tableau JSON")
+
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+                # Un nombre coupé entre deux blocs se décode partiellement :
+                # l'élément n'est accepté que suivi d'un séparateur valide
+                if eof or (end < len(buf) and buf[end] in _DELIMITERS):
+                    break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            fill()
+        pos = end
+        expect_comma = True
+        yield value
@@ -0,0 +1,146 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+from config.config_loader import ConfigLoader
+
+if os.name == "nt":  # Windows
+    import msvcrt
+
+    def _lock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+class RateLimiter:
+    """
+    Limiteur de débit à seau de jetons (token bucket), un seau par hôte.
+
+    Sans fichier d'état, les seaux vivent en mémoire et sont partagés entre
+    threads. Avec `state_file`, l'état est stocké dans un petit fichier JSON
+    verrouillé (flock / msvcrt) afin que plusieurs processus de synchronisation
+    se partagent le même quota.
+    """
+
+    _registry: Dict[Tuple[str, str], 'RateLimiter'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, requests_per_minute: int, burst: Optional[int] = None,
+                 host_limits: Optional[Dict[str, int]] = None, state_file: Optional[str] = None):
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute doit être strictement positif")
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self.host_limits = dict(host_limits or {})
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+        if state_file:
+            directory = os.path.dirname(state_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config: ConfigLoader, prefix: str) -> 'RateLimiter':
+        """
+        Construit (ou réutilise) le limiteur décrit par `<prefix>.rate_limit.*`.
+        Les instances sont partagées par fichier de configuration, de sorte que
+        tous les clients d'un même processus consomment les mêmes seaux.
+        """
+        registry_key = (os.path.abspath(config.config_file), prefix)
+        with cls._registry_lock:
+            limiter = cls._registry.get(registry_key)
+            if limiter is None:
+                host_prefix = f"{prefix}.rate_limit.host."
+                suffix = ".requests_per_minute"
+                host_limits = {
+                    key[len(host_prefix):-len(suffix)]: config.get_int(key)
+                    for key in config.config
+                    if key.startswith(host_prefix) and key.endswith(suffix)
+                }
+                burst = config.get_int(f"{prefix}.rate_limit.burst", 0)
+                limiter = cls(
+                    requests_per_minute=config.get_int(f"{prefix}.rate_limit.requests_per_minute", 60),
+                    burst=burst or None,
+                    host_limits=host_limits,
+                    state_file=config.get(f"{prefix}.rate_limit.state_file") or None,
+                )
+                cls._registry[registry_key] = limiter
+            return limiter
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        """Clé de seau associée à une URL (l'hôte)"""
+        return urlparse(url).netloc or url
+
+    def _limits(self, key: str) -> Tuple[float, float]:
+        """Retourne (capacité, jetons par seconde) pour une clé"""
+        per_minute = self.host_limits.get(key, self.requests_per_minute)
+        capacity = self.burst or max(1, per_minute // 6)
+        return float(min(capacity, per_minute)), per_minute / 60.0
+
+    def _take(self, buckets: Dict[str, Tuple[float, float]], key: str, now: float) -> float:
+        """Tente de consommer un jeton ; retourne l'attente nécessaire (0 si accordé)"""
+        capacity, rate = self._limits(key)
+        tokens, updated = buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+        if tokens >= 1.0:
+            buckets[key] = (tokens - 1.0, now)
+            return 0.0
+        buckets[key] = (tokens, now)
+        return (1.0 - tokens) / rate
+
+    def _take_shared(self, key: str) -> float:
+        """Même opération que _take, sur l'état partagé du fichier verrouillé"""
+        with open(self.state_file, 'a+', encoding='utf-8') as f:
+            _lock_file(f)
+            try:
+                f.seek(0)
+                content = f.read()
+                try:
+                    buckets = {k: tuple(v) for k, v in json.loads(content).items()} if content else {}
+                except (json.JSONDecodeError, AttributeError, TypeError):
+                    buckets = {}
+                wait = self._take(buckets, key, time.time())
+                f.seek(0)
+                f.truncate()
+                json.dump(buckets, f)
+                f.flush()
+            finally:
+                _unlock_file(f)
+        return wait
+
+    def acquire(self, url_or_key: str) -> float:
+        """
+        Bloque jusqu'à obtention d'un jeton pour l'hôte de `url_or_key`.
+        Retourne le temps total d'attente en secondes.
+        """
+        key = self.key_for(url_or_key)
+        waited = 0.0
+        while True:
+            with self._lock:
+                if self.state_file:
+                    wait = self._take_shared(key)
+                else:
+                    wait = self._take(self._buckets, key, time.monotonic())
+            if wait <= 0:
+                if waited:
+                    logging.debug(f"Limite de débit {key}: attente de {waited:.2f}s")
+                return waited
+            time.sleep(wait)
+            waited += wait
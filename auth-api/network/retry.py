@@ -0,0 +1,187 @@
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, Tuple, FrozenSet
+from urllib.parse import urlparse
+import requests
+from config.config_loader import ConfigLoader
+
+class RetryError(requests.exceptions.RequestException):
+    """Toutes les tentatives ont échoué (ou l'attente demandée est trop longue)"""
+    pass
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Le disjoncteur de l'hôte est ouvert : la requête n'est pas envoyée"""
+    pass
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Interprète un en-tête Retry-After (secondes ou date HTTP)"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+class CircuitBreaker:
+    """
+    Disjoncteur par hôte.
+
+    Après `failure_threshold` échecs consécutifs, l'hôte est considéré comme
+    indisponible et les requêtes échouent immédiatement pendant `reset_timeout`
+    secondes. Une requête d'essai est ensuite autorisée (demi-ouvert) : un succès
+    referme le disjoncteur, un échec le rouvre.
+    """
+
+    _registry: Dict[Tuple[str, str], 'CircuitBreaker'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        # hôte -> (échecs consécutifs, instant d'ouverture ou None, essai en cours)
+        self._states: Dict[str, Tuple[int, Optional[float], bool]] = {}
+
+    @classmethod
+    def from_config(cls, config: ConfigLoader, prefix: str) -> 'CircuitBreaker':
+        """Construit (ou réutilise) le disjoncteur décrit par `<prefix>.circuit_breaker.*`"""
+        registry_key = (os.path.abspath(config.config_file), prefix)
+        with cls._registry_lock:
+            breaker = cls._registry.get(registry_key)
+            if breaker is None:
+                breaker = cls(
+                    failure_threshold=config.get_int(f"{prefix}.circuit_breaker.failure_threshold", 5),
+                    reset_timeout=config.get_int(f"{prefix}.circuit_breaker.reset_timeout_seconds", 60),
+                )
+                cls._registry[registry_key] = breaker
+            return breaker
+
+    def before_request(self, host: str):
+        """Lève CircuitOpenError si l'hôte est en échec et que le délai n'est pas écoulé"""
+        with self._lock:
+            failures, opened_at, probing = self._states.get(host, (0, None, False))
+            if opened_at is None:
+                return
+            remaining = opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0 or probing:
+                raise CircuitOpenError(
+                    f"Hôte {host} indisponible ({failures} échecs consécutifs), "
+                    f"nouvel essai dans {max(remaining, 0):.0f}s"
+                )
+            # Demi-ouvert : une seule requête d'essai à la fois
+            self._states[host] = (failures, opened_at, True)
+
+    def record_success(self, host: str):
+        with self._lock:
+            if host in self._states:
+                if self._states[host][1] is not None:
+                    logging.info(f"Disjoncteur refermé pour {host}")
+                del self._states[host]
+
+    def record_failure(self, host: str):
+        with self._lock:
+            failures, opened_at, probing = self._states.get(host, (0, None, False))
+            failures += 1
+            if probing or failures >= self.failure_threshold:
+                if opened_at is None or probing:
+                    logging.warning(f"Disjoncteur ouvert pour {host} après {failures} échec(s)")
+                self._states[host] = (failures, time.monotonic(), False)
+            else:
+                self._states[host] = (failures, opened_at, False)
+
+    def is_open(self, host: str) -> bool:
+        with self._lock:
+            return self._states.get(host, (0, None, False))[1] is not None
+
+class RetryPolicy:
+    """
+    Politique de reprise commune aux clients Steam et GOG.
+
+    - erreurs réseau et statuts `retry_statuses` (429, 5xx...) : nouvelle tentative
+      après un délai exponentiel avec gigue (« full jitter »), ou le délai indiqué
+      par l'en-tête Retry-After ;
+    - autres statuts : réponse retournée immédiatement à l'appelant ;
+    - chaque échec alimente le disjoncteur de l'hôte, qui coupe court aux
+      requêtes tant que l'hôte est indisponible.
+    """
+
+    DEFAULT_RETRY_STATUSES: FrozenSet[int] = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 30.0,
+                 max_retry_after: float = 120.0, retry_statuses: Optional[FrozenSet[int]] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = retry_statuses or self.DEFAULT_RETRY_STATUSES
+        self.breaker = breaker
+        self._sleep = sleep
+
+    @classmethod
+    def from_config(cls, config: ConfigLoader, prefix: str) -> 'RetryPolicy':
+        """Construit la politique décrite par `<prefix>.retry.*` et `<prefix>.circuit_breaker.*`"""
+        return cls(
+            max_attempts=config.get_int(f"{prefix}.retry.max_attempts", 3),
+            base_delay=config.get_int(f"{prefix}.retry.delay_seconds", 1),
+            max_delay=config.get_int(f"{prefix}.retry.max_delay_seconds", 30),
+            max_retry_after=config.get_int(f"{prefix}.retry.max_retry_after_seconds", 120),
+            breaker=CircuitBreaker.from_config(config, prefix),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Délai avant la tentative suivante (attempt commence à 0)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def execute(self, send: Callable[[], requests.Response], url: str) -> requests.Response:
+        """
+        Exécute `send` avec reprises. Retourne la réponse finale (succès ou
+        statut non réessayable) ; lève RetryError ou CircuitOpenError sinon.
+        """
+        host = urlparse(url).netloc or url
+        last_error = None
+
+        for attempt in range(self.max_attempts):
+            if self.breaker:
+                self.breaker.before_request(host)
+
+            retry_after = None
+            try:
+                response = send()
+            except requests.exceptions.RequestException as e:
+                last_error = str(e)
+            except Exception:
+                if self.breaker:
+                    self.breaker.record_failure(host)
+                raise
+            else:
+                if response.status_code not in self.retry_statuses:
+                    if self.breaker:
+                        self.breaker.record_success(host)
+                    return response
+                last_error = f"HTTP {response.status_code}"
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                response.close()
+
+            if self.breaker:
+                self.breaker.record_failure(host)
+            logging.warning(f"Erreur requête {host} (tentative {attempt + 1}/{self.max_attempts}): {last_error}")
+
+            if attempt == self.max_attempts - 1:
+                break
+            if retry_after is not None and retry_after > self.max_retry_after:
+                raise RetryError(f"{host} demande d'attendre {retry_after:.0f}s ({last_error}), abandon")
+            delay = retry_after if retry_after is not None else self.backoff(attempt)
+            self._sleep(delay)
+
+        raise RetryError(f"Échec de la requête après {self.max_attempts} tentatives: {last_error}")
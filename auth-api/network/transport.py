@@ -0,0 +1,100 @@
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from config.config_loader import ConfigLoader
+from network.rate_limiter import RateLimiter
+from network.retry import RetryPolicy
+
+class HTTPTransport:
+    """
+    Transport HTTP partagé par les clients Steam et GOG.
+
+    Chaque thread dispose de sa propre session requests (créée à la demande),
+    montée sur un HTTPAdapter dont la taille de pool par hôte est configurable ;
+    les connexions restent ouvertes (keep-alive) et les réponses compressées
+    (gzip) sont acceptées. Toutes les requêtes appliquent de vrais délais de
+    connexion/lecture, le limiteur de débit et la politique de reprise : une
+    même instance peut donc servir un pool de workers.
+    """
+
+    DEFAULT_HEADERS = {
+        'Accept': 'application/json',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+        'User-Agent': 'auth-api/0.1',
+    }
+
+    def __init__(self, timeout: Tuple[float, float] = (5.0, 30.0), pool_connections: int = 4,
+                 pool_maxsize: int = 16, headers: Optional[Dict[str, str]] = None,
+                 rate_limiter: Optional[RateLimiter] = None, retry_policy: Optional[RetryPolicy] = None):
+        self.timeout = timeout
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.headers = dict(self.DEFAULT_HEADERS)
+        self.headers.update(headers or {})
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._sessions_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: ConfigLoader, prefix: str) -> 'HTTPTransport':
+        """
+        Construit le transport décrit par `<prefix>.api.timeout`,
+        `<prefix>.api.connect_timeout` et `<prefix>.http.*`, avec le limiteur
+        de débit et la politique de reprise associés.
+        """
+        read_timeout = config.get_int(f"{prefix}.api.timeout", 30)
+        connect_timeout = config.get_int(f"{prefix}.api.connect_timeout", min(5, read_timeout))
+        return cls(
+            timeout=(connect_timeout, read_timeout),
+            pool_connections=config.get_int(f"{prefix}.http.pool_connections", 4),
+            pool_maxsize=config.get_int(f"{prefix}.http.pool_maxsize", 16),
+            rate_limiter=RateLimiter.from_config(config, prefix),
+            retry_policy=RetryPolicy.from_config(config, prefix),
+        )
+
+    def session(self) -> requests.Session:
+        """Retourne la session du thread courant"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                                  pool_maxsize=self.pool_maxsize, max_retries=0)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update(self.headers)
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, stream: bool = False,
+            **kwargs) -> requests.Response:
+        """
+        GET soumis au limiteur de débit et à la politique de reprise.
+        Retourne la réponse finale ; les erreurs réseau définitives sont levées
+        sous forme de requests.exceptions.RequestException.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+
+        def send() -> requests.Response:
+            if self.rate_limiter:
+                self.rate_limiter.acquire(url)
+            logging.debug(f"Requête HTTP: {url}")
+            return self.session().get(url, params=params, stream=stream, **kwargs)
+
+        if self.retry_policy:
+            return self.retry_policy.execute(send, url)
+        return send()
+
+    def close(self):
+        """Ferme toutes les sessions (et leurs connexions) créées par ce transport"""
+        with self._sessions_lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
+        self._local = threading.local()
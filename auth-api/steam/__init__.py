@@ -1,5 +1,9 @@
 """Module Steam API client"""
-from .steam_client import SteamClient, SteamAPIException
-from .models import SteamGame, SteamAppDetails, SteamPlayerSummary
+from .steam_client import SteamClient, SteamAPIException, PlayerSummaryList, BatchFailure
+from .async_client import AsyncSteamClient
+from .catalog import SteamAppCatalog, normalize_title
+from .library_sync import IncrementalLibrarySync, LibrarySnapshotStore, LibraryChangeSet
+from .library import SteamLibrary
+from .models import SteamGame, SteamAppDetails, CompactSteamAppDetails, SteamPlayerSummary
 
-__all__ = ['SteamClient', 'SteamAPIException', 'SteamGame', 'SteamAppDetails', 'SteamPlayerSummary']
+__all__ = ['SteamClient', 'AsyncSteamClient', 'SteamAPIException', 'PlayerSummaryList', 'BatchFailure', 'SteamAppCatalog', 'normalize_title', 'IncrementalLibrarySync', 'LibrarySnapshotStore', 'LibraryChangeSet', 'SteamLibrary', 'SteamGame', 'SteamAppDetails', 'CompactSteamAppDetails', 'SteamPlayerSummary']
\ No newline at end of file
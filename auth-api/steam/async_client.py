@@ -0,0 +1,126 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Iterable
+from steam.steam_client import SteamClient, SteamAPIException
+from steam.models import SteamGame, SteamAppDetails, SteamPlayerSummary
+
+class AsyncSteamClient:
+    """
+    Client asynchrone (asyncio) pour l'API Steam.
+
+    Les appels réseau sont délégués à un pool de threads partageant un même
+    SteamClient (son transport utilise une session requests par thread), ce qui
+    permet d'exécuter plusieurs requêtes en parallèle en réutilisant la logique
+    du client synchrone. Les méthodes retournent les mêmes modèles que SteamClient.
+    """
+
+    def __init__(self, config_file: str = "config/steam.properties", max_workers: int = 16):
+        self.config_file = config_file
+        self.max_workers = max_workers
+
+        self._client = SteamClient(config_file)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="steam-async")
+
+        logging.info(f"AsyncSteamClient initialisé ({max_workers} workers)")
+
+    async def __aenter__(self) -> 'AsyncSteamClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Arrête le pool de threads"""
+        self._executor.shutdown(wait=True)
+        self._client.close()
+
+    def get_test_user_id(self) -> Optional[str]:
+        """Retourne l'ID utilisateur de test configuré"""
+        return self._client.get_test_user_id()
+
+    async def _call(self, method: str, *args, **kwargs) -> Any:
+        """Exécute une méthode du client synchrone dans le pool de threads"""
+        return await self._call_in(self._executor, method, *args, **kwargs)
+
+    async def _call_in(self, executor: ThreadPoolExecutor, method: str, *args, **kwargs) -> Any:
+        """Exécute une méthode du client synchrone dans le pool `executor`"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, functools.partial(getattr(self._client, method), *args, **kwargs)
+        )
+
+    async def get_owned_games(self, steamid: str = None, include_appinfo: bool = True,
+                              include_played_free_games: bool = True) -> List[SteamGame]:
+        """
+        Récupère la liste des jeux possédés par un utilisateur
+        """
+        return await self._call('get_owned_games', steamid, include_appinfo, include_played_free_games)
+
+    async def get_player_summaries(self, steamids: List[str] = None,
+                                   max_workers: int = 4) -> List[SteamPlayerSummary]:
+        """
+        Récupère les informations de profil des joueurs (lots de 100 en parallèle)
+        """
+        return await self._call('get_player_summaries', steamids, max_workers)
+
+    async def get_app_details(self, appid: int, language: str = None,
+                              refresh: bool = False) -> Optional[SteamAppDetails]:
+        """
+        Récupère les détails d'une application Steam
+        """
+        return await self._call('get_app_details', appid, language, refresh)
+
+    async def get_prices(self, appids: List[int], cc: str = None,
+                         max_workers: int = 4) -> Dict[int, Optional[Dict[str, Any]]]:
+        """
+        Récupère les prix de nombreuses applications (lots de 100 appids en parallèle)
+        """
+        return await self._call('get_prices', appids, cc, max_workers)
+
+    async def get_app_list(self) -> List[Dict[str, Any]]:
+        """
+        Récupère la liste complète des applications Steam
+        """
+        return await self._call('get_app_list')
+
+    async def get_app_details_many(self, appids: Iterable[int], language: str = None,
+                                   concurrency: int = 8, refresh: bool = False,
+                                   compact: bool = False) -> Dict[int, Optional[SteamAppDetails]]:
+        """
+        Récupère les détails de plusieurs applications avec au plus `concurrency`
+        requêtes simultanées. Le dictionnaire retourné respecte l'ordre des appids
+        fournis ; une application introuvable est associée à None. Avec `compact`,
+        les détails sont retournés sous forme de CompactSteamAppDetails.
+
+        Si `concurrency` dépasse `max_workers`, les requêtes sont exécutées dans
+        un pool temporaire de `concurrency` threads, afin que la concurrence
+        demandée ne soit pas plafonnée par le pool partagé.
+        """
+        if concurrency < 1:
+            raise SteamAPIException("concurrency doit être supérieur ou égal à 1")
+
+        appids = list(dict.fromkeys(appids))
+        semaphore = asyncio.Semaphore(concurrency)
+        if concurrency > self.max_workers:
+            executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="steam-async-many")
+        else:
+            executor = self._executor
+
+        async def fetch(appid: int) -> Optional[SteamAppDetails]:
+            async with semaphore:
+                details = await self._call_in(executor, 'get_app_details', appid, language, refresh)
+            if compact and details is not None:
+                # La compression est faite dans le pool pour ne pas bloquer la boucle
+                details = await asyncio.get_running_loop().run_in_executor(executor, details.compact)
+            return details
+
+        try:
+            results = await asyncio.gather(*(fetch(appid) for appid in appids))
+        finally:
+            if executor is not self._executor:
+                executor.shutdown(wait=False)
+        found = sum(1 for details in results if details is not None)
+        logging.info(f"Récupéré les détails de {found}/{len(appids)} applications")
+        return dict(zip(appids, results))
@@ -0,0 +1,223 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Optional, Dict, Any, Tuple
+from config.config_loader import ConfigLoader
+
+class AppDetailsCache:
+    """
+    Cache persistant (SQLite) des réponses appdetails du Steam Store.
+
+    Les entrées sont indexées par (appid, langue, pays) et stockent le JSON brut
+    compressé (zlib). Chaque entrée possède sa propre date d'expiration ; les
+    applications renvoyant `success: false` sont mises en cache négatif avec une
+    durée plus courte. La taille est bornée (nombre d'entrées et octets) par une
+    éviction LRU basée sur la date du dernier accès.
+    """
+
+    # Nombre d'écritures entre deux contrôles de taille
+    EVICTION_INTERVAL = 64
+
+    _registry: Dict[str, 'AppDetailsCache'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, db_path: str, ttl: int = 7 * 24 * 3600, negative_ttl: int = 24 * 3600,
+                 max_entries: int = 20000, max_bytes: int = 200 * 1024 * 1024):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._con = sqlite3.connect(db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._con.execute("PRAGMA journal_mode = WAL;")
+        self._con.execute("PRAGMA synchronous = NORMAL;")
+        self._con.execute("""
+            CREATE TABLE IF NOT EXISTS appdetails (
+                appid       INTEGER NOT NULL,
+                language    TEXT    NOT NULL,
+                country     TEXT    NOT NULL,
+                success     INTEGER NOT NULL,
+                payload     BLOB,
+                size        INTEGER NOT NULL DEFAULT 0,
+                fetched_at  REAL    NOT NULL,
+                expires_at  REAL    NOT NULL,
+                last_access REAL    NOT NULL,
+                PRIMARY KEY (appid, language, country)
+            ) WITHOUT ROWID
+        """)
+        self._con.execute("CREATE INDEX IF NOT EXISTS idx_appdetails_last_access ON appdetails(last_access)")
+
+    @classmethod
+    def from_config(cls, config: ConfigLoader) -> Optional['AppDetailsCache']:
+        """
+        Construit (ou réutilise) le cache décrit par `steam.cache.*`.
+        Retourne None si le cache est désactivé.
+        """
+        if not config.get_bool("steam.cache.enabled", True):
+            return None
+        db_path = config.get("steam.cache.path") or "cache/steam_appdetails.sqlite"
+        with cls._registry_lock:
+            cache = cls._registry.get(os.path.abspath(db_path))
+            if cache is None:
+                cache = cls(
+                    db_path,
+                    ttl=config.get_int("steam.cache.ttl_seconds", 7 * 24 * 3600),
+                    negative_ttl=config.get_int("steam.cache.negative_ttl_seconds", 24 * 3600),
+                    max_entries=config.get_int("steam.cache.max_entries", 20000),
+                    max_bytes=config.get_int("steam.cache.max_size_mb", 200) * 1024 * 1024,
+                )
+                cls._registry[os.path.abspath(db_path)] = cache
+            return cache
+
+    def close(self):
+        with self._lock:
+            self._con.close()
+
+    def get(self, appid: int, language: str, country: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Recherche une entrée valide.
+        Retourne (trouvé, données) ; (True, None) correspond à un cache négatif.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._con.execute(
+                "SELECT success, payload FROM appdetails "
+                "WHERE appid = ? AND language = ? AND country = ? AND expires_at > ?",
+                (appid, language, country, now)
+            ).fetchone()
+            if row is None:
+                return False, None
+            self._con.execute(
+                "UPDATE appdetails SET last_access = ? WHERE appid = ? AND language = ? AND country = ?",
+                (now, appid, language, country)
+            )
+
+        success, payload = row
+        if not success:
+            return True, None
+        return True, json.loads(zlib.decompress(payload))
+
+    def put(self, appid: int, language: str, country: str, data: Optional[Dict[str, Any]],
+            ttl: Optional[int] = None):
+        """Enregistre une réponse ; `data=None` enregistre un cache négatif"""
+        now = time.time()
+        if data is None:
+            payload, success = None, 0
+            ttl = self.negative_ttl if ttl is None else ttl
+        else:
+            payload = zlib.compress(json.dumps(data, separators=(',', ':')).encode('utf-8'))
+            success = 1
+            ttl = self.ttl if ttl is None else ttl
+
+        with self._lock:
+            self._con.execute(
+                "INSERT OR REPLACE INTO appdetails "
+                "(appid, language, country, success, payload, size, fetched_at, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (appid, language, country, success, payload, len(payload or b''), now, now + ttl, now)
+            )
+            self._writes += 1
+            if self._writes % self.EVICTION_INTERVAL == 0:
+                self._evict()
+
+    def update_prices(self, country: str, prices: Dict[int, Optional[Dict[str, Any]]]) -> int:
+        """
+        Remplace uniquement le champ `price_overview` des entrées valides du pays
+        `country` (toutes langues confondues), sans modifier leur expiration.
+        Retourne le nombre d'entrées mises à jour.
+        """
+        if not prices:
+            return 0
+        now = time.time()
+        appids = list(prices)
+        updated = 0
+        with self._lock:
+            # Par paquets pour rester sous la limite de paramètres SQLite
+            for start in range(0, len(appids), 500):
+                chunk = appids[start:start + 500]
+                rows = self._con.execute(
+                    f"SELECT appid, language, payload FROM appdetails "
+                    f"WHERE country = ? AND success = 1 AND expires_at > ? "
+                    f"AND appid IN ({','.join('?' * len(chunk))})",
+                    [country, now] + chunk
+                ).fetchall()
+                changes = []
+                for appid, language, payload in rows:
+                    data = json.loads(zlib.decompress(payload))
+                    if data.get('price_overview') == prices[appid]:
+                        continue
+                    data['price_overview'] = prices[appid]
+                    payload = zlib.compress(json.dumps(data, separators=(',', ':')).encode('utf-8'))
+                    changes.append((payload, len(payload), appid, language, country))
+                if changes:
+                    self._con.execute("BEGIN")
+                    try:
+                        self._con.executemany(
+                            "UPDATE appdetails SET payload = ?, size = ? "
+                            "WHERE appid = ? AND language = ? AND country = ?", changes
+                        )
+                        self._con.execute("COMMIT")
+                    except BaseException:
+                        # Connexion partagée : ne jamais la laisser dans une transaction ouverte
+                        self._con.execute("ROLLBACK")
+                        raise
+                    updated += len(changes)
+        return updated
+
+    def evict(self):
+        """Applique immédiatement les limites de taille du cache"""
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        """Supprime les entrées expirées puis les moins récemment utilisées au-delà des limites"""
+        count, total = self._con.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM appdetails").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        self._con.execute("DELETE FROM appdetails WHERE expires_at <= ?", (time.time(),))
+        count, total = self._con.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM appdetails").fetchone()
+        rows = self._con.execute(
+            "SELECT appid, language, country, size FROM appdetails ORDER BY last_access"
+        ).fetchall()
+        victims = []
+        for appid, language, country, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            victims.append((appid, language, country))
+            count -= 1
+            total -= size
+        if victims:
+            self._con.executemany(
+                "DELETE FROM appdetails WHERE appid = ? AND language = ? AND country = ?", victims
+            )
+            logging.debug(f"Cache appdetails : {len(victims)} entrée(s) évincée(s)")
+
+    def purge_expired(self) -> int:
+        """Supprime les entrées expirées et retourne leur nombre"""
+        with self._lock:
+            cur = self._con.execute("DELETE FROM appdetails WHERE expires_at <= ?", (time.time(),))
+            return cur.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._con.execute("DELETE FROM appdetails")
+
+    def stats(self) -> Dict[str, int]:
+        """Retourne le nombre d'entrées (positives / négatives) et la taille stockée"""
+        with self._lock:
+            total, negative, size = self._con.execute(
+                "SELECT COUNT(*), COALESCE(SUM(success = 0), 0), COALESCE(SUM(size), 0) FROM appdetails"
+            ).fetchone()
+        return {'entries': total, 'negative': negative, 'bytes': size}
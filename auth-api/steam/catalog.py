@@ -0,0 +1,210 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import List, Optional, Dict, Iterable, Tuple
+
+_TRADEMARKS_RE = re.compile(r'[™®©]')
+_NON_WORD_RE = re.compile(r'[\W_]+')
+# Marques de voisement des kanas (ゼ = セ + U+3099) : elles changent le mot, ce ne sont pas des accents
+_KANA_VOICING = '\u3099\u309a'
+
+def normalize_title(title: str) -> str:
+    """
+    Normalise un titre pour la comparaison entre plateformes :
+    casse repliée (casefold), accents et symboles de marque retirés, ponctuation
+    remplacée par des espaces (ex: "The Witcher® 3: Wild Hunt" -> "the witcher 3
+    wild hunt"). Les lettres non latines (japonais, cyrillique...) sont conservées.
+    """
+    if not title:
+        return ""
+    title = _TRADEMARKS_RE.sub('', title)
+    title = unicodedata.normalize('NFKD', title)
+    title = ''.join(c for c in title if not unicodedata.combining(c) or c in _KANA_VOICING)
+    title = unicodedata.normalize('NFC', title)
+    return _NON_WORD_RE.sub(' ', title.casefold()).strip()
+
+class SteamAppCatalog:
+    """
+    Miroir local (SQLite) du catalogue des applications Steam.
+
+    Alimenté depuis GetAppList en streaming, il permet de résoudre un titre en
+    appid sans requête réseau : recherches exacte, par préfixe et par titre
+    normalisé, toutes servies par index. Le rafraîchissement n'écrit que les
+    applications nouvelles ou renommées.
+    """
+
+    # Taille des lots d'insertion lors d'un rafraîchissement
+    BATCH_SIZE = 5000
+    # Version de normalize_title ayant produit la colonne `normalized`
+    NORMALIZATION_VERSION = 2
+
+    def __init__(self, db_path: str = "cache/steam_catalog.sqlite"):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._con = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._con.execute("PRAGMA journal_mode = WAL;")
+        self._con.executescript("""
+            CREATE TABLE IF NOT EXISTS apps (
+                appid      INTEGER PRIMARY KEY,
+                name       TEXT NOT NULL,
+                normalized TEXT NOT NULL,
+                updated_at INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_apps_name ON apps(name);
+            CREATE INDEX IF NOT EXISTS idx_apps_normalized ON apps(normalized);
+            CREATE TABLE IF NOT EXISTS catalog_meta (
+                key   TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        self._renormalize()
+
+    @classmethod
+    def from_config(cls, config) -> 'SteamAppCatalog':
+        """Ouvre le catalogue configuré par `steam.catalog.path`"""
+        return cls(config.get("steam.catalog.path") or "cache/steam_catalog.sqlite")
+
+    def close(self):
+        with self._lock:
+            self._con.close()
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._con.execute("SELECT value FROM catalog_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _renormalize(self):
+        """Recalcule la colonne `normalized` si normalize_title a changé depuis son écriture"""
+        if self._get_meta('normalization') == str(self.NORMALIZATION_VERSION):
+            return
+        with self._con:
+            rows = self._con.execute("SELECT appid, name, normalized FROM apps").fetchall()
+            changes = []
+            for appid, name, normalized in rows:
+                value = normalize_title(name)
+                if value != normalized:
+                    changes.append((value, appid))
+            self._con.executemany("UPDATE apps SET normalized = ? WHERE appid = ?", changes)
+            self._con.execute(
+                "INSERT OR REPLACE INTO catalog_meta (key, value) VALUES ('normalization', ?)",
+                (str(self.NORMALIZATION_VERSION),)
+            )
+        if changes:
+            logging.info(f"Catalogue Steam : {len(changes)} titre(s) normalisé(s) à nouveau")
+
+    def last_sync(self) -> Optional[int]:
+        """Timestamp de la dernière synchronisation réussie"""
+        with self._lock:
+            value = self._get_meta('last_sync')
+        return int(value) if value else None
+
+    def count(self) -> int:
+        with self._lock:
+            return self._con.execute("SELECT COUNT(*) FROM apps").fetchone()[0]
+
+    def upsert(self, apps: Iterable[Tuple[int, str]]) -> Dict[str, int]:
+        """
+        Ajoute ou renomme des applications à partir de tuples (appid, name).
+        Les lignes inchangées ne sont pas réécrites. Retourne les compteurs
+        'added' et 'updated'.
+        """
+        now = int(time.time())
+        with self._lock:
+            before = self._con.execute("SELECT COUNT(*) FROM apps").fetchone()[0]
+            changes_before = self._con.total_changes
+            batch = []
+            with self._con:
+                for appid, name in apps:
+                    if not appid or not name or not name.strip():
+                        continue
+                    batch.append((appid, name, normalize_title(name), now))
+                    if len(batch) >= self.BATCH_SIZE:
+                        self._write_batch(batch)
+                        batch = []
+                if batch:
+                    self._write_batch(batch)
+            after = self._con.execute("SELECT COUNT(*) FROM apps").fetchone()[0]
+            added = after - before
+            updated = self._con.total_changes - changes_before - added
+        return {'added': added, 'updated': updated}
+
+    def _write_batch(self, batch: List[Tuple[int, str, str, int]]):
+        self._con.executemany("""
+            INSERT INTO apps (appid, name, normalized, updated_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(appid) DO UPDATE SET
+                name = excluded.name,
+                normalized = excluded.normalized,
+                updated_at = excluded.updated_at
+            WHERE apps.name != excluded.name
+        """, batch)
+
+    def refresh(self, client, full: bool = False) -> Dict[str, int]:
+        """
+        Synchronise le catalogue avec Steam.
+
+        La première synchronisation (ou `full=True`) parcourt GetAppList en
+        streaming. Les suivantes ne demandent que les applications modifiées
+        depuis la dernière synchronisation (IStoreService/GetAppList).
+        """
+        since = None if full else self.last_sync()
+        started = int(time.time())
+        if since:
+            stats = self.upsert(client.iter_modified_apps(since))
+        else:
+            stats = self.upsert(client.iter_app_list())
+
+        with self._lock, self._con:
+            self._con.execute(
+                "INSERT OR REPLACE INTO catalog_meta (key, value) VALUES ('last_sync', ?)", (str(started),)
+            )
+        mode = "incrémentale" if since else "complète"
+        logging.info(f"Catalogue Steam : synchronisation {mode}, "
+                     f"{stats['added']} ajout(s), {stats['updated']} modification(s)")
+        return stats
+
+    def find_exact(self, name: str) -> List[Tuple[int, str]]:
+        """Applications dont le nom correspond exactement"""
+        with self._lock:
+            return self._con.execute(
+                "SELECT appid, name FROM apps WHERE name = ? ORDER BY appid", (name,)
+            ).fetchall()
+
+    def find_normalized(self, title: str) -> List[Tuple[int, str]]:
+        """Applications dont le titre normalisé correspond"""
+        normalized = normalize_title(title)
+        if not normalized:
+            return []
+        with self._lock:
+            return self._con.execute(
+                "SELECT appid, name FROM apps WHERE normalized = ? ORDER BY appid", (normalized,)
+            ).fetchall()
+
+    def find_prefix(self, prefix: str, limit: int = 20) -> List[Tuple[int, str]]:
+        """Applications dont le titre normalisé commence par `prefix`"""
+        start = normalize_title(prefix)
+        if not start:
+            return []
+        # Intervalle [start, start + U+10FFFF) : parcours de l'index sans LIKE
+        with self._lock:
+            return self._con.execute(
+                "SELECT appid, name FROM apps WHERE normalized >= ? AND normalized < ? "
+                "ORDER BY normalized, appid LIMIT ?", (start, start + '\U0010ffff', limit)
+            ).fetchall()
+
+    def resolve(self, title: str) -> Optional[int]:
+        """Résout un titre en appid : correspondance exacte puis normalisée"""
+        matches = self.find_exact(title) or self.find_normalized(title)
+        return matches[0][0] if matches else None
+
+    def resolve_many(self, titles: Iterable[str]) -> Dict[str, Optional[int]]:
+        """Résout plusieurs titres (ex: bibliothèque GOG Galaxy) en appids"""
+        return {title: self.resolve(title) for title in titles}
+
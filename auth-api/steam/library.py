@@ -0,0 +1,188 @@
+import heapq
+from array import array
+from itertools import repeat
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Sequence
+from steam.models import SteamGame
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel : repli sur le module array
+    np = None
+
+# Colonnes entières stockées dans des tableaux typés (None -> -1)
+INT_COLUMNS = (
+    'appid', 'playtime_forever', 'playtime_2weeks',
+    'playtime_windows_forever', 'playtime_mac_forever', 'playtime_linux_forever',
+    'playtime_deck_forever', 'playtime_disconnected', 'rtime_last_played',
+)
+# Colonnes texte stockées comme index dans une table de chaînes
+STRING_COLUMNS = ('name', 'img_icon_url', 'img_logo_url')
+PLATFORM_COLUMNS = {
+    'windows': 'playtime_windows_forever',
+    'mac': 'playtime_mac_forever',
+    'linux': 'playtime_linux_forever',
+    'deck': 'playtime_deck_forever',
+}
+_NULLABLE = {'playtime_2weeks', 'rtime_last_played'}
+_MISSING = -1
+# int32 suffit pour les appids et les minutes ; les timestamps restent en int64
+_TYPECODES = {name: 'i' for name in INT_COLUMNS}
+_TYPECODES['rtime_last_played'] = 'q'
+
+class StringTable:
+    """Table de chaînes dédupliquées ; chaque valeur est référencée par son index"""
+
+    def __init__(self):
+        self.values: List[Optional[str]] = [None]
+        self._index: Dict[Optional[str], int] = {None: 0}
+
+    def add(self, value: Optional[str]) -> int:
+        index = self._index.get(value)
+        if index is None:
+            index = len(self.values)
+            self.values.append(value)
+            self._index[value] = index
+        return index
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        return self.values[index]
+
+    def freeze(self):
+        """Libère l'index de déduplication une fois la construction terminée"""
+        self._index = None
+
+class SteamLibrary:
+    """
+    Bibliothèque Steam stockée en colonnes.
+
+    Les champs numériques de SteamGame sont conservés dans des tableaux typés
+    (NumPy si disponible, module `array` sinon) et les champs texte dans une
+    table de chaînes partagée. Les agrégats (totaux, répartition par plateforme,
+    top N, filtres) sont calculés sur les colonnes ; les objets SteamGame ne
+    sont construits qu'à la demande.
+    """
+
+    def __init__(self, columns: Dict[str, Any], strings: StringTable, visible_stats: Any):
+        self._columns = columns
+        self._strings = strings
+        self._visible_stats = visible_stats
+
+    @classmethod
+    def from_dicts(cls, records: Iterable[Dict[str, Any]]) -> 'SteamLibrary':
+        """Construit la bibliothèque directement depuis les dictionnaires de l'API"""
+        ints = {name: array(_TYPECODES[name]) for name in INT_COLUMNS}
+        string_refs = {name: array('I') for name in STRING_COLUMNS}
+        visible_stats = array('b')
+        strings = StringTable()
+
+        for record in records:
+            for name in INT_COLUMNS:
+                value = record.get(name)
+                ints[name].append(_MISSING if value is None and name in _NULLABLE else int(value or 0))
+            for name in STRING_COLUMNS:
+                string_refs[name].append(strings.add(record.get(name)))
+            flag = record.get('has_community_visible_stats')
+            visible_stats.append(_MISSING if flag is None else int(bool(flag)))
+
+        strings.freeze()
+        columns: Dict[str, Any] = {}
+        for name, values in list(ints.items()) + list(string_refs.items()):
+            columns[name] = np.frombuffer(values, dtype=values.typecode) if np is not None else values
+        if np is not None:
+            visible_stats = np.frombuffer(visible_stats, dtype=np.int8)
+        return cls(columns, strings, visible_stats)
+
+    @classmethod
+    def from_games(cls, games: Iterable[SteamGame]) -> 'SteamLibrary':
+        """Construit la bibliothèque depuis une liste de SteamGame"""
+        fields = INT_COLUMNS + STRING_COLUMNS + ('has_community_visible_stats',)
+        return cls.from_dicts({name: getattr(game, name) for name in fields} for game in games)
+
+    def __len__(self) -> int:
+        return len(self._columns['appid'])
+
+    def _value(self, name: str, index: int) -> Optional[int]:
+        value = int(self._columns[name][index])
+        return None if value == _MISSING and name in _NULLABLE else value
+
+    def __getitem__(self, index: int) -> SteamGame:
+        """Construit la vue SteamGame de la ligne `index`"""
+        if index < 0:
+            index += len(self)
+        data = {name: self._value(name, index) for name in INT_COLUMNS}
+        for name in STRING_COLUMNS:
+            data[name] = self._strings[int(self._columns[name][index])]
+        flag = int(self._visible_stats[index])
+        data['has_community_visible_stats'] = None if flag == _MISSING else bool(flag)
+        return SteamGame(**data)
+
+    def __iter__(self) -> Iterator[SteamGame]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def column(self, name: str) -> Sequence[int]:
+        """Accès direct à une colonne numérique (tableau NumPy ou array)"""
+        return self._columns[name]
+
+    def total_playtime(self) -> int:
+        """Temps de jeu total en minutes"""
+        return self._sum('playtime_forever')
+
+    def total_hours(self) -> float:
+        return self.total_playtime() / 60.0
+
+    def platform_totals(self) -> Dict[str, int]:
+        """Temps de jeu total (minutes) par plateforme"""
+        return {platform: self._sum(name) for platform, name in PLATFORM_COLUMNS.items()}
+
+    def top_played(self, n: int = 10, column: str = 'playtime_forever') -> List[SteamGame]:
+        """Les `n` jeux ayant la plus grande valeur dans `column`"""
+        values = self._columns[column]
+        n = min(n, len(self))
+        if n <= 0:
+            return []
+        if np is not None:
+            candidates = np.argpartition(values, -n)[-n:]
+            indices = candidates[np.argsort(values[candidates], kind='stable')[::-1]]
+        else:
+            indices = heapq.nlargest(n, range(len(values)), key=values.__getitem__)
+        return [self[int(index)] for index in indices]
+
+    def filter(self, min_playtime: int = 0, platform: Optional[str] = None,
+               played_since: Optional[int] = None) -> 'SteamLibrary':
+        """
+        Sous-bibliothèque des jeux joués au moins `min_playtime` minutes,
+        éventuellement sur une plateforme donnée et depuis un timestamp.
+        """
+        if np is not None:
+            mask = self._columns['playtime_forever'] >= min_playtime
+            if platform:
+                mask &= self._columns[PLATFORM_COLUMNS[platform]] > 0
+            if played_since is not None:
+                mask &= self._columns['rtime_last_played'] >= played_since
+            indices = np.nonzero(mask)[0]
+            columns = {name: values[indices] for name, values in self._columns.items()}
+            return SteamLibrary(columns, self._strings, self._visible_stats[indices])
+
+        playtime = self._columns['playtime_forever']
+        platform_values = self._columns[PLATFORM_COLUMNS[platform]] if platform else repeat(1)
+        last_played = self._columns['rtime_last_played']
+        since = _MISSING if played_since is None else played_since
+        indices = [
+            i for i, (minutes, platform_minutes, last) in enumerate(zip(playtime, platform_values, last_played))
+            if minutes >= min_playtime and platform_minutes > 0 and last >= since
+        ]
+        columns = {name: array(values.typecode, map(values.__getitem__, indices))
+                   for name, values in self._columns.items()}
+        return SteamLibrary(columns, self._strings,
+                            array('b', map(self._visible_stats.__getitem__, indices)))
+
+    def _sum(self, name: str) -> int:
+        return int(self._columns[name].sum()) if np is not None else sum(self._columns[name])
+
+    def memory_usage(self) -> int:
+        """Taille approximative des colonnes en octets (table de chaînes exclue)"""
+        columns = list(self._columns.values()) + [self._visible_stats]
+        if np is not None:
+            return sum(values.nbytes for values in columns)
+        return sum(values.itemsize * len(values) for values in columns)
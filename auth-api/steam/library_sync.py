@@ -0,0 +1,164 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import List, Optional, Dict, Any, Tuple
+from steam.models import SteamGame, SteamAppDetails
+
+# Champs dont la modification signale une évolution du temps de jeu
+PLAYTIME_FIELDS = (
+    'playtime_forever', 'playtime_2weeks', 'playtime_windows_forever', 'playtime_mac_forever',
+    'playtime_linux_forever', 'playtime_deck_forever', 'playtime_disconnected', 'rtime_last_played',
+)
+
+@dataclass
+class LibraryChangeSet:
+    """Différences entre deux synchronisations de la bibliothèque d'un joueur"""
+    steamid: str
+    added: List[SteamGame] = field(default_factory=list)
+    removed: List[int] = field(default_factory=list)
+    playtime_changed: List[SteamGame] = field(default_factory=list)
+    details: Dict[int, Optional[SteamAppDetails]] = field(default_factory=dict)
+    unchanged: int = 0
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.playtime_changed or self.details)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Représentation compacte destinée à l'écriture en base"""
+        return {
+            'steamid': self.steamid,
+            'added': [asdict(game) for game in self.added],
+            'removed': self.removed,
+            'playtime': [
+                {k: getattr(game, k) for k in ('appid',) + PLAYTIME_FIELDS}
+                for game in self.playtime_changed
+            ],
+            'details': {appid: asdict(details) for appid, details in self.details.items() if details},
+        }
+
+class LibrarySnapshotStore:
+    """
+    Stocke (SQLite) la dernière liste de SteamGame connue pour chaque steamid,
+    ainsi que la date du dernier enrichissement (get_app_details) de chaque jeu.
+    """
+
+    def __init__(self, db_path: str = "cache/steam_library.sqlite"):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._con = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._con.execute("PRAGMA journal_mode = WAL;")
+        self._con.execute("""
+            CREATE TABLE IF NOT EXISTS owned_games (
+                steamid     TEXT    NOT NULL,
+                appid       INTEGER NOT NULL,
+                data        TEXT    NOT NULL,
+                enriched_at REAL,
+                PRIMARY KEY (steamid, appid)
+            ) WITHOUT ROWID
+        """)
+
+    def close(self):
+        with self._lock:
+            self._con.close()
+
+    def load(self, steamid: str) -> Dict[int, Tuple[SteamGame, Optional[float]]]:
+        """Retourne {appid: (jeu, date d'enrichissement)} pour un steamid"""
+        with self._lock:
+            rows = self._con.execute(
+                "SELECT appid, data, enriched_at FROM owned_games WHERE steamid = ?", (steamid,)
+            ).fetchall()
+        return {appid: (SteamGame.from_dict(json.loads(data)), enriched_at) for appid, data, enriched_at in rows}
+
+    def save(self, steamid: str, games: List[SteamGame], enriched_at: Dict[int, Optional[float]]):
+        """Remplace l'instantané d'un steamid en une seule transaction"""
+        rows = [
+            (steamid, game.appid, json.dumps(asdict(game), separators=(',', ':')), enriched_at.get(game.appid))
+            for game in games
+        ]
+        with self._lock, self._con:
+            self._con.execute("DELETE FROM owned_games WHERE steamid = ?", (steamid,))
+            self._con.executemany(
+                "INSERT INTO owned_games (steamid, appid, data, enriched_at) VALUES (?, ?, ?, ?)", rows
+            )
+
+class IncrementalLibrarySync:
+    """
+    Synchronisation incrémentale des jeux possédés.
+
+    Compare la liste retournée par get_owned_games au dernier instantané du
+    joueur, et n'appelle get_app_details que pour les jeux nouveaux ou dont
+    l'enrichissement a dépassé `details_ttl`. Le résultat est un
+    LibraryChangeSet compact, prêt à être écrit en base.
+    """
+
+    def __init__(self, client, store: LibrarySnapshotStore, details_ttl: int = 7 * 24 * 3600,
+                 max_workers: int = 8):
+        self.client = client
+        self.store = store
+        self.details_ttl = details_ttl
+        self.max_workers = max_workers
+
+    @classmethod
+    def from_client(cls, client) -> 'IncrementalLibrarySync':
+        """Construit la synchronisation à partir de la configuration `steam.sync.*` du client"""
+        config = client.config
+        return cls(
+            client,
+            LibrarySnapshotStore(config.get("steam.sync.path") or "cache/steam_library.sqlite"),
+            details_ttl=config.get_int("steam.sync.details_ttl_seconds", 7 * 24 * 3600),
+            max_workers=config.get_int("steam.sync.max_workers", 8),
+        )
+
+    def sync(self, steamid: str = None) -> LibraryChangeSet:
+        steamid = steamid or self.client.get_test_user_id()
+        games = self.client.get_owned_games(steamid)
+        previous = self.store.load(steamid)
+        now = time.time()
+
+        changes = LibraryChangeSet(steamid=steamid)
+        enriched_at: Dict[int, Optional[float]] = {}
+        to_enrich: List[int] = []
+
+        for game in games:
+            known = previous.get(game.appid)
+            if known is None:
+                changes.added.append(game)
+                to_enrich.append(game.appid)
+                continue
+
+            old_game, last_enriched = known
+            enriched_at[game.appid] = last_enriched
+            if any(getattr(game, name) != getattr(old_game, name) for name in PLAYTIME_FIELDS):
+                changes.playtime_changed.append(game)
+            else:
+                changes.unchanged += 1
+            if last_enriched is None or now - last_enriched > self.details_ttl:
+                to_enrich.append(game.appid)
+
+        current = {game.appid for game in games}
+        changes.removed = sorted(appid for appid in previous if appid not in current)
+
+        if to_enrich:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(to_enrich)))) as executor:
+                details = list(executor.map(self.client.get_app_details, to_enrich))
+            for appid, app_details in zip(to_enrich, details):
+                changes.details[appid] = app_details
+                if app_details is not None:
+                    enriched_at[appid] = now
+
+        self.store.save(steamid, games, enriched_at)
+        logging.info(
+            f"Synchronisation de {steamid}: {len(changes.added)} ajout(s), {len(changes.removed)} retrait(s), "
+            f"{len(changes.playtime_changed)} temps de jeu modifié(s), {len(to_enrich)} enrichissement(s)"
+        )
+        return changes
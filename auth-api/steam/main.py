@@ -5,7 +5,7 @@ import os
 # Ajouter le répertoire parent au path pour les imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from steam import SteamClient, SteamAPIException
+from steam import SteamClient, SteamAPIException, SteamLibrary
 
 def setup_steam_logging():
     """Configure le logging pour Steam"""
@@ -49,6 +49,14 @@ def test_steam_api():
                 games = client.get_owned_games(steamid)
                 print(f"✓ Nombre de jeux récupérés: {len(games)}")
                 
+                if games:
+                    library = SteamLibrary.from_games(games)
+                    print(f"  Temps de jeu total: {library.total_hours():.1f}h")
+                    labels = {'windows': "Windows", 'mac': "Mac", 'linux': "Linux", 'deck': "Steam Deck"}
+                    for platform, minutes in library.platform_totals().items():
+                        if minutes > 0:
+                            print(f"     {labels[platform]}: {minutes / 60.0:.1f}h")
+                
                 # Afficher les 5 premiers jeux
                 if games:
                     print("\nPremiers jeux trouvés:")
@@ -114,14 +122,18 @@ def test_steam_api():
         # Test 4: Liste des applications (limité pour éviter les timeouts)
         print(f"\n4. Test de la liste d'applications...")
         try:
-            apps = client.get_app_list()
-            if apps:
-                print(f"✓ Nombre total d'applications Steam: {len(apps)}")
+            # Lecture en streaming : la liste complète n'est jamais chargée en mémoire
+            total_apps = 0
+            valid_apps = []
+            for appid, name in client.iter_app_list():
+                total_apps += 1
+                if len(valid_apps) < 5 and name.strip():
+                    valid_apps.append((appid, name))
+            if total_apps:
+                print(f"✓ Nombre total d'applications Steam: {total_apps}")
                 print("Quelques applications:")
-                # Filtrer les applications avec des noms valides
-                valid_apps = [app for app in apps if app.get('name', '').strip()]
-                for app in valid_apps[:5]:
-                    print(f"  - {app['name']} (ID: {app['appid']})")
+                for appid, name in valid_apps:
+                    print(f"  - {name} (ID: {appid})")
             else:
                 print("✗ Aucune application trouvée")
                 
@@ -1,27 +1,32 @@
-from dataclasses import dataclass, field
+import zlib
+from dataclasses import dataclass, field, fields
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from network.decoders import decoder_for
 
-@dataclass
+# Un temps de jeu explicitement nul (None) dans l'API est ramené à 0
+_PLAYTIME = {'none_as': 0}
+
+@dataclass(slots=True)
 class SteamGame:
     """Modèle représentant un jeu Steam - compatible avec tous les champs API"""
     appid: int
     name: str
-    playtime_forever: int = 0
+    playtime_forever: int = field(default=0, metadata=_PLAYTIME)
     playtime_2weeks: Optional[int] = None
     img_icon_url: Optional[str] = None
     img_logo_url: Optional[str] = None
     has_community_visible_stats: Optional[bool] = None
     
     # Temps de jeu par plateforme
-    playtime_windows_forever: int = 0
-    playtime_mac_forever: int = 0
-    playtime_linux_forever: int = 0
-    playtime_deck_forever: int = 0  # Steam Deck
+    playtime_windows_forever: int = field(default=0, metadata=_PLAYTIME)
+    playtime_mac_forever: int = field(default=0, metadata=_PLAYTIME)
+    playtime_linux_forever: int = field(default=0, metadata=_PLAYTIME)
+    playtime_deck_forever: int = field(default=0, metadata=_PLAYTIME)  # Steam Deck
     
     # Autres champs possibles
     rtime_last_played: Optional[int] = None
-    playtime_disconnected: int = 0
+    playtime_disconnected: int = field(default=0, metadata=_PLAYTIME)
     
     def __post_init__(self):
         """Post-traitement après initialisation"""
@@ -35,10 +40,7 @@ class SteamGame:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'SteamGame':
         """Crée une instance depuis un dictionnaire, en ignorant les champs inconnus"""
-        # Filtrer seulement les champs que notre modèle connaît
-        valid_fields = {f.name for f in cls.__dataclass_fields__.values()}
-        filtered_data = {k: v for k, v in data.items() if k in valid_fields}
-        return cls(**filtered_data)
+        return decoder_for(cls)(data)
     
     def get_full_icon_url(self) -> Optional[str]:
         """Retourne l'URL complète de l'icône"""
@@ -56,10 +58,10 @@ class SteamGame:
         """Retourne le temps de jeu total en heures"""
         return self.playtime_forever / 60.0 if self.playtime_forever > 0 else 0.0
 
-@dataclass
+@dataclass(slots=True)
 class SteamPlayerSummary:
     """Résumé d'un joueur Steam - tous les champs optionnels sauf les requis"""
-    steamid: str
+    steamid: str = field(metadata={'missing': ''})
     communityvisibilitystate: int = 0
     profilestate: int = 0
     personaname: str = ""
@@ -80,15 +82,7 @@ class SteamPlayerSummary:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'SteamPlayerSummary':
         """Crée une instance depuis un dictionnaire, en gérant les champs manquants"""
-        # Prendre seulement les champs que notre modèle connaît
-        valid_fields = {f.name for f in cls.__dataclass_fields__.values()}
-        filtered_data = {k: v for k, v in data.items() if k in valid_fields}
-        
-        # S'assurer que steamid est présent
-        if 'steamid' not in filtered_data:
-            filtered_data['steamid'] = str(data.get('steamid', ''))
-        
-        return cls(**filtered_data)
+        return decoder_for(cls)(data)
     
     def is_online(self) -> bool:
         """Vérifie si le joueur est en ligne"""
@@ -107,12 +101,12 @@ class SteamPlayerSummary:
         }
         return states.get(self.personastate, "Inconnu")
 
-@dataclass
+@dataclass(slots=True)
 class SteamAppDetails:
     """Modèle détaillé d'une application Steam"""
-    steam_appid: int
-    name: str
-    type: str
+    steam_appid: int = field(metadata={'missing': 0})
+    name: str = field(metadata={'missing': ''})
+    type: str = field(metadata={'missing': ''})
     is_free: bool = False
     detailed_description: str = ""
     about_the_game: str = ""
@@ -133,27 +127,84 @@ class SteamAppDetails:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'SteamAppDetails':
         """Crée une instance depuis un dictionnaire Steam Store API"""
-        # Mapper les champs de l'API vers notre modèle
-        mapped_data = {
-            'steam_appid': data.get('steam_appid', 0),
-            'name': data.get('name', ''),
-            'type': data.get('type', ''),
-            'is_free': data.get('is_free', False),
-            'detailed_description': data.get('detailed_description', ''),
-            'about_the_game': data.get('about_the_game', ''),
-            'short_description': data.get('short_description', ''),
-            'supported_languages': data.get('supported_languages', ''),
-            'header_image': data.get('header_image', ''),
-            'website': data.get('website'),
-            'developers': data.get('developers', []),
-            'publishers': data.get('publishers', []),
-            'price_overview': data.get('price_overview'),
-            'platforms': data.get('platforms', {}),
-            'categories': data.get('categories', []),
-            'genres': data.get('genres', []),
-            'release_date': data.get('release_date', {}),
-            'required_age': data.get('required_age', 0),
-            'achievements': data.get('achievements')
-        }
-        
-        return cls(**mapped_data)
\ No newline at end of file
+        return decoder_for(cls)(data)
+    
+    def compact(self) -> 'CompactSteamAppDetails':
+        """Retourne la représentation compacte (textes longs compressés)"""
+        return CompactSteamAppDetails.from_details(self)
+
+# Champs HTML volumineux, inutiles aux vues en liste
+LONG_TEXT_FIELDS = ('detailed_description', 'about_the_game', 'supported_languages')
+# En dessous de cette taille (caractères), un texte est conservé tel quel
+_COMPRESS_MIN_LENGTH = 128
+
+class _CompressedText:
+    """
+    Descripteur d'un champ texte stocké compressé (zlib) dans un slot privé.
+    Le texte est décompressé à chaque lecture, sans être conservé en mémoire.
+    """
+    
+    def __set_name__(self, owner, name: str):
+        self.slot = f'_{name}'
+    
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = getattr(obj, self.slot)
+        return zlib.decompress(value).decode('utf-8') if isinstance(value, bytes) else value
+    
+    def __set__(self, obj, value: Optional[str]):
+        value = value or ""
+        if len(value) >= _COMPRESS_MIN_LENGTH:
+            value = zlib.compress(value.encode('utf-8'))
+        setattr(obj, self.slot, value)
+
+class CompactSteamAppDetails:
+    """
+    Version compacte de SteamAppDetails pour conserver de nombreux détails en
+    mémoire : les champs courts sont stockés dans des `__slots__`, les champs
+    HTML volumineux (LONG_TEXT_FIELDS) sont compressés et décompressés à la
+    demande lors de l'accès à l'attribut.
+    """
+    
+    SHORT_FIELDS = tuple(f.name for f in fields(SteamAppDetails) if f.name not in LONG_TEXT_FIELDS)
+    __slots__ = SHORT_FIELDS + tuple(f'_{name}' for name in LONG_TEXT_FIELDS)
+    
+    detailed_description = _CompressedText()
+    about_the_game = _CompressedText()
+    supported_languages = _CompressedText()
+    
+    @classmethod
+    def from_details(cls, details: SteamAppDetails) -> 'CompactSteamAppDetails':
+        obj = cls.__new__(cls)
+        for name in cls.SHORT_FIELDS:
+            setattr(obj, name, getattr(details, name))
+        obj.detailed_description = details.detailed_description
+        obj.supported_languages = details.supported_languages
+        # Les deux descriptions sont souvent identiques : partager la version compressée
+        if details.about_the_game == details.detailed_description:
+            obj._about_the_game = obj._detailed_description
+        else:
+            obj.about_the_game = details.about_the_game
+        return obj
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CompactSteamAppDetails':
+        """Crée une instance depuis un dictionnaire Steam Store API"""
+        return cls.from_details(SteamAppDetails.from_dict(data))
+    
+    def to_details(self) -> SteamAppDetails:
+        """Reconstruit le SteamAppDetails complet (textes décompressés)"""
+        return SteamAppDetails(**{name: getattr(self, name) for name in self.SHORT_FIELDS + LONG_TEXT_FIELDS})
+    
+    def compressed_size(self) -> int:
+        """Taille en octets des champs longs tels que stockés"""
+        return sum(len(getattr(self, f'_{name}')) for name in LONG_TEXT_FIELDS)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CompactSteamAppDetails):
+            other = other.to_details()
+        return isinstance(other, SteamAppDetails) and self.to_details() == other
+    
+    def __repr__(self) -> str:
+        return f"CompactSteamAppDetails(steam_appid={self.steam_appid!r}, name={self.name!r}, type={self.type!r})"
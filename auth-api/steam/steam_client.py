@@ -1,22 +1,54 @@
 import requests
 import logging
-import time
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 from urllib.parse import urljoin
 from config.config_loader import ConfigLoader
+from network.decoders import decode_many
+from network.json_stream import iter_json_array
+from network.transport import HTTPTransport
+from steam.cache import AppDetailsCache
 from steam.models import SteamGame, SteamAppDetails, SteamPlayerSummary
 
 class SteamAPIException(Exception):
     """Exception personnalisée pour l'API Steam"""
     pass
 
+@dataclass
+class BatchFailure:
+    """Échec d'un lot lors d'une requête découpée en plusieurs appels"""
+    index: int
+    steamids: List[str]
+    error: str
+
+class PlayerSummaryList(list):
+    """
+    Liste de SteamPlayerSummary, dans l'ordre des Steam IDs demandés.
+    L'attribut `failures` décrit les lots dont la récupération a échoué.
+    """
+    
+    def __init__(self, players=(), failures: Optional[List[BatchFailure]] = None):
+        super().__init__(players)
+        self.failures: List[BatchFailure] = failures or []
+    
+    @property
+    def failed_steamids(self) -> List[str]:
+        return [steamid for failure in self.failures for steamid in failure.steamids]
+
 class SteamClient:
     """Client pour interagir avec l'API Steam"""
     
+    # Nombre maximum de Steam IDs acceptés par GetPlayerSummaries
+    PLAYER_SUMMARIES_BATCH_SIZE = 100
+    # Nombre d'appids regroupés par requête appdetails en mode `filters=price_overview`
+    PRICES_BATCH_SIZE = 100
+    
     def __init__(self, config_file: str = "config/steam.properties"):
         self.config = ConfigLoader(config_file)
         self.api_key = self.config.get("steam.api.key", "").strip()
         self.base_url = self.config.get("steam.api.base_url", "https://api.steampowered.com")
+        self.store_url = self.config.get("steam.store.base_url", "https://store.steampowered.com")
         self.timeout = self.config.get_int("steam.api.timeout", 30)
         self.max_retries = self.config.get_int("steam.retry.max_attempts", 3)
         self.retry_delay = self.config.get_int("steam.retry.delay_seconds", 1)
@@ -28,15 +60,34 @@ class SteamClient:
         if not self.api_key:
             raise SteamAPIException("Clé API Steam non configurée dans steam.properties")
         
-        self.session = requests.Session()
-        self.session.timeout = self.timeout
+        # Transport partagé : sessions par thread, délais réels, limite de débit et reprises
+        self.transport = HTTPTransport.from_config(self.config, "steam")
+        self.rate_limiter = self.transport.rate_limiter
+        self.retry_policy = self.transport.retry_policy
+        self.cache = AppDetailsCache.from_config(self.config)
         
         logging.info("SteamClient initialisé avec succès")
     
+    @property
+    def session(self) -> requests.Session:
+        """Session requests du thread courant"""
+        return self.transport.session()
+    
+    def close(self):
+        """Ferme les connexions HTTP ouvertes"""
+        self.transport.close()
+    
     def get_test_user_id(self) -> Optional[str]:
         """Retourne l'ID utilisateur de test configuré"""
         return self.test_user_id if self.test_user_id else None
     
+    def _get(self, url: str, params: Dict[str, Any], stream: bool = False) -> requests.Response:
+        """
+        Requête GET via le transport partagé : limite de débit et politique de
+        reprise (backoff exponentiel, Retry-After, disjoncteur par hôte)
+        """
+        return self.transport.get(url, params=params, stream=stream)
+    
     def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Effectue une requête à l'API Steam avec retry automatique"""
         params['key'] = self.api_key
@@ -44,24 +95,17 @@ class SteamClient:
         
         url = urljoin(self.base_url, endpoint)
         
-        for attempt in range(self.max_retries):
-            try:
-                logging.debug(f"Requête API Steam: {url} (tentative {attempt + 1})")
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                if 'response' in data:
-                    return data['response']
-                return data
-                
-            except requests.exceptions.RequestException as e:
-                logging.warning(f"Erreur requête API Steam (tentative {attempt + 1}): {e}")
-                if attempt == self.max_retries - 1:
-                    raise SteamAPIException(f"Échec de la requête après {self.max_retries} tentatives: {e}")
-                time.sleep(self.retry_delay)
-        
-        raise SteamAPIException("Erreur inattendue lors de la requête")
+        try:
+            response = self._get(url, params)
+            response.raise_for_status()
+            data = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logging.warning(f"Erreur requête API Steam: {e}")
+            raise SteamAPIException(f"Échec de la requête: {e}")
+        
+        if 'response' in data:
+            return data['response']
+        return data
     
     def get_owned_games(self, steamid: str = None, include_appinfo: bool = True, 
                        include_played_free_games: bool = True) -> List[SteamGame]:
@@ -83,13 +127,8 @@ class SteamClient:
         
         try:
             data = self._make_request(endpoint, params)
-            games = []
-            
-            if 'games' in data:
-                for game_data in data['games']:
-                    # Utiliser from_dict pour gérer les champs inconnus
-                    game = SteamGame.from_dict(game_data)
-                    games.append(game)
+            # Décodeur précompilé : ignore les champs inconnus
+            games = decode_many(SteamGame, data.get('games', []))
             
             logging.info(f"Récupéré {len(games)} jeux pour l'utilisateur {steamid}")
             return games
@@ -98,9 +137,13 @@ class SteamClient:
             logging.error(f"Erreur lors de la récupération des jeux: {e}")
             raise SteamAPIException(f"Impossible de récupérer les jeux: {e}")
     
-    def get_player_summaries(self, steamids: List[str] = None) -> List[SteamPlayerSummary]:
+    def get_player_summaries(self, steamids: List[str] = None, max_workers: int = 4) -> PlayerSummaryList:
         """
-        Récupère les informations de profil des joueurs
+        Récupère les informations de profil des joueurs.
+        Les Steam IDs sont découpés en lots de 100 exécutés en parallèle (dans la
+        limite de débit) ; les profils sont retournés dans l'ordre demandé. Les
+        lots en échec sont décrits par l'attribut `failures` du résultat, et une
+        exception n'est levée que si tous les lots échouent.
         """
         # Utiliser l'ID de test si aucun ID fourni
         if not steamids:
@@ -109,9 +152,37 @@ class SteamClient:
                 raise SteamAPIException("Aucun Steam ID fourni et aucun ID de test configuré")
             steamids = [test_id]
         
-        if len(steamids) > 100:
-            raise SteamAPIException("Maximum 100 Steam IDs par requête")
+        steamids = list(dict.fromkeys(str(steamid) for steamid in steamids))
+        size = self.PLAYER_SUMMARIES_BATCH_SIZE
+        batches = [steamids[i:i + size] for i in range(0, len(steamids), size)]
         
+        if len(batches) == 1:
+            outcomes = [self._fetch_player_batch(batches[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as executor:
+                outcomes = list(executor.map(self._fetch_player_batch, batches))
+        
+        by_steamid: Dict[str, SteamPlayerSummary] = {}
+        failures = []
+        for index, (batch, outcome) in enumerate(zip(batches, outcomes)):
+            if isinstance(outcome, Exception):
+                logging.error(f"Erreur lors de la récupération du lot de profils {index + 1}/{len(batches)}: {outcome}")
+                failures.append(BatchFailure(index, batch, str(outcome)))
+                continue
+            for player in outcome:
+                by_steamid[player.steamid] = player
+        
+        if failures and len(failures) == len(batches):
+            raise SteamAPIException(f"Impossible de récupérer les profils: {failures[0].error}")
+        
+        players = PlayerSummaryList(
+            (by_steamid[steamid] for steamid in steamids if steamid in by_steamid), failures
+        )
+        logging.info(f"Récupéré les profils de {len(players)} joueurs ({len(batches)} lot(s), {len(failures)} en échec)")
+        return players
+    
+    def _fetch_player_batch(self, steamids: List[str]):
+        """Récupère un lot d'au plus 100 profils ; retourne l'exception en cas d'échec"""
         endpoint = "/ISteamUser/GetPlayerSummaries/v2/"
         params = {
             'steamids': ','.join(steamids)
@@ -119,49 +190,120 @@ class SteamClient:
         
         try:
             data = self._make_request(endpoint, params)
-            players = []
-            
-            if 'players' in data:
-                for player_data in data['players']:
-                    # Utiliser from_dict pour gérer les champs manquants
-                    player = SteamPlayerSummary.from_dict(player_data)
-                    players.append(player)
-            
-            logging.info(f"Récupéré les profils de {len(players)} joueurs")
-            return players
-            
+            # Décodeur précompilé : gère les champs manquants
+            return decode_many(SteamPlayerSummary, data.get('players', []))
         except Exception as e:
-            logging.error(f"Erreur lors de la récupération des profils: {e}")
-            raise SteamAPIException(f"Impossible de récupérer les profils: {e}")
+            return e
     
-    def get_app_details(self, appid: int, language: str = None) -> Optional[SteamAppDetails]:
+    def get_app_details(self, appid: int, language: str = None, refresh: bool = False) -> Optional[SteamAppDetails]:
         """
-        Récupère les détails d'une application Steam
+        Récupère les détails d'une application Steam.
+        Les réponses (y compris les échecs `success: false`) sont servies depuis
+        le cache persistant tant qu'elles sont valides, sauf si `refresh` est vrai.
         """
+        language = language or self.config.get("steam.default.language", "english")
+        country = self.config.get("steam.default.country", "US")
+        
+        if self.cache and not refresh:
+            found, cached_data = self.cache.get(appid, language, country)
+            if found:
+                return SteamAppDetails.from_dict(cached_data) if cached_data is not None else None
+        
         # Note: Cet endpoint n'utilise pas la clé API
-        url = "https://store.steampowered.com/api/appdetails"
+        url = urljoin(self.store_url, "/api/appdetails")
         params = {
             'appids': appid,
-            'l': language or self.config.get("steam.default.language", "english"),
-            'cc': self.config.get("steam.default.country", "US")
+            'l': language,
+            'cc': country
         }
         
         try:
-            response = self.session.get(url, params=params)
+            response = self._get(url, params)
             response.raise_for_status()
             data = response.json()
             
             app_data = data.get(str(appid))
             if app_data and app_data.get('success'):
                 app_details_data = app_data['data']
+                if self.cache:
+                    self.cache.put(appid, language, country, app_details_data)
                 return SteamAppDetails.from_dict(app_details_data)
             
+            if self.cache and app_data is not None:
+                self.cache.put(appid, language, country, None)
             return None
             
         except Exception as e:
             logging.error(f"Erreur lors de la récupération des détails de l'app {appid}: {e}")
             return None
     
+    def get_prices(self, appids: List[int], cc: str = None,
+                   max_workers: int = 4) -> Dict[int, Optional[Dict[str, Any]]]:
+        """
+        Récupère le prix (`price_overview`) de nombreuses applications.
+        Avec `filters=price_overview`, l'endpoint appdetails accepte une liste
+        d'appids : ceux-ci sont regroupés par lots de 100 exécutés en parallèle.
+        Retourne {appid: price_overview} (None pour une application sans prix,
+        absente pour une application inconnue ou un lot en échec) et met à jour
+        le seul champ prix des détails en cache.
+        """
+        country = cc or self.config.get("steam.default.country", "US")
+        appids = list(dict.fromkeys(int(appid) for appid in appids))
+        size = self.PRICES_BATCH_SIZE
+        batches = [appids[i:i + size] for i in range(0, len(appids), size)]
+        if not batches:
+            return {}
+        
+        if len(batches) == 1:
+            outcomes = [self._fetch_price_batch(batches[0], country)]
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as executor:
+                outcomes = list(executor.map(self._fetch_price_batch, batches, [country] * len(batches)))
+        
+        prices: Dict[int, Optional[Dict[str, Any]]] = {}
+        failures = 0
+        for index, outcome in enumerate(outcomes):
+            if isinstance(outcome, Exception):
+                logging.error(f"Erreur lors de la récupération du lot de prix {index + 1}/{len(batches)}: {outcome}")
+                failures += 1
+                continue
+            prices.update(outcome)
+        
+        if failures and failures == len(batches):
+            raise SteamAPIException(f"Impossible de récupérer les prix: {outcomes[0]}")
+        
+        updated = self.cache.update_prices(country, prices) if self.cache else 0
+        logging.info(
+            f"Récupéré les prix de {len(prices)}/{len(appids)} applications "
+            f"({len(batches)} lot(s), {failures} en échec, {updated} entrée(s) du cache mises à jour)"
+        )
+        return prices
+    
+    def _fetch_price_batch(self, appids: List[int], country: str):
+        """Récupère les prix d'un lot d'appids ; retourne l'exception en cas d'échec"""
+        url = urljoin(self.store_url, "/api/appdetails")
+        params = {
+            'appids': ','.join(str(appid) for appid in appids),
+            'cc': country,
+            'filters': 'price_overview'
+        }
+        
+        try:
+            response = self._get(url, params)
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            return e
+        
+        prices = {}
+        for appid in appids:
+            app_data = data.get(str(appid))
+            if app_data and app_data.get('success'):
+                # Les applications sans prix renvoient une liste vide à la place d'un objet
+                details = app_data.get('data')
+                prices[appid] = details.get('price_overview') if isinstance(details, dict) else None
+        return prices
+    
     def get_app_list(self) -> List[Dict[str, Any]]:
         """
         Récupère la liste complète des applications Steam
@@ -171,10 +313,73 @@ class SteamClient:
         
         try:
             data = self._make_request(endpoint, params)
-            apps = data.get('apps', [])
+            apps = data.get('applist', data).get('apps', [])
             logging.info(f"Récupéré {len(apps)} applications Steam")
             return apps
             
         except Exception as e:
             logging.error(f"Erreur lors de la récupération de la liste d'apps: {e}")
             raise SteamAPIException(f"Impossible de récupérer la liste d'apps: {e}")
+    
+    def iter_app_list(self, chunk_size: int = 64 * 1024) -> Iterator[Tuple[int, str]]:
+        """
+        Parcourt la liste complète des applications Steam en streaming.
+        Le corps de la réponse est décodé par blocs et chaque application est
+        produite sous forme de tuple (appid, name) sans matérialiser la liste.
+        """
+        url = urljoin(self.base_url, "/ISteamApps/GetAppList/v2/")
+        params = {
+            'key': self.api_key,
+            'format': 'json'
+        }
+        
+        try:
+            response = self._get(url, params, stream=True)
+        except requests.exceptions.RequestException as e:
+            raise SteamAPIException(f"Impossible de récupérer la liste d'apps: {e}")
+        
+        with response:
+            try:
+                response.raise_for_status()
+                count = 0
+                for app in iter_json_array(response.iter_content(chunk_size=chunk_size), key='apps'):
+                    count += 1
+                    yield app.get('appid', 0), app.get('name', '')
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logging.error(f"Erreur lors de la lecture de la liste d'apps: {e}")
+                raise SteamAPIException(f"Impossible de récupérer la liste d'apps: {e}")
+        
+        logging.info(f"Parcouru {count} applications Steam")
+    
+    def iter_modified_apps(self, if_modified_since: int, page_size: int = 50000) -> Iterator[Tuple[int, str]]:
+        """
+        Parcourt les applications ajoutées ou modifiées depuis un timestamp
+        (IStoreService/GetAppList, paginé par last_appid). Produit des tuples
+        (appid, name) comme iter_app_list.
+        """
+        endpoint = "/IStoreService/GetAppList/v1/"
+        last_appid = 0
+        count = 0
+        
+        while True:
+            params = {
+                'if_modified_since': if_modified_since,
+                'include_games': 1,
+                'include_dlc': 1,
+                'include_software': 1,
+                'include_videos': 1,
+                'include_hardware': 1,
+                'last_appid': last_appid,
+                'max_results': page_size
+            }
+            data = self._make_request(endpoint, params)
+            apps = data.get('apps', [])
+            for app in apps:
+                count += 1
+                yield app.get('appid', 0), app.get('name', '')
+            
+            if not data.get('have_more_results') or not apps:
+                break
+            last_appid = data.get('last_appid', apps[-1].get('appid', 0))
+        
+        logging.info(f"Parcouru {count} applications Steam modifiées depuis {if_modified_since}")